@@ -0,0 +1,63 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import os
+import tempfile
+
+import pytest
+import signac
+
+from signac_dashboard import Dashboard
+from signac_dashboard.synthetic import builtin_modules, generate_project
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("signac-dashboard benchmarks")
+    group.addoption(
+        "--jobs",
+        default="1000",
+        help="Comma-separated numbers of jobs of the synthetic projects "
+        "(default: 1000), e.g. 1000,100000,1000000.",
+    )
+    group.addoption(
+        "--images", type=int, default=1, help="Images per job (default: 1)."
+    )
+    group.addoption(
+        "--project-dir",
+        default=os.path.join(tempfile.gettempdir(), "signac-dashboard-benchmarks"),
+        help="Directory where synthetic projects are generated and reused.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "num_jobs" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("jobs").split(",")]
+        metafunc.parametrize("num_jobs", sizes, scope="session")
+
+
+@pytest.fixture(scope="session")
+def project(request, num_jobs):
+    images = request.config.getoption("images")
+    root = os.path.join(
+        request.config.getoption("project_dir"), f"jobs-{num_jobs}-images-{images}"
+    )
+    # Generating large projects takes long, so they are reused across runs.
+    workspace = os.path.join(root, "workspace")
+    if not os.path.isdir(workspace) or len(os.listdir(workspace)) < num_jobs:
+        return generate_project(root, num_jobs, images=images)
+    return signac.get_project(root, search=False)
+
+
+@pytest.fixture(scope="session")
+def dashboard(project):
+    return Dashboard(
+        config={"ACCESS_TOKEN": None, "SERVER_TIMING": False},
+        project=project,
+        modules=builtin_modules(),
+    )
+
+
+@pytest.fixture
+def client(dashboard):
+    dashboard.update_cache()
+    return dashboard.app.test_client()
@@ -0,0 +1,88 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import json
+from urllib.parse import quote
+
+import pytest
+
+SEARCHES = {
+    "statepoint": {"replica": 0},
+    "nested": {"model.kind": "lj"},
+    "range": {"model.params.T": {"$gt": 0.9}},
+    "in": {"model.params.N": {"$in": [100, 300]}},
+    "document": {"doc.status": "done"},
+    "combined": {"model.kind": "wca", "doc.status": "pending", "replica": 1},
+}
+
+
+def get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200, url
+    return response
+
+
+def clear_caches(dashboard):
+    dashboard.update_cache()
+
+
+@pytest.mark.parametrize("view", ["list", "grid"])
+def test_jobs_cold(benchmark, dashboard, client, view):
+    benchmark.pedantic(
+        get,
+        args=(client, f"/jobs/?view={view}"),
+        setup=lambda: clear_caches(dashboard),
+        rounds=5,
+    )
+
+
+@pytest.mark.parametrize("view", ["list", "grid"])
+def test_jobs_warm(benchmark, client, view):
+    get(client, f"/jobs/?view={view}")
+    benchmark(get, client, f"/jobs/?view={view}")
+
+
+@pytest.mark.parametrize("shape", sorted(SEARCHES))
+def test_search_cold(benchmark, dashboard, client, shape):
+    url = f"/search?q={quote(json.dumps(SEARCHES[shape]))}"
+    benchmark.pedantic(
+        get, args=(client, url), setup=lambda: clear_caches(dashboard), rounds=5
+    )
+
+
+@pytest.mark.parametrize("shape", sorted(SEARCHES))
+def test_search_warm(benchmark, client, shape):
+    url = f"/search?q={quote(json.dumps(SEARCHES[shape]))}"
+    get(client, url)
+    benchmark(get, client, url)
+
+
+def test_search_string(benchmark, client):
+    url = f"/search?q={quote('model.kind lj')}"
+    get(client, url)
+    benchmark(get, client, url)
+
+
+def test_job_cold(benchmark, dashboard, client, project):
+    job_id = next(iter(project)).id
+    benchmark.pedantic(
+        get,
+        args=(client, f"/jobs/{job_id}"),
+        setup=lambda: clear_caches(dashboard),
+        rounds=5,
+    )
+
+
+def test_job_warm(benchmark, client, project):
+    job_id = next(iter(project)).id
+    get(client, f"/jobs/{job_id}")
+    benchmark(get, client, f"/jobs/{job_id}")
+
+
+def test_project_warm(benchmark, client):
+    get(client, "/project/")
+    benchmark(get, client, "/project/")
+
+
+def test_update_cache(benchmark, dashboard):
+    benchmark.pedantic(dashboard.update_cache, rounds=5)
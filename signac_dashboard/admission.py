@@ -0,0 +1,68 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import threading
+import time
+
+
+class AdmissionLimiter:
+    """Limit the number of concurrent requests to a route.
+
+    Requests beyond the limit wait in a queue of bounded depth until a slot
+    is free. Requests arriving while the queue is full, and queued requests
+    that wait longer than the timeout, are rejected.
+
+    :param limit: Maximum number of requests handled concurrently.
+    :type limit: int
+    :param queue_depth: Maximum number of waiting requests (default: 0).
+    :type queue_depth: int
+    :param timeout: Maximum time in seconds that a request waits, or
+        :code:`None` to wait until a slot is free (default: :code:`None`).
+    :type timeout: float
+    """
+
+    def __init__(self, limit, queue_depth=0, timeout=None):
+        if limit < 1:
+            raise ValueError("The concurrency limit must be at least 1.")
+        self.limit = limit
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot.
+
+        :returns: Whether a slot was acquired. If so, it must be released with
+            :py:meth:`release`.
+        :rtype: bool
+        """
+        with self._condition:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue_depth:
+                return False
+            self.waiting += 1
+            try:
+                deadline = (
+                    None if self.timeout is None else time.monotonic() + self.timeout
+                )
+                while self.active >= self.limit:
+                    remaining = (
+                        None if deadline is None else deadline - time.monotonic()
+                    )
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        """Release a slot acquired with :py:meth:`acquire`."""
+        with self._condition:
+            self.active -= 1
+            self._condition.notify()
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import os
+import time
+import zipfile
+
+# Files with these extensions are already compressed and are stored in
+# archives without compressing them again.
+COMPRESSED_EXTENSIONS = frozenset(
+    [
+        ".7z",
+        ".avi",
+        ".bz2",
+        ".gif",
+        ".gz",
+        ".jpeg",
+        ".jpg",
+        ".lz4",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".png",
+        ".tgz",
+        ".webm",
+        ".webp",
+        ".xz",
+        ".zip",
+        ".zst",
+    ]
+)
+
+# Number of bytes read from a file at once.
+_CHUNK_SIZE = 1 << 16
+
+# The earliest modification time that a zip archive can store.
+_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class _Pipe:
+    """Write-only stream collecting the bytes written by a zip file.
+
+    It has no :code:`tell` or :code:`seek` method, so that
+    :py:class:`zipfile.ZipFile` writes the archive sequentially, with data
+    descriptors after the compressed data.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _compress_type(filename):
+    if os.path.splitext(filename)[1].lower() in COMPRESSED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def stream_zip(files):
+    """Generate a zip archive of files without writing it anywhere.
+
+    Files are read in chunks and each chunk of the archive is yielded as soon
+    as it was compressed, so that archives of any size are generated with
+    bounded memory. Files that are already compressed (see
+    :py:data:`COMPRESSED_EXTENSIONS`) are stored without compression. Files
+    that cannot be read are skipped.
+
+    :param files: Pairs of path of a file and its name in the archive.
+    :type files: iterable of tuple
+    :returns: The chunks of the archive.
+    :rtype: iterator of bytes
+    """
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, mode="w", allowZip64=True) as archive:
+        for path, name in files:
+            try:
+                file = open(path, "rb")
+            except OSError:
+                continue
+            with file:
+                stat = os.fstat(file.fileno())
+                info = zipfile.ZipInfo(
+                    name, max(time.localtime(stat.st_mtime)[:6], _MIN_DATE_TIME)
+                )
+                info.compress_type = _compress_type(name)
+                info.file_size = stat.st_size
+                info.external_attr = (stat.st_mode & 0xFFFF) << 16
+                with archive.open(info, mode="w") as entry:
+                    while chunk := file.read(_CHUNK_SIZE):
+                        entry.write(chunk)
+                        data = pipe.drain()
+                        if data:
+                            yield data
+            data = pipe.drain()
+            if data:
+                yield data
+    yield pipe.drain()
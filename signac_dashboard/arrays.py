@@ -0,0 +1,393 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Read large arrays lazily and summarize them in bounded time and memory.
+
+NumPy :code:`.npy` files are memory-mapped and HDF5 datasets are read with
+:py:mod:`h5py`, so that only the elements that are sampled are read from
+disk. Both libraries are optional.
+"""
+
+import base64
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .listing import _is_racy
+
+try:
+    import numpy as np
+
+    NUMPY = True
+except ImportError:
+    NUMPY = False
+
+try:
+    import h5py
+
+    H5PY = True
+except ImportError:
+    H5PY = False
+
+# File extensions of HDF5 files, including the job data of signac.
+HDF5_EXTENSIONS = (".h5", ".hdf5", ".hdf")
+
+
+def is_hdf5(path):
+    return path.lower().endswith(HDF5_EXTENSIONS)
+
+
+def required_library(path):
+    """Return the name of a missing library needed to read a file, or None."""
+    if not NUMPY:
+        return "numpy"
+    if is_hdf5(path) and not H5PY:
+        return "h5py"
+    return None
+
+
+def file_key(path):
+    """Return a key that changes when the file at path is modified."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class FileCache:
+    """Cache values computed from files until the files are modified.
+
+    Values are stored with the modification time, size and inode of their
+    file, and recomputed when any of them changed. Values of files modified
+    within the last seconds are not stored, because a coarse mtime resolution
+    could hide a later change within the same tick.
+
+    :param maxsize: Maximum number of cached values (default: 1024).
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, path, compute, key=()):
+        """Return the cached value for a file or compute it.
+
+        :param path: Path of the file.
+        :type path: str
+        :param compute: Callable computing the value.
+        :type compute: callable
+        :param key: Hashable key of other arguments the value depends on.
+        :raises OSError: If the file cannot be accessed.
+        """
+        stat_key = file_key(path)
+        cache_key = (path, key)
+        with self._lock:
+            cached = self._values.get(cache_key)
+            if cached is not None and cached[0] == stat_key:
+                self._values.move_to_end(cache_key)
+                return cached[1]
+        value = compute()
+        if not _is_racy(stat_key[0]):
+            with self._lock:
+                self._values[cache_key] = (stat_key, value)
+                self._values.move_to_end(cache_key)
+                while len(self._values) > self.maxsize:
+                    self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+@contextmanager
+def open_arrays(path, max_datasets=None):
+    """Open the arrays of a file without reading them.
+
+    NumPy :code:`.npy` files are memory-mapped and yield one array named
+    :code:`''`. HDF5 files yield their datasets, named by their path in the
+    file, in the order of :py:meth:`h5py.Group.visititems`. The arrays can
+    only be read until the context exits.
+
+    :param path: Path of the file.
+    :type path: str
+    :param max_datasets: Maximum number of datasets (default: :code:`None`,
+        no limit).
+    :type max_datasets: int
+    :returns: Pairs of name and array, and whether datasets were omitted.
+    :rtype: tuple of (list, bool)
+    """
+    if not is_hdf5(path):
+        yield [("", np.load(path, mmap_mode="r", allow_pickle=False))], False
+        return
+
+    with h5py.File(path, "r") as file:
+        datasets = []
+
+        def visit(name, item):
+            if isinstance(item, h5py.Dataset):
+                if max_datasets is not None and len(datasets) >= max_datasets:
+                    # A non-None value stops the visit.
+                    return True
+                datasets.append((name, item))
+
+        omitted = file.visititems(visit) is not None
+        yield datasets, omitted
+
+
+def sample_steps(shape, max_elements):
+    """Return the step of each axis of a strided sample of an array.
+
+    The steps are chosen such that the sample has at most max_elements
+    elements, striding the longest sampled axis first.
+
+    :param shape: Shape of the array.
+    :type shape: tuple of int
+    :param max_elements: Maximum number of sampled elements.
+    :type max_elements: int
+    :rtype: tuple of int
+    """
+    steps = [1] * len(shape)
+    sampled = list(shape)
+    while sampled and math.prod(sampled) > max(max_elements, 1):
+        axis = max(range(len(shape)), key=lambda i: sampled[i])
+        steps[axis] *= 2
+        sampled[axis] = -(-shape[axis] // steps[axis])
+    return tuple(steps)
+
+
+def strided_sample(array, max_elements, index=()):
+    """Read a strided sample of at most max_elements elements of an array.
+
+    Only the sampled elements are read from memory-mapped arrays and HDF5
+    datasets.
+
+    :param array: A NumPy array or an :py:class:`h5py.Dataset`.
+    :param max_elements: Maximum number of sampled elements.
+    :type max_elements: int
+    :param index: Indices of leading axes to sample a slice of the array
+        (default: :code:`()`, sample the whole array).
+    :type index: tuple of int
+    :returns: The sample and the step of each sampled axis.
+    :rtype: tuple of (:py:class:`numpy.ndarray`, tuple of int)
+    """
+    steps = sample_steps(array.shape[len(index) :], max_elements)
+    slices = tuple(slice(None, None, step) for step in steps)
+    return np.asarray(array[tuple(index) + slices]), steps
+
+
+def is_numeric(dtype):
+    return np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.floating)
+
+
+def summarize(sample):
+    """Return statistics of the finite values of a numeric sample.
+
+    :param sample: A numeric array.
+    :type sample: :py:class:`numpy.ndarray`
+    :returns: Minimum, maximum, mean, standard deviation, and the number of
+        values that are not finite, or :code:`None` if the sample is not
+        numeric.
+    :rtype: dict
+    """
+    if not is_numeric(sample.dtype) and sample.dtype != bool:
+        return None
+    values = sample.astype(np.float64, copy=False).ravel()
+    finite = np.isfinite(values)
+    values = values[finite]
+    stats = {"non_finite": int(finite.size - values.size)}
+    if values.size:
+        stats.update(
+            min=float(values.min()),
+            max=float(values.max()),
+            mean=float(values.mean()),
+            std=float(values.std()),
+        )
+    return stats
+
+
+def _normalize(values, size):
+    low, high = np.nanmin(values), np.nanmax(values)
+    if not np.isfinite(low) or high == low:
+        return np.full_like(values, size / 2)
+    return (values - low) * (size / (high - low))
+
+
+def svg_points(x, y, width, height):
+    """Format a line as the points of an SVG polyline.
+
+    The line is scaled to fill a view box of the given size, with the y axis
+    pointing up. Points that are not finite are omitted.
+
+    :param x: Coordinates along the horizontal axis.
+    :type x: :py:class:`numpy.ndarray`
+    :param y: Coordinates along the vertical axis.
+    :type y: :py:class:`numpy.ndarray`
+    :param width: Width of the view box.
+    :type width: float
+    :param height: Height of the view box.
+    :type height: float
+    :rtype: str
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if not x.size:
+        return ""
+    x = _normalize(x, width)
+    y = height - _normalize(y, height)
+    return " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(x, y))
+
+
+def _png_chunk(kind, data):
+    chunk = kind + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def png_data_uri(image):
+    """Encode a 2D array as a grayscale PNG data URI.
+
+    Values are scaled linearly from the minimum to the maximum of the finite
+    values. Values that are not finite are black.
+
+    :param image: A numeric 2D array.
+    :type image: :py:class:`numpy.ndarray`
+    :rtype: str
+    """
+    values = np.asarray(image, dtype=np.float64)
+    values = np.where(np.isfinite(values), values, np.nan)
+    if np.isnan(values).all():
+        pixels = np.zeros(values.shape, dtype=np.uint8)
+    else:
+        pixels = np.nan_to_num(_normalize(values, 255.0)).astype(np.uint8)
+    height, width = pixels.shape
+    rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), pixels])
+    png = b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)),
+            _png_chunk(b"IDAT", zlib.compress(rows.tobytes())),
+            _png_chunk(b"IEND", b""),
+        ]
+    )
+    return "data:image/png;base64," + base64.b64encode(png).decode()
+
+
+class MinMaxDownsampler:
+    """Downsample a series streamed in chunks to the extrema of buckets.
+
+    The rows of the series are divided into consecutive buckets of equal
+    size, and the rows with the minimum and the maximum value of each bucket
+    are kept, which preserves peaks and the envelope of the series. The first
+    and the last row are kept as well, so that the range of the series is
+    preserved. Only one
+    chunk and the extrema of each bucket are held in memory. Rows whose
+    coordinates are not finite are ignored.
+
+    :param length: Number of rows of the series.
+    :type length: int
+    :param buckets: Number of buckets.
+    :type buckets: int
+    """
+
+    def __init__(self, length, buckets):
+        self.length = length
+        self.buckets = max(buckets, 1)
+        self._offset = 0
+        self._keep_all = length <= 2 * self.buckets
+        self._kept = []
+        self._min = np.full((self.buckets, 3), np.nan)
+        self._max = np.full((self.buckets, 3), np.nan)
+        self._ends = np.full((2, 3), np.nan)
+
+    def add(self, x, y):
+        """Add the next chunk of the series.
+
+        :param x: Coordinates of the rows along the horizontal axis.
+        :type x: :py:class:`numpy.ndarray`
+        :param y: Values of the rows.
+        :type y: :py:class:`numpy.ndarray`
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        rows = np.arange(self._offset, self._offset + len(y))
+        self._offset += len(y)
+        finite = np.isfinite(x) & np.isfinite(y)
+        rows, x, y = rows[finite], x[finite], y[finite]
+        if self._keep_all:
+            self._kept.append(np.column_stack([rows, x, y]))
+            return
+        if not len(rows):
+            return
+        if np.isnan(self._ends[0, 0]):
+            self._ends[0] = rows[0], x[0], y[0]
+        self._ends[1] = rows[-1], x[-1], y[-1]
+        buckets = np.minimum(rows * self.buckets // self.length, self.buckets - 1)
+        # Rows are consecutive, so each bucket is a contiguous group.
+        starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+        ends = np.append(starts[1:], len(rows))
+        for start, end in zip(starts, ends):
+            bucket = buckets[start]
+            low = start + np.argmin(y[start:end])
+            high = start + np.argmax(y[start:end])
+            if not y[low] >= self._min[bucket, 2]:
+                self._min[bucket] = rows[low], x[low], y[low]
+            if not y[high] <= self._max[bucket, 2]:
+                self._max[bucket] = rows[high], x[high], y[high]
+
+    def result(self):
+        """Return the kept rows, ordered by row.
+
+        :returns: Coordinates along the horizontal axis and values.
+        :rtype: tuple of :py:class:`numpy.ndarray`
+        """
+        if self._keep_all:
+            kept = np.concatenate(self._kept) if self._kept else np.empty((0, 3))
+        else:
+            kept = np.concatenate([self._ends, self._min, self._max])
+            kept = kept[np.isfinite(kept[:, 0])]
+            kept = kept[np.unique(kept[:, 0], return_index=True)[1]]
+        return kept[:, 1], kept[:, 2]
+
+
+def lttb(x, y, points):
+    """Downsample a line with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and the last point are kept. The other points are divided into
+    buckets, and the point of each bucket forming the largest triangle with
+    the point selected in the previous bucket and the mean of the next bucket
+    is selected, which preserves the visual shape of the line.
+
+    :param x: Finite coordinates along the horizontal axis, increasing.
+    :type x: :py:class:`numpy.ndarray`
+    :param y: Finite values.
+    :type y: :py:class:`numpy.ndarray`
+    :param points: Number of points to select.
+    :type points: int
+    :returns: The selected coordinates and values.
+    :rtype: tuple of :py:class:`numpy.ndarray`
+    """
+    length = len(x)
+    if points >= length or points < 3:
+        return x, y
+    every = (length - 2) / (points - 2)
+    selected = np.empty(points, dtype=np.intp)
+    selected[0] = previous = 0
+    for i in range(points - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, length)
+        mean_x = x[end:next_end].mean()
+        mean_y = y[end:next_end].mean()
+        areas = np.abs(
+            (x[previous] - mean_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (mean_y - y[previous])
+        )
+        previous = selected[i + 1] = start + np.argmax(areas)
+    selected[-1] = length - 1
+    return x[selected], y[selected]
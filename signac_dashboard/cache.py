@@ -0,0 +1,305 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import NamedTuple, Optional
+
+from flask import g, has_request_context
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a cached method, like :py:func:`functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one computation.
+
+    The first caller of :py:meth:`do` for a key computes the result, and
+    callers with the same key arriving before it finished wait for that
+    result instead of computing it again. Results are not kept after the
+    computation finished.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute):
+        """Return the result of compute, shared with concurrent callers.
+
+        If the computation raises an exception, it is raised in all callers
+        waiting for it.
+
+        :param key: Hashable key identifying the computation.
+        :param compute: Callable computing the result.
+        :type compute: callable
+        """
+        with self._lock:
+            self.calls += 1
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            value = compute()
+        except BaseException as error:
+            self._land(key, flight)
+            flight.set_exception(error)
+            raise
+        self._land(key, flight)
+        flight.set_result(value)
+        return value
+
+    def _land(self, key, flight):
+        with self._lock:
+            if self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+
+class CacheGeneration:
+    """Cached results of dashboard methods for one state of the project.
+
+    A dashboard serves requests from its current generation. When the
+    project changes, a new generation is created and replaces the current
+    one in a single assignment, so that all cached results are invalidated
+    at once. Generations are never cleared while they may be in use: each
+    request keeps reading the generation that was current when it started
+    (see :py:func:`pin_generation`), and results computed for a replaced
+    generation are discarded with it.
+
+    Concurrent calls for a result that is not cached are single-flight: the
+    first caller computes the result and the other callers wait for it.
+
+    :param number: Number of this generation, increasing with each
+        invalidation.
+    :type number: int
+    """
+
+    def __init__(self, number=0):
+        self.number = number
+        self._caches = {}
+        self._stats = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def copy(self, exclude=(), drop_keys=None):
+        """Return a new generation with the cached results of this one.
+
+        The hits and misses of the new generation start at zero.
+
+        :param exclude: Names of methods whose results are not copied.
+        :type exclude: iterable of str
+        :param drop_keys: Mapping of names of methods to callables returning
+            True for the keys of results that are not copied (default:
+            :code:`None`).
+        :type drop_keys: dict
+        :rtype: :py:class:`CacheGeneration`
+        """
+        drop_keys = {} if drop_keys is None else drop_keys
+        generation = CacheGeneration(self.number + 1)
+        with self._lock:
+            for name, cache in self._caches.items():
+                if name in exclude:
+                    continue
+                drop = drop_keys.get(name)
+                if drop is None:
+                    generation._caches[name] = OrderedDict(cache)
+                else:
+                    generation._caches[name] = OrderedDict(
+                        (key, value) for key, value in cache.items() if not drop(key)
+                    )
+        return generation
+
+    def get_or_compute(self, name, key, compute, maxsize):
+        """Return a cached result or compute it once for concurrent callers.
+
+        Callers waiting for a result computed by another thread are counted as
+        hits. If the computation raises an exception, it is raised in all
+        waiting callers and nothing is cached.
+
+        :param name: Name of the cached method.
+        :type name: str
+        :param key: Hashable key of the arguments.
+        :param compute: Callable computing the result.
+        :type compute: callable
+        :param maxsize: Maximum number of cached results of the method.
+        :type maxsize: int
+        """
+        with self._lock:
+            cache = self._caches.get(name)
+            if cache is not None and key in cache:
+                cache.move_to_end(key)
+                self._stats.setdefault(name, [0, 0])[0] += 1
+                return cache[key]
+            flights = self._flights.setdefault(name, SingleFlight())
+
+        def compute_and_store():
+            value = compute()
+            with self._lock:
+                # Results of calls started before clear() are not cached.
+                if self._flights.get(name) is flights:
+                    self._set(name, key, value, maxsize)
+            return value
+
+        return flights.do(key, compute_and_store)
+
+    def _set(self, name, key, value, maxsize):
+        cache = self._caches.setdefault(name, OrderedDict())
+        cache[key] = value
+        cache.move_to_end(key)
+        if maxsize is not None:
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+    def clear(self, name):
+        """Remove all results and statistics of a method.
+
+        Results being computed are still returned to their callers, but are
+        not cached.
+        """
+        with self._lock:
+            self._caches.pop(name, None)
+            self._stats.pop(name, None)
+            self._flights.pop(name, None)
+
+    def _info(self, name, maxsize):
+        hits, misses = self._stats.get(name, (0, 0))
+        flights = self._flights.get(name)
+        if flights is not None:
+            hits += flights.shared
+            misses += flights.calls - flights.shared
+        return CacheInfo(hits, misses, maxsize, len(self._caches.get(name, ())))
+
+    def info(self, name, maxsize):
+        with self._lock:
+            return self._info(name, maxsize)
+
+
+_building = threading.local()
+
+# Separates positional from keyword arguments in cache keys.
+_KWARGS_MARK = object()
+
+
+@contextmanager
+def building(instance, generation):
+    """Direct cached calls on instance in this thread to a generation.
+
+    This is used to compute results for a new generation in the background
+    while other threads are served from the current generation.
+    """
+    previous = getattr(_building, "targets", {})
+    _building.targets = {**previous, id(instance): generation}
+    try:
+        yield generation
+    finally:
+        _building.targets = previous
+
+
+def pin_generation(instance):
+    """Use the current generation of instance for the rest of the request.
+
+    All cached calls on instance during the current request read the same
+    generation, even if it is replaced by another thread in the meantime.
+    """
+    pinned = g.setdefault("_cache_generations", {})
+    pinned[id(instance)] = instance._cache_generation
+
+
+def current_generation(instance):
+    """Return the generation used for cached calls on instance in this thread.
+
+    This is the generation being built in this thread, the generation pinned
+    by the current request, or the current generation of instance.
+    """
+    generation = getattr(_building, "targets", {}).get(id(instance))
+    if generation is None and has_request_context():
+        generation = g.get("_cache_generations", {}).get(id(instance))
+    if generation is None:
+        generation = instance._cache_generation
+    return generation
+
+
+class _BoundCachedMethod:
+    def __init__(self, method, instance):
+        self._method = method
+        self._instance = instance
+
+    def __call__(self, *args, **kwargs):
+        key = args
+        if kwargs:
+            key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+        return current_generation(self._instance).get_or_compute(
+            self._method.name,
+            key,
+            lambda: self._method.func(self._instance, *args, **kwargs),
+            self._method.maxsize,
+        )
+
+    def cache_info(self):
+        return current_generation(self._instance).info(
+            self._method.name, self._method.maxsize
+        )
+
+    def cache_clear(self):
+        current_generation(self._instance).clear(self._method.name)
+
+
+class CachedMethod:
+    """Descriptor caching the results of a method in the current generation.
+
+    The results are stored in the :py:class:`CacheGeneration` of the
+    instance, see :py:func:`cached_method`.
+    """
+
+    def __init__(self, func, maxsize):
+        self.func = func
+        self.maxsize = maxsize
+        self.name = func.__name__
+        functools.update_wrapper(self, func)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return _BoundCachedMethod(self, instance)
+
+
+def cached_method(maxsize=128):
+    """Cache the results of a method in the instance's cache generation.
+
+    This works like :py:func:`functools.lru_cache` applied to a method,
+    including :code:`cache_info()` and :code:`cache_clear()`, but results are
+    stored in the :py:class:`CacheGeneration` of the instance's
+    :code:`_cache_generation` attribute, so that a new generation can be
+    computed in the background and replace the current one at once.
+
+    :param maxsize: Maximum number of cached results per generation, or
+        :code:`None` for no limit (default: 128).
+    :type maxsize: int
+    """
+    if callable(maxsize):
+        return CachedMethod(maxsize, 128)
+
+    def decorator(func):
+        return CachedMethod(func, maxsize)
+
+    return decorator
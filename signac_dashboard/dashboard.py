@@ -10,8 +10,10 @@ import os
 import secrets
 import shlex
 import sys
+import tempfile
+import threading
+import time
 import warnings
-from functools import lru_cache
 from itertools import groupby
 from numbers import Real
 from urllib.parse import urlencode
@@ -20,14 +22,49 @@ import flask_login
 import jinja2
 import natsort
 import signac
-from flask import Flask, flash, g, redirect, render_template, request, session, url_for
+from flask import (
+    Flask,
+    Response,
+    abort,
+    flash,
+    g,
+    has_request_context,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
 from flask_assets import Bundle, Environment
 from flask_turbolinks import turbolinks
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
-
+from werkzeug.exceptions import ServiceUnavailable
+
+from .admission import AdmissionLimiter
+from .cache import (
+    CachedMethod,
+    CacheGeneration,
+    SingleFlight,
+    building,
+    cached_method,
+    current_generation,
+    pin_generation,
+)
+from .events import EventBroker, format_event, workspace_events
+from .export import FORMATS, stream_export
+from .index import detect_schema, job_ids, load_statepoints
+from .metrics import Metrics
 from .pagination import Pagination
-from .util import LazyView
+from .profiler import Profiler
+from .timing import (
+    get_timings,
+    module_timing_name,
+    record,
+    server_timing_header,
+    timed,
+)
+from .util import KeyedLock, LazyView, is_job_id
 from .version import __version__
 
 logger = logging.getLogger(__name__)
@@ -37,11 +74,67 @@ class _FileSystemEventHandler(FileSystemEventHandler):
     def __init__(self, dashboard):
         self.dashboard = dashboard
 
+    def on_any_event(self, event):
+        self.dashboard.metrics["watcher_events_total"].inc(event_type=event.event_type)
+        workspace = os.path.realpath(self.dashboard.project.workspace)
+        for change in workspace_events(event, workspace):
+            self.dashboard.events.publish(change)
+
     def on_modified(self, event):
         if os.path.realpath(event.src_path) == os.path.realpath(
             self.dashboard.project.workspace
         ):
-            self.dashboard.update_cache()
+            self.dashboard._update_cache(cause="watcher")
+
+
+class _CacheWarmer:
+    """Rebuild the caches of a dashboard in a background thread."""
+
+    def __init__(self, dashboard):
+        self.dashboard = dashboard
+        self._condition = threading.Condition()
+        self._pending = False
+        self._busy = True
+        self._thread = threading.Thread(
+            target=self._run, name="cache-warmer", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def request(self):
+        """Request a rebuild of the caches."""
+        with self._condition:
+            self._pending = True
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Wait until no rebuild is running or requested.
+
+        :returns: Whether the caches are warm, :code:`False` on timeout.
+        :rtype: bool
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def _run(self):
+        try:
+            self.dashboard._warm_caches()
+        except Exception as error:
+            logger.error(f"Error while warming caches: {error}")
+        while True:
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._pending)
+                self._pending = False
+                self._busy = True
+            try:
+                self.dashboard._rebuild_caches()
+            except Exception as error:
+                logger.error(f"Error while rebuilding caches: {error}")
 
 
 class User(flask_login.UserMixin):
@@ -69,11 +162,43 @@ class Dashboard:
     - **HOST**: Sets binding address (default: localhost).
     - **PORT**: Sets port to listen on (default: 8888).
     - **DEBUG**: Enables debug mode if :code:`True` (default: :code:`False`).
-    - **PROFILE**: Enables the profiler
-      :py:class:`werkzeug.middleware.profiler.ProfilerMiddleware` if
-      :code:`True` (default: :code:`False`).
+    - **WORKERS**: Number of worker processes started by :py:meth:`.serve`
+      (default: :code:`None`, the number of CPUs).
+    - **THREADS**: Number of request threads per worker process started by
+      :py:meth:`.serve` (default: 8).
+    - **PROFILE**: Enables the :py:class:`~.profiler.Profiler` if :code:`True`.
+      Profiles of sampled requests are written to **PROFILE_DIR** and the
+      slowest requests are listed with their most expensive functions at
+      :code:`/profiles` (default: :code:`False`).
+    - **PROFILE_DIR**: Directory for the :code:`.prof` files of profiled
+      requests, one subdirectory per route (default: :code:`None`, a new
+      temporary directory).
+    - **PROFILE_SAMPLE_RATE**: Fraction of requests to profile (default: 0.1).
+    - **PROFILE_MAX_RECORDS**: Number of slowest profiled requests listed at
+      :code:`/profiles`, whose :code:`.prof` files are kept (default: 100).
     - **PER_PAGE**: Maximum number of jobs to show per page
       (default: 24).
+    - **MAX_PER_PAGE**: Upper bound for the number of jobs per page requested
+      with the :code:`per_page` query argument (default: 100).
+    - **BACKLOG**: Number of connections per worker process started by
+      :py:meth:`.serve` that wait for a free request thread. Further
+      connections are rejected immediately with the status 503 and a
+      :code:`Retry-After` header (default: :code:`None`, the value of
+      **THREADS**).
+    - **CONCURRENCY_LIMITS**: Dictionary mapping routes, such as
+      :code:`'/jobs/'` or :code:`'/search'`, to the maximum number of requests
+      to the route handled concurrently (default: half of **THREADS** for
+      :code:`'/jobs/'` and :code:`'/search'`, which render cards).
+    - **QUEUE_DEPTH**: Maximum number of requests per limited route that wait
+      for a free slot. Queued requests occupy request threads, so the depth
+      is at most **THREADS** minus the limit of the route minus one. Further
+      requests are rejected with the status 503 and a :code:`Retry-After`
+      header (default: :code:`None`, that bound).
+    - **QUEUE_TIMEOUT**: Time in seconds that a request waits in the queue
+      before it is rejected (default: 2). The waiting time is reported as the
+      :code:`queue` phase of the request timings.
+    - **RETRY_AFTER**: Seconds sent in the :code:`Retry-After` header of
+      rejected requests (default: 5).
     - **CARDS_PER_ROW**: Cards to show per row in the desktop view. Must be a
       factor of 12 (default: 3).
     - **ACCESS_TOKEN**: The access token required to login to the dashboard.
@@ -87,6 +212,51 @@ class Dashboard:
       statements, which potentially allows arbitrary code execution from user
       input. *Caution:* This should only be enabled in trusted environments,
       never on a publicly-accessible server (default: :code:`False`).
+    - **INDEX_WORKERS**: Number of workers used to read state points and detect
+      the project schema when the caches are cold (default: :code:`None`, chosen
+      by :py:mod:`concurrent.futures`).
+    - **INDEX_EXECUTOR**: Either :code:`'thread'` or :code:`'process'`, the kind
+      of pool used for reading state points. The schema is detected in
+      worker processes only with :code:`'process'`, since threads would not
+      compute it in parallel (default: :code:`'thread'`).
+    - **SERVER_TIMING**: If True, responses include a :code:`Server-Timing`
+      header with the time spent in each phase of the request, such as search,
+      sort, pagination, title generation, each module's cards, and template
+      rendering. The timings are also logged at the debug level
+      (default: :code:`True`).
+    - **METRICS_TOKEN**: The token required to read the :code:`/metrics`
+      endpoint, given as an :code:`Authorization: Bearer` header or a
+      :code:`token` query argument. The endpoint reports request latencies per
+      route, hits and misses of the dashboard caches, cache invalidations by
+      cause, file system watcher events, and module render times in the
+      Prometheus text format. The metrics are collected per process, so each
+      worker process started by :py:meth:`.serve` reports its own values and
+      a scrape reads the values of the worker serving it. Set to
+      :code:`None` to disable the token
+      (default: the value of **ACCESS_TOKEN**).
+    - **CACHE_WARMING**: If True, a background thread fills the caches of the
+      sorted job list, the project schema, the titles of jobs on the first
+      **CACHE_WARMING_PAGES** pages, and the searches in
+      **CACHE_WARMING_SEARCHES** after startup and after each invalidation.
+      While the caches are rebuilt after an invalidation, requests are served
+      from the previous caches, and :py:meth:`.update_cache` returns before the
+      changes are shown (default: :code:`False`).
+    - **CACHE_WARMING_PAGES**: Number of pages of the job list whose job
+      titles are computed by the cache warmer (default: 1).
+    - **CACHE_WARMING_SEARCHES**: List of search queries whose results are
+      computed by the cache warmer (default: :code:`[]`).
+    - **EVENTS**: If True, open job pages subscribe to server-sent events at
+      :code:`/events` and update their cards when the job document or files
+      change, and job lists show a notice when jobs are added or removed
+      (default: :code:`False`). Each open page holds one request thread.
+    - **EVENTS_MAX_SUBSCRIBERS**: Maximum number of open event streams per
+      process. Further subscribers are rejected with the status 503 and a
+      :code:`Retry-After` header, so that streams do not occupy all request
+      threads (default: a quarter of **THREADS**, at least 1).
+    - **EVENTS_KEEPALIVE**: Interval in seconds of keep-alive comments sent
+      to subscribers without events (default: 15).
+    - **EVENTS_TIMEOUT**: Time in seconds after which an event stream is
+      closed. Browsers reconnect automatically (default: 300).
 
     :param config: Configuration dictionary (default: :code:`{}`).
     :type config: dict
@@ -101,7 +271,6 @@ class Dashboard:
             self.project = signac.get_project()
         else:
             self.project = project
-        self.project.update_cache()
 
         self.config = config
         self.modules = modules
@@ -116,8 +285,19 @@ class Dashboard:
         self.config.setdefault("HOST", "localhost")
         self.config.setdefault("DEBUG", False)
         self.config.setdefault("PORT", 8888)
+        self.config.setdefault("WORKERS", None)
+        self.config.setdefault("THREADS", 8)
         self.config.setdefault("PAGINATION", True)
         self.config.setdefault("PER_PAGE", 24)
+        self.config.setdefault("MAX_PER_PAGE", 100)
+        self.config.setdefault("BACKLOG", None)
+        card_limit = max(self.config["THREADS"] // 2, 1)
+        self.config.setdefault(
+            "CONCURRENCY_LIMITS", {"/jobs/": card_limit, "/search": card_limit}
+        )
+        self.config.setdefault("QUEUE_DEPTH", None)
+        self.config.setdefault("QUEUE_TIMEOUT", 2)
+        self.config.setdefault("RETRY_AFTER", 5)
         self.config.setdefault("CARDS_PER_ROW", 3)
         if 12 % self.config["CARDS_PER_ROW"] != 0:
             raise ValueError(
@@ -126,9 +306,47 @@ class Dashboard:
             )
 
         self.config.setdefault("ACCESS_TOKEN", secrets.token_hex(24))
+        self.config.setdefault("INDEX_WORKERS", None)
+        self.config.setdefault("INDEX_EXECUTOR", "thread")
+        self.config.setdefault("SERVER_TIMING", True)
+        self.config.setdefault("METRICS_TOKEN", self.config["ACCESS_TOKEN"])
+        self.config.setdefault("PROFILE", False)
+        self.config.setdefault("PROFILE_DIR", None)
+        self.config.setdefault("PROFILE_SAMPLE_RATE", 0.1)
+        self.config.setdefault("PROFILE_MAX_RECORDS", 100)
+        self.config.setdefault("CACHE_WARMING", False)
+        self.config.setdefault("CACHE_WARMING_PAGES", 1)
+        self.config.setdefault("CACHE_WARMING_SEARCHES", [])
+        self.config.setdefault("EVENTS", False)
+        self.config.setdefault(
+            "EVENTS_MAX_SUBSCRIBERS", max(self.config["THREADS"] // 4, 1)
+        )
+        self.config.setdefault("EVENTS_KEEPALIVE", 15)
+        self.config.setdefault("EVENTS_TIMEOUT", 300)
+
+        self.metrics = self._create_metrics()
+        self._cache_generation = CacheGeneration()
+        self._cache_lock = threading.Lock()
+        # Hits and misses of the cache generations that were replaced.
+        self._cache_totals = {}
+        # Serializes the writes of modules to the document of each job.
+        self._document_locks = KeyedLock()
+        self._card_flights = SingleFlight()
+        self.events = EventBroker(
+            max_subscriptions=self.config["EVENTS_MAX_SUBSCRIBERS"]
+        )
+        self._job_watches = {}
+        self._job_watches_lock = threading.Lock()
+        self._cache_warmer = None
+
+        # Read all state points into the project's cache before serving
+        self._load_statepoints()
+        self.project.update_cache()
 
         # Create and configure the Flask application
         self.app = self._create_app(self.config)
+        self.profiler = None
+        self._setup_profiler()
 
         # Initialize the login manager
         self.login_manager = flask_login.LoginManager()
@@ -175,6 +393,10 @@ class Dashboard:
             modules_by_context[context_key] = [m for m in context_group]
         self._modules_by_context = modules_by_context
 
+        if self.config["CACHE_WARMING"]:
+            self._cache_warmer = _CacheWarmer(self)
+            self._cache_warmer.start()
+
     def _create_app(self, config={}):
         """Create a Flask application.
 
@@ -191,13 +413,6 @@ class Dashboard:
         # Load the provided config
         app.config.update(config)
 
-        # Enable profiling
-        if app.config.get("PROFILE"):
-            logger.warning("Application profiling is enabled.")
-            from werkzeug.contrib.profiler import ProfilerMiddleware
-
-            app.wsgi_app = ProfilerMiddleware(app.wsgi_app, restrictions=[10])
-
         # Set up default signac-dashboard static and template paths
         signac_dashboard_path = os.path.dirname(__file__)
         app.static_folder = signac_dashboard_path + "/static"
@@ -220,6 +435,23 @@ class Dashboard:
 
         return app
 
+    def _setup_profiler(self):
+        """Wrap the application in the profiler if profiling is enabled."""
+        if not self.config["PROFILE"] or self.profiler is not None:
+            return
+        profile_dir = self.config["PROFILE_DIR"]
+        if profile_dir is None:
+            profile_dir = tempfile.mkdtemp(prefix="signac-dashboard-profiles-")
+        logger.warning(f"Application profiling is enabled, writing to '{profile_dir}'.")
+        self.profiler = Profiler(
+            self.app.wsgi_app,
+            self.app.url_map,
+            profile_dir,
+            sample_rate=self.config["PROFILE_SAMPLE_RATE"],
+            max_records=self.config["PROFILE_MAX_RECORDS"],
+        )
+        self.app.wsgi_app = self.profiler
+
     def _create_assets(self):
         """Add assets for inclusion in the dashboard HTML."""
         assets = Environment(self.app)
@@ -237,6 +469,106 @@ class Dashboard:
         assets.register("sortable", sortable)
         return assets
 
+    def _create_metrics(self):
+        """Create the registry of metrics exposed at :code:`/metrics`."""
+        metrics = Metrics()
+        metrics.histogram(
+            "request_duration_seconds",
+            "Time spent handling requests.",
+            ("method", "route"),
+        )
+        metrics.counter(
+            "requests_total",
+            "Number of handled requests.",
+            ("method", "route", "status"),
+        )
+        metrics.histogram(
+            "module_render_duration_seconds",
+            "Time spent generating the cards of a module.",
+            ("module",),
+        )
+        metrics.counter(
+            "cache_invalidations_total",
+            "Number of times the dashboard caches were cleared.",
+            ("cause",),
+        )
+        metrics.counter(
+            "requests_rejected_total",
+            "Number of requests rejected because of concurrency limits.",
+            ("route",),
+        )
+        metrics.gauge(
+            "requests_queued",
+            "Number of requests waiting for a concurrency slot.",
+            ("route",),
+            lambda: [
+                ({"route": route}, limiter.waiting)
+                for route, limiter in self._admission_limiters.items()
+            ],
+        )
+        metrics.gauge(
+            "event_subscribers",
+            "Number of open server-sent event streams.",
+            (),
+            lambda: [({}, len(self.events))],
+        )
+        metrics.counter(
+            "watcher_events_total",
+            "Number of file system events in the workspace.",
+            ("event_type",),
+        )
+
+        metrics.gauge(
+            "module_renders_coalesced_total",
+            "Number of module card requests served by a concurrent render.",
+            (),
+            lambda: [({}, self._card_flights.shared)],
+            type="counter",
+        )
+
+        def cache_info(field):
+            def collect():
+                for name, method in self._cached_methods():
+                    value = getattr(method.cache_info(), field)
+                    yield {"cache": name}, float("inf") if value is None else value
+
+            return collect
+
+        def cache_total(index):
+            def collect():
+                for name, totals in self._cache_stats().items():
+                    yield {"cache": name}, totals[index]
+
+            return collect
+
+        metrics.gauge(
+            "cache_hits_total",
+            "Number of cache hits of all cache generations.",
+            ("cache",),
+            cache_total(0),
+            type="counter",
+        )
+        metrics.gauge(
+            "cache_misses_total",
+            "Number of cache misses of all cache generations.",
+            ("cache",),
+            cache_total(1),
+            type="counter",
+        )
+        metrics.gauge(
+            "cache_size",
+            "Number of cached entries.",
+            ("cache",),
+            cache_info("currsize"),
+        )
+        metrics.gauge(
+            "cache_max_size",
+            "Maximum number of cached entries.",
+            ("cache",),
+            cache_info("maxsize"),
+        )
+        return metrics
+
     def register_module_asset(self, asset):
         """Register an asset required by a dashboard module.
 
@@ -261,7 +593,8 @@ class Dashboard:
 
         Use :py:meth:`~.main` instead of this method for the command-line
         interface. Arguments to this function are passed directly to
-        :py:meth:`flask.Flask.run`.
+        :py:meth:`flask.Flask.run`. This runs Flask's development server, use
+        :py:meth:`.serve` in production.
         """
         host = self.config["HOST"]
         port = self.config["PORT"]
@@ -278,12 +611,173 @@ class Dashboard:
                     port += 1
                 pass
 
-    @lru_cache
+    def serve(self):
+        """Serve the dashboard from multiple processes.
+
+        The project and the dashboard caches are loaded before **WORKERS**
+        worker processes are forked, so that their memory is shared. Each
+        worker handles requests on **THREADS** threads. Changes in the
+        workspace are detected by a single watcher in the parent process,
+        which notifies the workers. See :py:class:`~.server.PreforkServer`.
+
+        Use :py:meth:`~.main` with the :code:`serve` command instead of this
+        method for the command-line interface.
+        """
+        from .server import PreforkServer
+
+        PreforkServer(
+            self,
+            self.config["HOST"],
+            self.config["PORT"],
+            workers=self.config["WORKERS"] or os.cpu_count() or 1,
+            threads=self.config["THREADS"],
+            backlog=self.config["BACKLOG"],
+            retry_after=self.config["RETRY_AFTER"],
+            on_stop=self.events.close,
+        ).serve()
+
+    def export(self, file, export_format="csv", query=None, document_keys=()):
+        """Export state points and document values of jobs to a file.
+
+        Each job is a row with its id, its flattened state point, and the
+        values of the document keys. Job ids and rows are generated one job at
+        a time, in the order of the workspace, so that exports of any number
+        of jobs run in constant memory. See :py:func:`~.export.stream_export`
+        for the formats.
+
+        :param file: Binary file object to write to.
+        :param export_format: One of :code:`'csv'`, :code:`'jsonl'` and
+            :code:`'parquet'` (default: :code:`'csv'`).
+        :type export_format: str
+        :param query: Search query selecting the jobs, as entered in the
+            dashboard (default: :code:`None`, all jobs).
+        :type query: str
+        :param document_keys: Dotted document keys (default: :code:`()`).
+        :type document_keys: list of str
+        """
+
+        def notify(message, category="message"):
+            logger.info(message)
+
+        ids = self._search_job_ids(query, notify=notify)
+        for chunk in self._export(ids, export_format, document_keys):
+            file.write(chunk)
+
+    def _export(self, job_ids, export_format="csv", document_keys=()):
+        schema = self._detect_schema()
+        return stream_export(
+            self.project,
+            job_ids,
+            dict(schema.items()),
+            document_keys=document_keys,
+            export_format=export_format,
+        )
+
+    def _after_fork(self):
+        """Restart the background threads of a forked worker process."""
+        if self._cache_warmer is not None:
+            self._cache_warmer = _CacheWarmer(self)
+            self._cache_warmer.start()
+        # The parent process watches the workspace. Workers only watch the
+        # directories of jobs shown on pages subscribed to events.
+        self.observer = Observer()
+        self._job_watches = {}
+        self.observer.start()
+
+    def _subscribe(self, jobs):
+        """Subscribe to change events of the project and some jobs.
+
+        The directories of the jobs are watched while they have subscribers.
+
+        :param jobs: Ids of the jobs.
+        :type jobs: iterable of str
+        :returns: The subscription, or :code:`None` if the maximum number of
+            subscribers is reached.
+        :rtype: :py:class:`~.events.Subscription`
+        """
+        workspace = self.project.workspace
+        jobs = {
+            job_id
+            for job_id in jobs
+            if is_job_id(job_id) and os.path.isdir(os.path.join(workspace, job_id))
+        }
+        subscription = self.events.subscribe(jobs)
+        if subscription is None:
+            return None
+        with self._job_watches_lock:
+            for job_id in jobs:
+                entry = self._job_watches.get(job_id)
+                if entry is None:
+                    try:
+                        watch = self.observer.schedule(
+                            self.event_handler, os.path.join(workspace, job_id)
+                        )
+                    except OSError as error:
+                        logger.warning(f"Could not watch job {job_id}: {error}")
+                        continue
+                    entry = self._job_watches[job_id] = [watch, 0]
+                entry[1] += 1
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        """End a subscription and stop watching jobs without subscribers."""
+        self.events.unsubscribe(subscription)
+        with self._job_watches_lock:
+            for job_id in subscription.jobs:
+                entry = self._job_watches.get(job_id)
+                if entry is None:
+                    continue
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._job_watches[job_id]
+                    try:
+                        self.observer.unschedule(entry[0])
+                    except (KeyError, OSError):
+                        pass
+
+    def _event_stream(self, subscription):
+        """Yield server-sent events of a subscription until it times out."""
+        try:
+            yield "retry: 5000\n\n"
+            deadline = time.monotonic() + self.config["EVENTS_TIMEOUT"]
+            while time.monotonic() < deadline and not subscription.closed:
+                changes = subscription.get(
+                    timeout=min(
+                        self.config["EVENTS_KEEPALIVE"], deadline - time.monotonic()
+                    )
+                )
+                if not changes:
+                    yield ": keep-alive\n\n"
+                for change in changes:
+                    yield format_event(change)
+        finally:
+            self._unsubscribe(subscription)
+
+    def _load_statepoints(self):
+        """Read uncached state points concurrently into the project cache."""
+        num_loaded = load_statepoints(
+            self.project,
+            workers=self.config["INDEX_WORKERS"],
+            executor=self.config["INDEX_EXECUTOR"],
+        )
+        if num_loaded:
+            logger.info(f"Loaded {num_loaded} state points.")
+
+    @cached_method()
+    def _detect_schema(self, exclude_const=False):
+        return detect_schema(
+            self.project,
+            exclude_const=exclude_const,
+            workers=self.config["INDEX_WORKERS"],
+            executor=self.config["INDEX_EXECUTOR"],
+        )
+
+    @cached_method()
     def _schema_variables(self):
-        schema = self.project.detect_schema(exclude_const=True)
+        schema = self._detect_schema(exclude_const=True)
         return [key for key in schema]
 
-    @lru_cache
+    @cached_method()
     def _project_min_len_unique_id(self):
         return self.project.min_len_unique_id()
 
@@ -354,14 +848,29 @@ class Dashboard:
         key = natsort.natsort_keygen(key=self.job_title, alg=natsort.REAL)
         return key(job)
 
-    @lru_cache
+    @cached_method()
     def _get_all_jobs(self):
-        return sorted(self.project.find_jobs(), key=self.job_sorter)
-
-    @lru_cache(maxsize=100)
-    def _job_search(self, query):
+        with timed("search"):
+            jobs = list(self.project.find_jobs())
+        with timed("sort"):
+            return sorted(jobs, key=self.job_sorter)
+
+    def _parse_query(self, query, notify=flash):
+        """Parse a search query into a filter.
+
+        :param query: Search query, as JSON or in the syntax of the signac
+            command line interface.
+        :type query: str
+        :param notify: Function called with a message and its category to
+            tell the user how the query was interpreted (default:
+            :py:func:`flask.flash`).
+        :type notify: callable
+        :rtype: dict
+        :raises RuntimeError: If the query uses :code:`$where` without
+            **ALLOW_WHERE**.
+        """
         if "$where" in query and not self.config.get("ALLOW_WHERE", False):
-            flash(
+            notify(
                 "Searches using $where allow arbitrary code execution and "
                 "are only allowed when the configuration option "
                 "'ALLOW_WHERE' is enabled. See also: <a href=\"https://signac.readthedocs.io/projects/dashboard/en/latest/security.html\">Security Guidelines</a>",  # noqa:E501
@@ -370,33 +879,36 @@ class Dashboard:
             raise RuntimeError("ALLOW_WHERE must be enabled for this query.")
 
         try:
-            if query is None:
-                f = None
-            else:
-                try:
-                    f = json.loads(query)
-                except json.JSONDecodeError:
-                    if "True" in query and "False" in query:
-                        flash(
-                            'Interpreting "True" and "False" as strings. For'
-                            'boolean values use "true" and "false".',
-                            "warning",
-                        )
-                    elif "True" in query:
-                        flash(
-                            'Interpreting "True" as a string. For a boolean value use "true".',
-                            "warning",
-                        )
-                    elif "False" in query:
-                        flash(
-                            'Interpreting "False" as a string. For a boolean value use "false".',
-                            "warning",
-                        )
-                    query = shlex.split(query)
-                    f = signac.filterparse.parse_filter_arg(query)
-                    flash(f"Search string interpreted as '{json.dumps(f)}'.")
-            jobs = self.project.find_jobs(filter=f)
-            return sorted(jobs, key=lambda job: self.job_sorter(job))
+            return json.loads(query)
+        except json.JSONDecodeError:
+            if "True" in query and "False" in query:
+                notify(
+                    'Interpreting "True" and "False" as strings. For'
+                    'boolean values use "true" and "false".',
+                    "warning",
+                )
+            elif "True" in query:
+                notify(
+                    'Interpreting "True" as a string. For a boolean value use "true".',
+                    "warning",
+                )
+            elif "False" in query:
+                notify(
+                    'Interpreting "False" as a string. For a boolean value use "false".',
+                    "warning",
+                )
+            f = signac.filterparse.parse_filter_arg(shlex.split(query))
+            notify(f"Search string interpreted as '{json.dumps(f)}'.", "message")
+            return f
+
+    @cached_method(maxsize=100)
+    def _job_search(self, query):
+        try:
+            f = None if query is None else self._parse_query(query)
+            with timed("search"):
+                jobs = list(self.project.find_jobs(filter=f))
+            with timed("sort"):
+                return sorted(jobs, key=lambda job: self.job_sorter(job))
         except json.JSONDecodeError as error:
             flash(
                 "Failed to parse query argument. "
@@ -405,7 +917,26 @@ class Dashboard:
             )
             raise error
 
-    @lru_cache(maxsize=65536)
+    def _search_job_ids(self, query=None, notify=flash):
+        """Return an iterator of the ids of the jobs matching a query.
+
+        The query is parsed immediately, so that invalid queries raise before
+        the ids are consumed. The ids are generated lazily in the order of
+        the workspace, without sorting or opening the jobs.
+
+        :param query: Search query (default: :code:`None`, all jobs).
+        :type query: str
+        :param notify: Function called with messages about the query, see
+            :py:meth:`_parse_query` (default: :py:func:`flask.flash`).
+        :type notify: callable
+        :rtype: iterator of str
+        """
+        if query is None:
+            return job_ids(self.project)
+        f = self._parse_query(query, notify)
+        return (job.id for job in self.project.find_jobs(filter=f))
+
+    @cached_method(maxsize=65536)
     def _job_details(self, job):
         return {
             "job": job,
@@ -413,6 +944,7 @@ class Dashboard:
             "subtitle": self.job_subtitle(job),
         }
 
+    @timed("pagination")
     def _setup_pagination(self, jobs):
         total_count = len(jobs) if isinstance(jobs, list) else 0
         page = request.args.get("page", 1)
@@ -426,10 +958,14 @@ class Dashboard:
             if per_page < 1:
                 raise ValueError("At least one job is required per page.")
         except ValueError:
+            per_page = self.config["PER_PAGE"]
             flash(
                 f"Pagination Error. Displaying {per_page} jobs per page.",
                 "danger",
             )
+        if per_page > self.config["MAX_PER_PAGE"]:
+            per_page = self.config["MAX_PER_PAGE"]
+            flash(f"Displaying at most {per_page} jobs per page.", "warning")
         pagination = Pagination(page, per_page, total_count)
         if pagination.page < 1 or pagination.page > pagination.pages:
             pagination.page = max(1, min(pagination.page, pagination.pages))
@@ -474,16 +1010,19 @@ class Dashboard:
                 == 0
             ):
                 flash("No modules for the JobContext are enabled.", "info")
-            return render_template("jobs_grid.html", *args, **kwargs)
+            with timed("render"):
+                return render_template("jobs_grid.html", *args, **kwargs)
         elif view_mode == "tiles":
             if (
                 len(session.get("enabled_module_indices", {}).get("JobContext", []))
                 == 0
             ):
                 flash("No modules for the JobContext are enabled.", "info")
-            return render_template("jobs_tile.html", *args, **kwargs)
+            with timed("render"):
+                return render_template("jobs_tile.html", *args, **kwargs)
         elif view_mode == "list":
-            return render_template("jobs_list.html", *args, **kwargs)
+            with timed("render"):
+                return render_template("jobs_list.html", *args, **kwargs)
         else:
             return self._render_error(ValueError(f"Invalid view mode: {view_mode}"))
 
@@ -498,7 +1037,8 @@ class Dashboard:
             == 0
         ):
             flash("No modules for the ProjectContext are enabled.", "info")
-        return render_template("project_info.html", *args, **kwargs)
+        with timed("render"):
+            return render_template("project_info.html", *args, **kwargs)
 
     def _render_error(self, error):
         if isinstance(error, Exception):
@@ -510,7 +1050,32 @@ class Dashboard:
         return render_template("error.html")
 
     def _get_job_details(self, jobs):
-        return [self._job_details(job) for job in list(jobs)]
+        with timed("titles"):
+            return [self._job_details(job) for job in list(jobs)]
+
+    def _get_module_cards(self, module, job_or_project):
+        """Return the cards of a module, timing the call to get_cards.
+
+        Concurrent requests for the same cards of the same cache generation
+        share one call to get_cards.
+        """
+        key = (
+            id(module),
+            getattr(job_or_project, "id", None),
+            current_generation(self).number,
+            request.full_path if has_request_context() else None,
+        )
+        start = time.perf_counter()
+        try:
+            return self._card_flights.do(
+                key, lambda: list(module.get_cards(job_or_project))
+            )
+        finally:
+            seconds = time.perf_counter() - start
+            record(module_timing_name(module), seconds, module.name)
+            self.metrics["module_render_duration_seconds"].observe(
+                seconds, module=module.name
+            )
 
     def add_url(
         self, import_name, url_rules=[], import_file="signac_dashboard", **kwargs
@@ -568,6 +1133,17 @@ class Dashboard:
                 **kwargs,
             )
 
+    def _queue_depth(self, limit):
+        """Return the queue depth of a route limited to limit requests.
+
+        Queued requests wait in request threads, so active and queued requests
+        of a route leave at least one of the **THREADS** threads free.
+        """
+        depth = max(self.config["THREADS"] - 1 - limit, 0)
+        if self.config["QUEUE_DEPTH"] is not None:
+            depth = min(depth, self.config["QUEUE_DEPTH"])
+        return depth
+
     def _register_routes(self):
         """Register routes with the Flask application.
 
@@ -576,6 +1152,14 @@ class Dashboard:
         modules are registered by this method.
         """
         dashboard = self
+        self._admission_limiters = {
+            route: AdmissionLimiter(
+                limit,
+                queue_depth=self._queue_depth(limit),
+                timeout=self.config["QUEUE_TIMEOUT"],
+            )
+            for route, limit in self.config["CONCURRENCY_LIMITS"].items()
+        }
 
         @dashboard.app.after_request
         def prevent_caching(response):
@@ -583,6 +1167,68 @@ class Dashboard:
                 response.headers["Cache-Control"] = "no-store"
             return response
 
+        @dashboard.app.before_request
+        def start_request_timer():
+            g._request_start = time.perf_counter()
+
+        @dashboard.app.before_request
+        def admit_request():
+            route = request.url_rule.rule if request.url_rule else None
+            limiter = self._admission_limiters.get(route)
+            if limiter is None:
+                return
+            start = time.perf_counter()
+            admitted = limiter.acquire()
+            record("queue", time.perf_counter() - start, "Queue wait")
+            if not admitted:
+                self.metrics["requests_rejected_total"].inc(route=route)
+                raise ServiceUnavailable(
+                    "The dashboard is busy, please retry later.",
+                    retry_after=self.config["RETRY_AFTER"],
+                )
+            g._admission_limiter = limiter
+
+        @dashboard.app.teardown_request
+        def release_admission(error=None):
+            limiter = g.pop("_admission_limiter", None)
+            if limiter is not None:
+                limiter.release()
+
+        @dashboard.app.before_request
+        def pin_cache_generation():
+            pin_generation(dashboard)
+
+        @dashboard.app.after_request
+        def add_server_timing(response):
+            timings = get_timings()
+            if "_request_start" in g:
+                seconds = time.perf_counter() - g._request_start
+                record("total", seconds)
+                route = request.url_rule.rule if request.url_rule else "<unmatched>"
+                self.metrics["request_duration_seconds"].observe(
+                    seconds, method=request.method, route=route
+                )
+                self.metrics["requests_total"].inc(
+                    method=request.method, route=route, status=response.status_code
+                )
+            if self.config["SERVER_TIMING"]:
+                response.headers["Server-Timing"] = server_timing_header(timings)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    json.dumps(
+                        {
+                            "method": request.method,
+                            "path": request.path,
+                            "status": response.status_code,
+                            "timings_ms": {
+                                name: round(1000 * seconds, 3)
+                                for name, (seconds, _) in timings.items()
+                            },
+                        }
+                    )
+                )
+            return response
+
         @dashboard.app.context_processor
         def injections():
             # inject new variables into the template context
@@ -597,6 +1243,7 @@ class Dashboard:
                 "modules_by_context": self._modules_by_context,
                 "enabled_module_indices": session["enabled_module_indices"],
                 "module_assets": self._module_assets,
+                "EVENTS": self.config["EVENTS"],
             }
 
         # Add pagination support from http://flask.pocoo.org/snippets/44/
@@ -606,6 +1253,10 @@ class Dashboard:
             args["page"] = page
             return url_for(request.endpoint, **args)
 
+        @dashboard.app.template_global()
+        def module_cards(module, job_or_project):
+            return self._get_module_cards(module, job_or_project)
+
         @dashboard.app.template_global()
         def modify_query(**new_values):
             args = request.args.copy()
@@ -659,6 +1310,25 @@ class Dashboard:
             flask_login.logout_user()
             return redirect(url_for("login"))
 
+        @dashboard.app.route("/metrics")
+        def metrics():
+            token = self.config["METRICS_TOKEN"]
+            if token is not None:
+                provided_token = request.args.get("token", "")
+                authorization = request.headers.get("Authorization", "")
+                if authorization.startswith("Bearer "):
+                    provided_token = authorization[len("Bearer ") :]
+                if not secrets.compare_digest(provided_token, token):
+                    abort(
+                        Response(
+                            "Unauthorized\n",
+                            401,
+                            {"WWW-Authenticate": "Bearer"},
+                            mimetype="text/plain",
+                        )
+                    )
+            return Response(self.metrics.expose(), content_type=Metrics.content_type)
+
         @dashboard.app.route("/favicon.ico")
         @flask_login.login_required
         def favicon():
@@ -671,11 +1341,17 @@ class Dashboard:
         self.add_url("views.project_info", ["/project/"])
         self.add_url("views.jobs_list", ["/jobs/"])
         self.add_url("views.show_job", ["/jobs/<jobid>"])
+        self.add_url("views.job_cards", ["/jobs/<jobid>/cards"])
+        self.add_url("views.events", ["/events"])
         self.add_url(
             "views.get_file",
             ["/jobs/<jobid>/file/<path:filename>", "/project/file/<path:filename>"],
         )
+        self.add_url("views.download_files", ["/download"])
+        self.add_url("views.export", ["/export"])
         self.add_url("views.change_modules", ["/modules"], methods=["POST"])
+        self.add_url("views.profiles", ["/profiles"])
+        self.add_url("views.get_profile", ["/profiles/<path:filename>"])
 
     def update_cache(self):
         """Clear project and dashboard server caches.
@@ -684,20 +1360,137 @@ class Dashboard:
         altered, this method may need to be called before the dashboard
         reflects those changes.
         """
+        self._update_cache(cause="update_cache")
+
+    def _cached_methods(self):
+        """Return the names and bound methods of all cached dashboard methods.
+
+        This includes methods of subclasses cached with
+        :py:func:`functools.lru_cache`.
+        """
+        members = inspect.getmembers(
+            type(self),
+            lambda member: isinstance(member, CachedMethod)
+            or hasattr(member, "cache_clear"),
+        )
+        return [(name, getattr(self, name)) for name, _ in members]
+
+    def _retire_cache_stats(self, generation):
+        """Add the hits and misses of a replaced generation to the totals."""
+        for name, method in self._cached_methods():
+            if isinstance(getattr(type(self), name), CachedMethod):
+                info = generation.info(name, None)
+            else:
+                info = method.cache_info()
+            totals = self._cache_totals.setdefault(name, [0, 0])
+            totals[0] += info.hits
+            totals[1] += info.misses
+
+    def _cache_stats(self):
+        """Return the hits and misses of each cached method since startup.
+
+        Each cache generation counts its own hits and misses, which are added
+        to the totals when it is replaced, so that the totals never decrease.
+        """
+        with self._cache_lock:
+            generation = self._cache_generation
+            stats = {}
+            for name, method in self._cached_methods():
+                if isinstance(getattr(type(self), name), CachedMethod):
+                    info = generation.info(name, None)
+                else:
+                    info = method.cache_info()
+                hits, misses = self._cache_totals.get(name, (0, 0))
+                stats[name] = (hits + info.hits, misses + info.misses)
+            return stats
+
+    def _update_cache(self, cause):
+        """Clear project and dashboard server caches.
+
+        :param cause: Reason for clearing the caches, reported in the metrics.
+        :type cause: str
+        """
+        self.metrics["cache_invalidations_total"].inc(cause=cause)
+        if self._cache_warmer is not None:
+            self._cache_warmer.request()
+            return
+        self._reload_project()
+        self._publish_cache_generation(CacheGeneration())
+
+    def _reload_project(self):
+        """Read new state points and update the signac project cache."""
         # Try to update signac project cache. Requires signac 0.9.2 or later.
         with warnings.catch_warnings():
             warnings.simplefilter(action="ignore", category=FutureWarning)
             try:
+                self._load_statepoints()
                 self.project.update_cache()
             except Exception:
                 pass
 
-        # Clear caches of all dashboard methods
-        members = inspect.getmembers(self, predicate=inspect.ismethod)
-        for func in filter(
-            lambda f: hasattr(f, "cache_clear"), map(lambda x: x[1], members)
-        ):
-            func.cache_clear()
+    def _publish_cache_generation(self, generation):
+        """Replace the current cache generation and clear other caches.
+
+        Other requests in progress keep reading the generation they started
+        with, while the current request reads the new generation.
+        """
+        with self._cache_lock:
+            self._retire_cache_stats(self._cache_generation)
+            generation.number = self._cache_generation.number + 1
+            self._cache_generation = generation
+            for name, method in self._cached_methods():
+                if not isinstance(getattr(type(self), name), CachedMethod):
+                    method.cache_clear()
+        if has_request_context():
+            pin_generation(self)
+
+    def _warm_caches(self):
+        """Compute the results of commonly used cached methods."""
+        with self.app.test_request_context():
+            jobs = self._get_all_jobs()
+            self._detect_schema()
+            self._project_min_len_unique_id()
+            num_jobs = self.config["CACHE_WARMING_PAGES"] * self.config["PER_PAGE"]
+            for job in jobs[:num_jobs]:
+                self._job_details(job)
+            for query in self.config["CACHE_WARMING_SEARCHES"]:
+                try:
+                    self._job_search(query)
+                except Exception as error:
+                    logger.warning(f"Could not warm the search '{query}': {error}")
+
+    def _rebuild_caches(self):
+        """Compute a new cache generation while serving the current one."""
+        generation = CacheGeneration()
+        with building(self, generation):
+            self._reload_project()
+            self._warm_caches()
+        self._publish_cache_generation(generation)
+
+    def _update_job_cache(self, *jobs):
+        """Update dashboard caches after job documents were changed.
+
+        The titles and subtitles of the changed jobs are recomputed when
+        needed, or of all jobs if no jobs are given. Searches whose query
+        mentions :code:`doc` may depend on job documents, so their results are
+        dropped. State points cannot change, so the sorted list of all jobs
+        and other searches remain valid. The other results are copied to a new
+        generation, which replaces the current one without affecting requests
+        in progress.
+
+        :param jobs: The jobs (or job ids) that were changed.
+        """
+        self.metrics["cache_invalidations_total"].inc(cause="job_document")
+        drop_keys = {"_job_search": lambda key: "doc" in str(key[0])}
+        if jobs:
+            changed = {getattr(job, "id", job) for job in jobs}
+            drop_keys["_job_details"] = lambda key: key[0].id in changed
+            exclude = ()
+        else:
+            exclude = ("_job_details",)
+        self._publish_cache_generation(
+            self._cache_generation.copy(exclude=exclude, drop_keys=drop_keys)
+        )
 
     def __call__(self, environ, start_response):
         """Call the dashboard as a WSGI application."""
@@ -732,6 +1525,14 @@ class Dashboard:
         if command_args is not None and len(command_args) == 0:
             command_args = None
 
+        def _print_access_url():
+            if self.config["ACCESS_TOKEN"] is not None:
+                print(
+                    f"To access this server, connect to:\n\n"
+                    f"http://{self.config['HOST']}:{self.config['PORT']}/"
+                    f"login?token={self.config['ACCESS_TOKEN']}\n"
+                )
+
         def _run(args):
             kwargs = vars(args)
             if kwargs.get("host", None) is not None:
@@ -739,16 +1540,35 @@ class Dashboard:
             if kwargs.get("port", None) is not None:
                 self.config["PORT"] = kwargs.pop("port")
             self.config["PROFILE"] = kwargs.pop("profile")
+            if kwargs.get("profile_dir", None) is not None:
+                self.config["PROFILE_DIR"] = kwargs.pop("profile_dir")
+            if kwargs.get("profile_sample_rate", None) is not None:
+                self.config["PROFILE_SAMPLE_RATE"] = kwargs.pop("profile_sample_rate")
             self.config["DEBUG"] = kwargs.pop("debug")
+            self._setup_profiler()
+            _print_access_url()
+            self.run()
 
-            if self.config["ACCESS_TOKEN"] is not None:
-                print(
-                    f"To access this server, connect to:\n\n"
-                    f"http://{self.config['HOST']}:{self.config['PORT']}/"
-                    f"login?token={self.config['ACCESS_TOKEN']}\n"
+        def _serve(args):
+            for key in ("host", "port", "workers", "threads"):
+                if getattr(args, key) is not None:
+                    self.config[key.upper()] = getattr(args, key)
+            _print_access_url()
+            self.serve()
+
+        def _export(args):
+            export_format = args.format
+            if export_format is None:
+                extension = os.path.splitext(args.output)[1].lstrip(".")
+                export_format = extension if extension in FORMATS else "csv"
+            if args.output == "-":
+                self.export(
+                    sys.stdout.buffer, export_format, args.query, args.document_keys
                 )
-
-            self.run()
+                sys.stdout.flush()
+            else:
+                with open(args.output, "wb") as file:
+                    self.export(file, export_format, args.query, args.document_keys)
 
         parser = argparse.ArgumentParser(
             description="signac-dashboard is a web-based data visualization "
@@ -773,6 +1593,16 @@ class Dashboard:
             action="store_true",
             help="Enable flask performance profiling.",
         )
+        parser_run.add_argument(
+            "--profile-dir",
+            type=str,
+            help="Directory to write profiles to. Default: a temporary directory",
+        )
+        parser_run.add_argument(
+            "--profile-sample-rate",
+            type=float,
+            help="Fraction of requests to profile. Default: 0.1",
+        )
         parser_run.add_argument(
             "-d", "--debug", action="store_true", help="Enable flask debug mode."
         )
@@ -784,6 +1614,61 @@ class Dashboard:
         )
         parser_run.set_defaults(func=_run)
 
+        parser_serve = subparsers.add_parser(
+            "serve", help="Run a production server with multiple processes."
+        )
+        parser_serve.add_argument(
+            "--host", type=str, help="Host (binding address). Default: localhost"
+        )
+        parser_serve.add_argument(
+            "--port", type=int, help="Port to listen on. Default: 8888"
+        )
+        parser_serve.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            help="Number of worker processes. Default: number of CPUs",
+        )
+        parser_serve.add_argument(
+            "-t",
+            "--threads",
+            type=int,
+            help="Number of request threads per worker. Default: 8",
+        )
+        # The server runs its own watcher after forking the workers.
+        parser_serve.set_defaults(func=_serve, watch=False)
+
+        parser_export = subparsers.add_parser(
+            "export", help="Export state points and document values of jobs."
+        )
+        parser_export.add_argument(
+            "-q",
+            "--query",
+            type=str,
+            help="Search query selecting the jobs. Default: all jobs",
+        )
+        parser_export.add_argument(
+            "-k",
+            "--document-keys",
+            nargs="+",
+            default=[],
+            help="Document keys to export, nested keys separated by dots.",
+        )
+        parser_export.add_argument(
+            "-f",
+            "--format",
+            choices=sorted(FORMATS),
+            help="Export format. Default: the extension of the output, or csv",
+        )
+        parser_export.add_argument(
+            "-o",
+            "--output",
+            type=str,
+            default="-",
+            help="Output file. Default: standard output",
+        )
+        parser_export.set_defaults(func=_export, watch=False)
+
         # This is a hack, as argparse itself does not
         # allow to parse only --version without any
         # of the other required arguments.
@@ -800,7 +1685,8 @@ class Dashboard:
             parser.print_usage()
             sys.exit(2)
         try:
-            self.observer.start()
+            if getattr(args, "watch", True):
+                self.observer.start()
             args.func(args)
         except RuntimeWarning as warning:
             logger.warning(f"Warning: {warning}")
@@ -813,5 +1699,6 @@ class Dashboard:
                 raise
             sys.exit(1)
         finally:
-            self.observer.stop()
-            self.observer.join()
+            if self.observer.is_alive():
+                self.observer.stop()
+                self.observer.join()
@@ -0,0 +1,190 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from signac.job import Job
+
+from .util import is_job_id
+
+
+def workspace_events(event, workspace):
+    """Return the dashboard change events of a file system event.
+
+    Directories of jobs that are created, deleted, or moved directly in the
+    workspace produce :code:`'job_added'` and :code:`'job_removed'` events.
+    Changes of the job document produce :code:`'document_changed'` events and
+    changes of other files in a job directory produce :code:`'files_changed'`
+    events, as far as job directories are watched.
+
+    :param event: A :py:mod:`watchdog` event.
+    :type event: :py:class:`watchdog.events.FileSystemEvent`
+    :param workspace: Real path of the workspace directory.
+    :type workspace: str
+    :returns: Dictionaries with the keys :code:`'type'` and :code:`'job'`.
+    :rtype: list
+    """
+    if event.event_type in ("opened", "closed", "closed_no_write"):
+        return []
+    paths = [("src", os.fsdecode(event.src_path))]
+    if event.event_type == "moved":
+        paths.append(("dest", os.fsdecode(event.dest_path)))
+    events = []
+    for kind, path in paths:
+        parent, name = os.path.split(os.path.realpath(path))
+        if parent == workspace:
+            if not event.is_directory or not is_job_id(name):
+                continue
+            if event.event_type == "created" or kind == "dest":
+                events.append({"type": "job_added", "job": name})
+            elif event.event_type == "deleted" or event.event_type == "moved":
+                events.append({"type": "job_removed", "job": name})
+        elif os.path.dirname(parent) == workspace:
+            job_id = os.path.basename(parent)
+            if not is_job_id(job_id):
+                continue
+            if event.is_directory and event.event_type == "modified":
+                continue
+            if name == Job.FN_DOCUMENT:
+                events.append({"type": "document_changed", "job": job_id})
+            elif not name.startswith("."):
+                # Hidden files include temporary files of atomic writes.
+                events.append({"type": "files_changed", "job": job_id})
+    return events
+
+
+def format_event(event):
+    """Format an event as a server-sent event.
+
+    :param event: Dictionary with the key :code:`'type'`.
+    :type event: dict
+    :rtype: str
+    """
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+class Subscription:
+    """Events delivered to one subscriber of an :py:class:`EventBroker`.
+
+    Pending events are coalesced, so that each type of change of a job is
+    delivered at most once per call of :py:meth:`get`. If more than
+    :code:`max_pending` events are pending, they are replaced by a single
+    :code:`'resync'` event.
+
+    :param jobs: Ids of the jobs whose changes are delivered. Jobs being
+        added or removed are always delivered.
+    :type jobs: set
+    :param max_pending: Maximum number of pending events (default: 1000).
+    :type max_pending: int
+    """
+
+    def __init__(self, jobs, max_pending=1000):
+        self.jobs = jobs
+        self.max_pending = max_pending
+        self.closed = False
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+
+    def accepts(self, event):
+        if event["type"] in ("document_changed", "files_changed"):
+            return event.get("job") in self.jobs
+        return True
+
+    def put(self, event):
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self._pending.clear()
+                self._pending["resync"] = {"type": "resync"}
+            else:
+                self._pending[(event["type"], event.get("job"))] = event
+            self._condition.notify_all()
+
+    def close(self):
+        """Wake up waiting calls of :py:meth:`get` and stop waiting."""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+    def get(self, timeout=None):
+        """Wait for events and return all pending events.
+
+        :param timeout: Maximum time to wait in seconds (default:
+            :code:`None`, wait until an event arrives).
+        :type timeout: float
+        :returns: The pending events, empty if the timeout expired or the
+            subscription was closed.
+        :rtype: list of dict
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self.closed, timeout)
+            events = list(self._pending.values())
+            self._pending.clear()
+        return events
+
+
+class EventBroker:
+    """Distribute change events of the project to subscribers.
+
+    :param max_subscriptions: Maximum number of open subscriptions, or
+        :code:`None` for no limit (default: :code:`None`).
+    :type max_subscriptions: int
+    """
+
+    def __init__(self, max_subscriptions=None):
+        self.max_subscriptions = max_subscriptions
+        self._subscriptions = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def subscribe(self, jobs=()):
+        """Subscribe to change events.
+
+        :param jobs: Ids of the jobs whose document and file changes are
+            delivered (default: none).
+        :type jobs: iterable of str
+        :returns: The subscription, or :code:`None` if the maximum number of
+            subscriptions is open or the broker was closed.
+        :rtype: :py:class:`Subscription`
+        """
+        subscription = Subscription(set(jobs))
+        with self._lock:
+            if self._closed or (
+                self.max_subscriptions is not None
+                and len(self._subscriptions) >= self.max_subscriptions
+            ):
+                return None
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop delivering events to a subscription."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def close(self):
+        """Close all subscriptions and reject new ones, e.g. on shutdown."""
+        with self._lock:
+            self._closed = True
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.close()
+
+    def publish(self, event):
+        """Deliver an event to all subscriptions accepting it.
+
+        :param event: Dictionary with the keys :code:`'type'` and
+            :code:`'job'`.
+        :type event: dict
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if subscription.accepts(event):
+                subscription.put(event)
@@ -0,0 +1,307 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Export state points and document values of jobs as tables.
+
+Rows are generated one job at a time and written in batches, so that exports
+of any number of jobs run in constant memory. State points are read from the
+project's state point cache and documents are read directly from the job
+directories, without opening the jobs.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import tempfile
+
+from signac.job import Job
+
+from .index import flatten_statepoint, get_statepoint
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
+logger = logging.getLogger(__name__)
+
+# Media types of the export formats.
+FORMATS = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Number of rows written at once.
+BATCH_SIZE = 1000
+
+
+def _read_document(workspace, job_id):
+    fn_document = os.sep.join((workspace, job_id, Job.FN_DOCUMENT))
+    try:
+        with open(fn_document, "rb") as document_file:
+            return json.loads(document_file.read().decode())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as error:
+        logger.debug(f"Could not read document of job {job_id}: {error}")
+        return {}
+
+
+def _lookup(document, key):
+    """Return the value of a dotted key in a nested document, or None."""
+    if key in document:
+        return document[key]
+    value = document
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def columns(statepoint_keys, document_keys=()):
+    """Return the names of the exported columns.
+
+    :param statepoint_keys: Dotted state point keys.
+    :type statepoint_keys: list of str
+    :param document_keys: Dotted document keys (default: :code:`()`).
+    :type document_keys: list of str
+    :rtype: list of str
+    """
+    return (
+        ["id"]
+        + [f"sp.{key}" for key in statepoint_keys]
+        + [f"doc.{key}" for key in document_keys]
+    )
+
+
+def rows(project, job_ids, statepoint_keys, document_keys=()):
+    """Generate the rows of an export, one job at a time.
+
+    Jobs that were removed are skipped. Missing values are :code:`None`.
+
+    :param project: The project of the jobs.
+    :type project: :py:class:`signac.Project`
+    :param job_ids: Ids of the exported jobs.
+    :type job_ids: iterable of str
+    :param statepoint_keys: Dotted state point keys.
+    :type statepoint_keys: list of str
+    :param document_keys: Dotted document keys (default: :code:`()`).
+    :type document_keys: list of str
+    :returns: Lists of values in the order of :py:func:`columns`.
+    :rtype: iterator of list
+    """
+    for job_id in job_ids:
+        try:
+            statepoint = dict(flatten_statepoint(get_statepoint(project, job_id)))
+        except KeyError:
+            continue
+        row = [job_id] + [statepoint.get(key) for key in statepoint_keys]
+        if document_keys:
+            document = _read_document(project.workspace, job_id)
+            row.extend(_lookup(document, key) for key in document_keys)
+        yield row
+
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _cell(value):
+    """Format a value as a CSV cell, with JSON for lists and mappings."""
+    if value is None:
+        return ""
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(value)
+
+
+def _stream_csv(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for batch in _batches(rows, BATCH_SIZE):
+        writer.writerows([_cell(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _stream_jsonl(header, rows):
+    for batch in _batches(rows, BATCH_SIZE):
+        yield "".join(
+            json.dumps(dict(zip(header, row))) + "\n" for row in batch
+        ).encode()
+
+
+def _kind(types):
+    """Return the kind of a Parquet column of values of the given types."""
+    types = set(types) - {type(None)}
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types and types <= {int, float}:
+        return "float"
+    if types == {str}:
+        return "string"
+    return "json"
+
+
+def _convert(value, kind):
+    """Convert a value to the kind of its column.
+
+    :raises ValueError: If the value does not fit the kind.
+    """
+    if value is None:
+        return None
+    if kind == "json":
+        return value if isinstance(value, str) else json.dumps(value)
+    if isinstance(value, bool):
+        if kind == "bool":
+            return value
+    elif kind == "int" and isinstance(value, int):
+        return value
+    elif kind == "float" and isinstance(value, (int, float)):
+        return float(value)
+    elif kind == "string" and isinstance(value, str):
+        return value
+    raise ValueError(f"The value {value!r} does not fit a column of kind '{kind}'.")
+
+
+_ARROW_TYPES = {
+    "bool": "bool_",
+    "int": "int64",
+    "float": "float64",
+    "string": "string",
+    "json": "string",
+}
+
+
+class _Sink:
+    """Write-only stream collecting the bytes written by a Parquet writer."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _stream_parquet(header, rows, types):
+    # The schema of a Parquet file is fixed before the first batch is
+    # written, so the rows are spooled to a temporary file while the types of
+    # all their values are collected, and the columns are typed by all values.
+    sink = _Sink()
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        types = [set(column) for column in types]
+        for row in rows:
+            for column, value in zip(types, row):
+                column.add(type(value))
+            spool.write(json.dumps(row) + "\n")
+        kinds = [_kind(column) for column in types]
+        schema = pyarrow.schema(
+            [
+                (name, getattr(pyarrow, _ARROW_TYPES[kind])())
+                for name, kind in zip(header, kinds)
+            ]
+        )
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+        spool.seek(0)
+        for batch in _batches(map(json.loads, spool), BATCH_SIZE):
+            arrays = [
+                pyarrow.array(
+                    [_convert(value, kind) for value in column],
+                    type=schema.field(i).type,
+                )
+                for i, (column, kind) in enumerate(zip(zip(*batch), kinds))
+            ]
+            writer.write_batch(pyarrow.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(
+    project, job_ids, statepoint_types, document_keys=(), export_format="csv"
+):
+    """Generate an export of state points and document values.
+
+    Each job is a row, with the job id in the column :code:`id`, flattened
+    state point keys in columns prefixed by :code:`sp.`, and document keys in
+    columns prefixed by :code:`doc.`. Lists and mappings are written as JSON
+    in CSV files and Parquet columns of mixed types. Parquet columns are
+    typed by all their values, integers and floats as floats, so the rows of
+    Parquet files are spooled to a temporary file before they are written.
+    Parquet files require the :code:`pyarrow` library.
+
+    :param project: The project of the jobs.
+    :type project: :py:class:`signac.Project`
+    :param job_ids: Ids of the exported jobs.
+    :type job_ids: iterable of str
+    :param statepoint_types: Mapping of dotted state point keys to the types
+        of their values, as in :py:class:`signac.schema.ProjectSchema`.
+    :type statepoint_types: dict
+    :param document_keys: Dotted document keys (default: :code:`()`).
+    :type document_keys: list of str
+    :param export_format: One of :code:`'csv'`, :code:`'jsonl'` and
+        :code:`'parquet'` (default: :code:`'csv'`).
+    :type export_format: str
+    :returns: The chunks of the exported file.
+    :rtype: iterator of bytes
+    :raises ValueError: If the format is unknown.
+    :raises RuntimeError: If Parquet is requested without :code:`pyarrow`.
+    """
+    if export_format not in FORMATS:
+        raise ValueError(
+            f"Unknown export format '{export_format}', "
+            f"expected one of {sorted(FORMATS)}."
+        )
+    if export_format == "parquet" and not PYARROW:
+        raise RuntimeError("Install the 'pyarrow' library to export Parquet files.")
+    statepoint_keys = list(statepoint_types)
+    document_keys = list(document_keys)
+    header = columns(statepoint_keys, document_keys)
+    generated = rows(project, job_ids, statepoint_keys, document_keys)
+    if export_format == "csv":
+        return _stream_csv(header, generated)
+    if export_format == "jsonl":
+        return _stream_jsonl(header, generated)
+    types = (
+        [{str}]
+        + [statepoint_types[key] for key in statepoint_keys]
+        + [()] * len(document_keys)
+    )
+    return _stream_parquet(header, generated, types)
@@ -0,0 +1,314 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Read state points and detect the schema of large projects.
+
+The state point cache of :py:class:`signac.Project` has no public interface
+to fill it concurrently. Where this version of signac provides the private
+methods used for that, state points are read concurrently and registered
+with them, otherwise the functions here fall back to the public API. The
+supported versions of signac are pinned accordingly.
+"""
+
+import json
+import logging
+import os
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from signac.schema import ProjectSchema
+
+from .util import is_job_id
+
+logger = logging.getLogger(__name__)
+
+_EXECUTORS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+# Private members of signac.Project used to fill its state point cache.
+_CACHE_MEMBERS = ("_sp_cache", "_sp_cache_read", "_read_cache", "_register")
+
+
+def _chunks(items, chunksize):
+    for i in range(0, len(items), chunksize):
+        yield items[i : i + chunksize]
+
+
+def _make_executor(executor, workers):
+    try:
+        return _EXECUTORS[executor](max_workers=workers)
+    except KeyError:
+        raise ValueError(
+            f"Unknown executor '{executor}', expected one of {sorted(_EXECUTORS)}."
+        )
+
+
+def _log_progress(desc):
+    """Return a progress callback that logs at every 10% of completion."""
+    last = [-1]
+
+    def progress(done, total):
+        percent = 100 * done // max(total, 1)
+        if percent // 10 > last[0]:
+            last[0] = percent // 10
+            logger.info(f"{desc}{percent:3d}% ({done}/{total})")
+
+    return progress
+
+
+def _to_hashable(value):
+    if type(value) is list:
+        return tuple(_to_hashable(item) for item in value)
+    return value
+
+
+def flatten_statepoint(statepoint, prefix=None):
+    """Generate the dotted keys and values of a nested state point.
+
+    Lists are converted to tuples, so that they are hashable. Empty mappings
+    are values of their key.
+
+    :param statepoint: The state point.
+    :type statepoint: dict
+    :param prefix: Dotted key of the state point (default: :code:`None`).
+    :type prefix: str
+    :returns: Pairs of dotted key and value.
+    :rtype: iterator of tuple
+    """
+    for key, value in statepoint.items():
+        dotted_key = key if prefix is None else f"{prefix}.{key}"
+        if isinstance(value, Mapping) and value:
+            yield from flatten_statepoint(value, dotted_key)
+        else:
+            yield dotted_key, _to_hashable(value)
+
+
+def job_ids(project):
+    """Generate the ids of the jobs in the workspace of a project.
+
+    The workspace is scanned while the ids are consumed, so that they are
+    never all held in memory.
+
+    :param project: The project.
+    :type project: :py:class:`signac.Project`
+    :rtype: iterator of str
+    """
+    try:
+        with os.scandir(project.workspace) as entries:
+            for entry in entries:
+                if is_job_id(entry.name) and entry.is_dir():
+                    yield entry.name
+    except FileNotFoundError:
+        return
+
+
+def get_statepoint(project, job_id):
+    """Return the state point of a job, from the project's cache if possible.
+
+    :param project: The project of the job.
+    :type project: :py:class:`signac.Project`
+    :param job_id: The id of the job.
+    :type job_id: str
+    :rtype: dict
+    :raises KeyError: If the job does not exist.
+    """
+    cached = getattr(project, "_get_statepoint", None)
+    if cached is not None:
+        return cached(job_id)
+    try:
+        return project.open_job(id=job_id).statepoint()
+    except (LookupError, OSError, ValueError):
+        raise KeyError(job_id)
+
+
+class _EmptyMapping:
+    """Value of keys whose value is an empty mapping in a partial schema.
+
+    Like signac, the schema lists these keys without values.
+    """
+
+    def __eq__(self, other):
+        return isinstance(other, _EmptyMapping)
+
+    def __hash__(self):
+        return hash(_EmptyMapping)
+
+
+def _read_statepoints(workspace, job_ids):
+    """Read the state point files of a chunk of jobs.
+
+    This is a module-level function so that it can be sent to worker processes.
+    """
+    statepoints = {}
+    for job_id in job_ids:
+        fn_statepoint = os.sep.join((workspace, job_id, "signac_statepoint.json"))
+        try:
+            with open(fn_statepoint, "rb") as statepoint_file:
+                statepoints[job_id] = json.loads(statepoint_file.read().decode())
+        except (OSError, ValueError) as error:
+            # The job may have been removed since the workspace was listed.
+            logger.debug(f"Could not read state point of job {job_id}: {error}")
+    return statepoints
+
+
+def _partial_schema(statepoints):
+    """Collect state point values by key and type for a chunk of state points.
+
+    :returns: Tuple of a dict mapping dotted keys to dicts of types and sets of
+        values, and a dict mapping dotted keys to the number of state points
+        containing that key.
+    """
+    schema = defaultdict(lambda: defaultdict(set))
+    counts = defaultdict(int)
+    for statepoint in statepoints:
+        for key, value in flatten_statepoint(statepoint):
+            if isinstance(value, Mapping):
+                value = _EmptyMapping()
+            schema[key][type(value)].add(value)
+            counts[key] += 1
+    return (
+        {key: dict(values_by_type) for key, values_by_type in schema.items()},
+        dict(counts),
+    )
+
+
+def _merge_partial_schemas(partials):
+    schema = defaultdict(lambda: defaultdict(set))
+    counts = defaultdict(int)
+    for partial_schema, partial_counts in partials:
+        for key, values_by_type in partial_schema.items():
+            for value_type, values in values_by_type.items():
+                schema[key][value_type].update(values)
+        for key, count in partial_counts.items():
+            counts[key] += count
+    return schema, counts
+
+
+def load_statepoints(
+    project, workers=None, executor="thread", chunksize=1000, progress=None
+):
+    """Load all state points of a project into its in-memory cache.
+
+    State point files not already present in the project's state point cache
+    are read concurrently. On parallel file systems, reading many small files
+    is limited by latency rather than bandwidth, so the load time scales with
+    the number of workers. If this version of signac lacks the private
+    members used to fill the cache, the cache is filled with
+    :py:meth:`signac.Project.update_cache` instead, which reads the state
+    points serially.
+
+    :param project: The project whose state points are loaded.
+    :type project: :py:class:`signac.Project`
+    :param workers: Number of workers (default: :code:`None`, chosen by
+        :py:mod:`concurrent.futures`).
+    :type workers: int
+    :param executor: Either :code:`'thread'` or :code:`'process'`
+        (default: :code:`'thread'`).
+    :type executor: str
+    :param chunksize: Number of state points read per task (default: 1000).
+    :type chunksize: int
+    :param progress: Callable accepting the number of completed and total
+        jobs (default: :code:`None`, progress is logged).
+    :type progress: callable
+    :returns: Number of state points read from the workspace.
+    :rtype: int
+    """
+    if progress is None:
+        progress = _log_progress("Loading state points: ")
+    if not all(hasattr(project, member) for member in _CACHE_MEMBERS):
+        total = sum(1 for _ in job_ids(project))
+        project.update_cache()
+        progress(total, total)
+        return total
+    if not project._sp_cache_read:
+        project._sp_cache.update(project._read_cache())
+        project._sp_cache_read = True
+    missing = [job_id for job_id in job_ids(project) if job_id not in project._sp_cache]
+    if not missing:
+        return 0
+
+    done = 0
+    with _make_executor(executor, workers) as pool:
+        futures = [
+            pool.submit(_read_statepoints, project.workspace, chunk)
+            for chunk in _chunks(missing, chunksize)
+        ]
+        for future in as_completed(futures):
+            statepoints = future.result()
+            for job_id, statepoint in statepoints.items():
+                project._register(job_id, statepoint)
+            done += len(statepoints)
+            progress(done, len(missing))
+    return done
+
+
+def detect_schema(
+    project,
+    exclude_const=False,
+    subset=None,
+    workers=None,
+    executor="thread",
+    chunksize=1000,
+):
+    """Detect the project's state point schema from partial schemas.
+
+    The keys and their order are the same as in the result of
+    :py:meth:`signac.Project.detect_schema`. Values are grouped by their
+    type, so that values which compare equal but differ in type, such as
+    :code:`True` and :code:`1` or :code:`1` and :code:`1.0`, are kept in
+    separate groups, whereas signac keeps only the first of them.
+
+    Computing the schema is bound by the CPU, so with the :code:`'process'`
+    executor the state points are split into chunks whose partial schemas
+    are computed in worker processes and then merged. With the
+    :code:`'thread'` executor, which would not run in parallel, the schema
+    is computed in the calling thread.
+
+    :param project: The project whose schema is detected.
+    :type project: :py:class:`signac.Project`
+    :param exclude_const: Exclude state point keys that are shared by all
+        jobs (default: :code:`False`).
+    :type exclude_const: bool
+    :param subset: A sequence of jobs or job ids over which the schema is
+        detected (default: :code:`None`, all jobs).
+    :param workers: Number of workers (default: :code:`None`).
+    :type workers: int
+    :param executor: Either :code:`'thread'` or :code:`'process'`
+        (default: :code:`'thread'`).
+    :type executor: str
+    :param chunksize: Number of state points per task (default: 1000).
+    :type chunksize: int
+    :rtype: :py:class:`signac.schema.ProjectSchema`
+    """
+    if executor not in _EXECUTORS:
+        raise ValueError(
+            f"Unknown executor '{executor}', expected one of {sorted(_EXECUTORS)}."
+        )
+    if subset is None:
+        ids = job_ids(project)
+    else:
+        ids = list({str(job) for job in subset})
+    statepoints = []
+    for job_id in ids:
+        try:
+            statepoints.append(get_statepoint(project, job_id))
+        except KeyError:
+            continue
+
+    if executor == "thread" or len(statepoints) <= chunksize:
+        partials = [_partial_schema(statepoints)]
+    else:
+        with _make_executor(executor, workers) as pool:
+            partials = list(pool.map(_partial_schema, _chunks(statepoints, chunksize)))
+    schema, counts = _merge_partial_schemas(partials)
+
+    def num_values(key):
+        return len(set().union(*schema[key].values()))
+
+    result = {}
+    for key in sorted(schema, key=lambda key: (num_values(key), key)):
+        if exclude_const and num_values(key) == 1 and counts[key] == len(statepoints):
+            continue
+        schema[key].pop(_EmptyMapping, None)
+        result[key] = schema[key]
+    return ProjectSchema(result)
@@ -0,0 +1,234 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import fnmatch
+import glob
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+# Maximum number of directory listings held in memory.
+MAX_CACHED_DIRECTORIES = 4096
+
+# Maximum number of resolved glob pattern sets held in memory.
+MAX_CACHED_GLOBS = 4096
+
+# Maximum depth of directories below the root visited by glob patterns.
+MAX_GLOB_DEPTH = 32
+
+# Directories modified more recently than this many seconds are not cached,
+# because a coarse mtime resolution could hide a later change within the
+# same tick.
+_RACY_SECONDS = 2.0
+
+_directory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_glob_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_lock = threading.Lock()
+
+
+class DirEntry(NamedTuple):
+    """A file or directory in a directory listing."""
+
+    name: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+def _directory_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_racy(mtime):
+    return time.time() - mtime / 1e9 < _RACY_SECONDS
+
+
+def _get_cached(cache, key):
+    with _lock:
+        cached = cache.get(key)
+        if cached is not None:
+            cache.move_to_end(key)
+        return cached
+
+
+def _set_cached(cache, key, value, maxsize):
+    with _lock:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+
+
+def _scan(path):
+    """Return the directory mtime and its entries, or (None, ())."""
+    mtime = _directory_mtime(path)
+    if mtime is None:
+        return None, ()
+    cached = _get_cached(_directory_cache, path)
+    if cached is not None and cached[0] == mtime:
+        return mtime, cached[1]
+
+    entries = []
+    with os.scandir(path) as iterator:
+        for entry in iterator:
+            try:
+                is_dir = entry.is_dir()
+                stat = entry.stat()
+            except OSError:
+                # The entry was removed or is a broken link.
+                continue
+            entries.append(
+                DirEntry(
+                    entry.name, is_dir, 0 if is_dir else stat.st_size, stat.st_mtime
+                )
+            )
+    entries = tuple(sorted(entries, key=lambda entry: entry.name))
+    if not _is_racy(mtime):
+        _set_cached(_directory_cache, path, (mtime, entries), MAX_CACHED_DIRECTORIES)
+    return mtime, entries
+
+
+def scan_directory(path):
+    """List a directory with file sizes and modification times.
+
+    The entries are collected with a single :py:func:`os.scandir` pass and
+    cached until the modification time of the directory changes, i.e. until
+    entries are added, removed, or renamed. Sizes and modification times of
+    files whose contents change in place are refreshed on the next change of
+    the directory itself.
+
+    :param path: Directory to list.
+    :type path: str
+    :returns: Entries sorted by name, or an empty tuple if the directory does
+        not exist.
+    :rtype: tuple of :py:class:`DirEntry`
+    """
+    return _scan(path)[1]
+
+
+def _match_name(name, pattern):
+    # Like glob, wildcards do not match names starting with a dot.
+    if name.startswith(".") and not pattern.startswith("."):
+        return False
+    return fnmatch.fnmatchcase(name, pattern)
+
+
+def _directory_id(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _resolve(root, rel_dir, parts, scanned, visited, depth=0):
+    """Yield paths of files relative to root matching the pattern parts.
+
+    Directories expanded by :code:`**` are identified by their device and
+    inode, together with the remaining parts of the pattern, in
+    :code:`visited`, so that symbolic links to parent directories are not
+    followed in cycles.
+    """
+    if depth > MAX_GLOB_DEPTH:
+        return
+    path = os.path.join(root, rel_dir)
+    part, rest = parts[0], parts[1:]
+    if part == "**":
+        directory_id = _directory_id(path)
+        if directory_id is None or (directory_id, len(parts)) in visited:
+            return
+        visited.add((directory_id, len(parts)))
+    mtime, entries = _scan(path)
+    scanned[path] = mtime
+
+    if part == "**":
+        if rest:
+            yield from _resolve(root, rel_dir, rest, scanned, visited, depth)
+        for entry in entries:
+            if entry.name.startswith("."):
+                continue
+            rel_path = os.path.join(rel_dir, entry.name)
+            if entry.is_dir:
+                yield from _resolve(root, rel_path, parts, scanned, visited, depth + 1)
+            elif not rest:
+                yield rel_path
+        return
+
+    if glob.has_magic(part):
+        matches = [entry for entry in entries if _match_name(entry.name, part)]
+    else:
+        matches = [entry for entry in entries if entry.name == part]
+    for entry in matches:
+        rel_path = os.path.join(rel_dir, entry.name)
+        if rest:
+            if entry.is_dir:
+                yield from _resolve(root, rel_path, rest, scanned, visited, depth + 1)
+        elif not entry.is_dir:
+            yield rel_path
+
+
+def glob_files(root, patterns, sort_key=None, max_files=None):
+    """Resolve glob patterns to the files they match in a directory.
+
+    All patterns are resolved against one snapshot of cached directory
+    listings (see :py:func:`scan_directory`), and recursive :code:`**`
+    patterns are supported. Symbolic links to directories are followed, but
+    each directory is expanded at most once per :code:`**`, and directories
+    deeper than :py:data:`MAX_GLOB_DEPTH` below the root are not visited. The
+    sorted result is cached until the modification time of any directory
+    visited while resolving the patterns changes.
+
+    :param root: Directory the patterns are relative to.
+    :type root: str
+    :param patterns: Glob expressions or exact filenames relative to root.
+    :type patterns: sequence of str
+    :param sort_key: Key to sort the matched files, called with the full path
+        of each file (default: :code:`None`, sorted by path).
+    :type sort_key: callable
+    :param max_files: Maximum number of matched files, for example for
+        patterns given by users, after which resolving the patterns stops
+        (default: :code:`None`, no limit).
+    :type max_files: int
+    :returns: Paths of matching files relative to root, without duplicates.
+    :rtype: tuple of str
+    """
+    key = (root, tuple(patterns), sort_key, max_files)
+    cached = _get_cached(_glob_cache, key)
+    if cached is not None:
+        scanned, files = cached
+        if all(_directory_mtime(path) == mtime for path, mtime in scanned):
+            return files
+
+    scanned = {}
+    files = {}
+    for pattern in patterns:
+        parts = [part for part in pattern.split("/") if part]
+        if not parts:
+            continue
+        for filename in _resolve(root, "", parts, scanned, set()):
+            files[filename] = None
+            if max_files is not None and len(files) >= max_files:
+                break
+        if max_files is not None and len(files) >= max_files:
+            break
+    if sort_key is None:
+        files = tuple(sorted(files))
+    else:
+        files = tuple(
+            sorted(files, key=lambda filename: sort_key(os.path.join(root, filename)))
+        )
+    if all(mtime is not None and not _is_racy(mtime) for mtime in scanned.values()):
+        _set_cached(_glob_cache, key, (tuple(scanned.items()), files), MAX_CACHED_GLOBS)
+    return files
+
+
+def clear_cache():
+    """Clear all cached directory listings and resolved globs."""
+    with _lock:
+        _directory_cache.clear()
+        _glob_cache.clear()
@@ -0,0 +1,506 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Drive a dashboard with many concurrent simulated users.
+
+The load test sends a mix of job list, search, job, and file requests
+directly to the dashboard's WSGI application and reports throughput and
+latency percentiles per kind of request. Optionally, jobs are created and job
+documents are modified during the run while a file system watcher
+invalidates the caches, as it does in a running dashboard. Example:
+
+.. code-block:: bash
+
+    python -m signac_dashboard.loadtest /path/to/project --users 50 --duration 30
+"""
+
+import argparse
+import functools
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import quote
+
+import signac
+from watchdog.observers import Observer
+from werkzeug.test import Client
+from werkzeug.utils import import_string
+
+from .dashboard import Dashboard
+from .index import flatten_statepoint
+
+logger = logging.getLogger(__name__)
+
+# Relative weights of the kinds of requests sent by each user.
+DEFAULT_MIX = {"list": 4, "search": 2, "job": 3, "file": 1}
+
+
+def build_requests(project, mix=None, count=1000, seed=0):
+    """Sample a realistic list of requests for a project.
+
+    :param project: The project served by the dashboard.
+    :type project: :py:class:`signac.Project`
+    :param mix: Relative weights of the kinds of requests :code:`'list'`
+        (pages of the job list), :code:`'search'` (searches for state point
+        values of random jobs), :code:`'job'` (single job pages), and
+        :code:`'file'` (files in random jobs) (default: :py:data:`DEFAULT_MIX`).
+    :type mix: dict
+    :param count: Number of requests to sample (default: 1000).
+    :type count: int
+    :param seed: Seed of the random number generator (default: 0).
+    :type seed: int
+    :returns: Pairs of the kind of request and the URL.
+    :rtype: list of tuple
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    rng = random.Random(seed)
+    jobs = list(project)
+    if not jobs:
+        raise ValueError("The project has no jobs.")
+    files = []
+    for job in rng.sample(jobs, min(len(jobs), 100)):
+        files.extend(
+            (job.id, name)
+            for name in os.listdir(job.path)
+            if os.path.isfile(job.fn(name))
+        )
+    pages = max(1, math.ceil(len(jobs) / 24))
+
+    def make_url(kind):
+        if kind == "list":
+            return f"/jobs/?page={rng.randint(1, pages)}"
+        if kind == "search":
+            key, value = rng.choice(
+                list(flatten_statepoint(rng.choice(jobs).statepoint()))
+            )
+            return f"/search?q={quote(json.dumps({key: value}))}"
+        if kind == "job":
+            return f"/jobs/{rng.choice(jobs).id}"
+        if kind == "file":
+            job_id, name = rng.choice(files)
+            return f"/jobs/{job_id}/file/{quote(name)}"
+        raise ValueError(f"Unknown kind of request '{kind}'.")
+
+    kinds = [kind for kind in mix if mix[kind] > 0 and (kind != "file" or files)]
+    weights = [mix[kind] for kind in kinds]
+    return [(kind, make_url(kind)) for kind in rng.choices(kinds, weights, k=count)]
+
+
+def _percentile(sorted_values, percent):
+    """Return a percentile of sorted values with the nearest-rank method."""
+    if not sorted_values:
+        return float("nan")
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+
+class LoadTestResult:
+    """Latencies and errors of a load test.
+
+    Requests rejected by admission control (status 503) are counted
+    separately and are not part of the latencies.
+
+    :param latencies: Lists of latencies in seconds by kind of request.
+    :type latencies: dict
+    :param errors: Number of failed requests by kind of request.
+    :type errors: dict
+    :param duration: Duration of the load test in seconds.
+    :type duration: float
+    :param changes: Number of workspace changes injected during the run.
+    :type changes: int
+    :param rejected: Number of rejected requests by kind of request
+        (default: :code:`None`, no rejected requests).
+    :type rejected: dict
+    """
+
+    def __init__(self, latencies, errors, duration, changes=0, rejected=None):
+        self.latencies = latencies
+        self.errors = errors
+        self.duration = duration
+        self.changes = changes
+        self.rejected = {} if rejected is None else rejected
+
+    def summary(self):
+        """Return throughput and latency percentiles by kind of request.
+
+        :returns: Dictionary mapping each kind of request and :code:`'total'`
+            to the number of completed requests, errors, and rejected
+            requests, the throughput in completed requests per second, and
+            the p50, p95, and p99 latencies in milliseconds.
+        :rtype: dict
+        """
+        groups = dict(self.latencies)
+        groups.update((kind, []) for kind in self.rejected if kind not in groups)
+        groups["total"] = [
+            latency for latencies in self.latencies.values() for latency in latencies
+        ]
+        summary = {}
+        for kind, latencies in groups.items():
+            latencies = sorted(latencies)
+            if kind == "total":
+                errors = sum(self.errors.values())
+                rejected = sum(self.rejected.values())
+            else:
+                errors = self.errors.get(kind, 0)
+                rejected = self.rejected.get(kind, 0)
+            summary[kind] = {
+                "requests": len(latencies),
+                "errors": errors,
+                "rejected": rejected,
+                "throughput": len(latencies) / self.duration if self.duration else 0,
+                **{
+                    f"p{percent}": 1000 * _percentile(latencies, percent)
+                    for percent in (50, 95, 99)
+                },
+            }
+        return summary
+
+    def format(self):
+        """Return the summary as a table.
+
+        :rtype: str
+        """
+        lines = [
+            f"{'kind':<8} {'requests':>9} {'errors':>7} {'rejected':>9} "
+            f"{'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+        ]
+        for kind, row in self.summary().items():
+            lines.append(
+                f"{kind:<8} {row['requests']:>9} {row['errors']:>7} "
+                f"{row['rejected']:>9} {row['throughput']:>9.1f} "
+                f"{row['p50']:>9.1f} {row['p95']:>9.1f} {row['p99']:>9.1f}"
+            )
+        lines.append(
+            f"Duration: {self.duration:.1f} s, workspace changes: {self.changes}"
+        )
+        return "\n".join(lines)
+
+
+def _run_user(dashboard, requests, deadline, seed, results, lock):
+    rng = random.Random(seed)
+    client = Client(dashboard)
+    token = dashboard.config.get("ACCESS_TOKEN")
+    if token is not None:
+        client.get(f"/login?token={token}")
+    user_results = _Results()
+    while time.monotonic() < deadline:
+        kind, url = rng.choice(requests)
+        start = time.perf_counter()
+        try:
+            response = client.get(url)
+            response.get_data()
+            response.close()
+            status = response.status_code
+        except Exception as error:
+            logger.warning(f"Request to {url} failed: {error}")
+            status = None
+        if status == 503:
+            user_results.rejected[kind] += 1
+            continue
+        user_results.latencies[kind].append(time.perf_counter() - start)
+        if status is None or status >= 400:
+            user_results.errors[kind] += 1
+    with lock:
+        results.add(user_results)
+
+
+class _Results:
+    """Latencies, errors, and rejected requests collected by users."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.rejected = defaultdict(int)
+
+    def add(self, other):
+        for kind, values in other.latencies.items():
+            self.latencies[kind].extend(values)
+        for kind, count in other.errors.items():
+            self.errors[kind] += count
+        for kind, count in other.rejected.items():
+            self.rejected[kind] += count
+
+
+def _watch(dashboard):
+    observer = Observer()
+    observer.schedule(dashboard.event_handler, dashboard.project.workspace)
+    observer.start()
+    return observer
+
+
+def _run_users(dashboard, requests, users, duration, seed, watch):
+    """Run simulated users on threads until the duration has passed."""
+    results = _Results()
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    observer = _watch(dashboard) if watch else None
+    try:
+        threads = [
+            threading.Thread(
+                target=_run_user,
+                args=(dashboard, requests, deadline, seed + i, results, lock),
+                name=f"loadtest-user-{i}",
+            )
+            for i in range(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+    return results
+
+
+def _run_process(factory, requests, users, duration, seed, watch):
+    """Create a dashboard in a worker process and run simulated users."""
+    return _run_users(factory(), requests, users, duration, seed, watch)
+
+
+def _inject_changes(project, interval, stop):
+    """Create scratch jobs and modify their documents until stopped.
+
+    Jobs of the project are never modified. The scratch jobs have a state
+    point unique to this run and are removed before returning.
+
+    :returns: The number of changes.
+    """
+    rng = random.Random()
+    run = uuid.uuid4().hex
+    created = []
+    changes = 0
+    try:
+        while not stop.wait(interval):
+            job = project.open_job({"loadtest": changes, "loadtest_run": run})
+            if job not in project:
+                job.init()
+                created.append(job)
+            if created:
+                rng.choice(created).document["loadtest"] = changes
+            changes += 1
+    finally:
+        for job in created:
+            job.remove()
+    return changes
+
+
+def _create_dashboard(root, users=50, concurrency_limit=None):
+    """Create a dashboard of a project with all built-in modules.
+
+    By default, admission control is disabled, so that the dashboard serves
+    all users instead of rejecting their requests.
+    """
+    from .synthetic import builtin_modules
+
+    limits = {}
+    if concurrency_limit is not None:
+        limits = {"/jobs/": concurrency_limit, "/search": concurrency_limit}
+    return Dashboard(
+        config={
+            "ACCESS_TOKEN": None,
+            "SERVER_TIMING": False,
+            "THREADS": users,
+            "CONCURRENCY_LIMITS": limits,
+        },
+        project=signac.get_project(root),
+        modules=builtin_modules(),
+    )
+
+
+def run_load_test(
+    dashboard,
+    requests=None,
+    users=50,
+    duration=10,
+    processes=None,
+    change_interval=None,
+    seed=0,
+):
+    """Run a load test against a dashboard.
+
+    Each simulated user repeatedly sends a random request from
+    :code:`requests` through its own client with its own session and records
+    the latency of the complete response.
+
+    If :code:`change_interval` is given, a scratch job is created and the
+    document of a random scratch job is modified every
+    :code:`change_interval` seconds. A file system watcher invalidates the
+    dashboard caches in response, as in a running dashboard, so that
+    invalidations race with requests in flight. The jobs of the project are
+    not modified, and the scratch jobs are removed after the run.
+
+    :param dashboard: A dashboard to test on threads of this process, or a
+        picklable callable returning a dashboard, which is required if
+        :code:`processes` is given.
+    :type dashboard: :py:class:`~.Dashboard` or callable
+    :param requests: Pairs of the kind of request and the URL, as returned by
+        :py:func:`build_requests` (default: :code:`None`, sampled from the
+        dashboard's project).
+    :type requests: list
+    :param users: Number of concurrent users in each process (default: 50).
+    :type users: int
+    :param duration: Duration of the test in seconds (default: 10).
+    :type duration: float
+    :param processes: Number of worker processes, each serving its own
+        dashboard (default: :code:`None`, all users run on threads of this
+        process).
+    :type processes: int
+    :param change_interval: Seconds between injected workspace changes
+        (default: :code:`None`, no changes).
+    :type change_interval: float
+    :param seed: Seed of the random number generators (default: 0).
+    :type seed: int
+    :rtype: :py:class:`LoadTestResult`
+    """
+    if isinstance(dashboard, Dashboard):
+        if processes is not None:
+            raise ValueError(
+                "Pass a callable returning a dashboard to run in processes."
+            )
+        factory = None
+    else:
+        factory, dashboard = dashboard, None
+        if processes is None:
+            dashboard = factory()
+    watch = change_interval is not None
+    if requests is None or watch:
+        project = (factory() if dashboard is None else dashboard).project
+    if requests is None:
+        requests = build_requests(project, seed=seed)
+
+    stop = threading.Event()
+    injected = [0]
+    injector = None
+    if watch:
+
+        def inject():
+            injected[0] = _inject_changes(project, change_interval, stop)
+
+        injector = threading.Thread(target=inject, name="loadtest-changes")
+        injector.start()
+
+    start = time.monotonic()
+    try:
+        if processes is None:
+            results = _run_users(dashboard, requests, users, duration, seed, watch)
+        else:
+            results = _Results()
+            run = functools.partial(
+                _run_process, factory, requests, users, duration, watch=watch
+            )
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                seeds = [seed + i * users for i in range(processes)]
+                for process_results in pool.map(run, seeds):
+                    results.add(process_results)
+    finally:
+        elapsed = time.monotonic() - start
+        if injector is not None:
+            stop.set()
+            injector.join()
+    return LoadTestResult(
+        dict(results.latencies),
+        dict(results.errors),
+        elapsed,
+        injected[0],
+        dict(results.rejected),
+    )
+
+
+def _parse_mix(text):
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        mix[kind.strip()] = float(weight)
+    return mix
+
+
+def main(command_args=None):
+    parser = argparse.ArgumentParser(
+        description="Run a load test against a signac-dashboard."
+    )
+    parser.add_argument(
+        "project",
+        nargs="?",
+        default=".",
+        help="Project directory, served with all built-in modules. Default: .",
+    )
+    parser.add_argument(
+        "--dashboard",
+        help="Import path of a callable returning a dashboard to test instead, "
+        "e.g. 'my_dashboard:create_dashboard'.",
+    )
+    parser.add_argument(
+        "-u", "--users", type=int, default=50, help="Concurrent users. Default: 50"
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=10,
+        help="Duration in seconds. Default: 10",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        help="Number of worker processes, each running all users.",
+    )
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Weights of request kinds. Default: list=4,search=2,job=3,file=1",
+    )
+    parser.add_argument(
+        "--change-interval",
+        type=float,
+        help="Seconds between injected workspace changes.",
+    )
+    parser.add_argument(
+        "--concurrency-limit",
+        type=int,
+        help="Concurrency limit of the job list and search routes of the "
+        "project's dashboard. Default: no admission control",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--json", action="store_true", help="Print JSON.")
+    args = parser.parse_args(command_args)
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.dashboard is not None:
+        factory = import_string(args.dashboard)
+    else:
+        factory = functools.partial(
+            _create_dashboard,
+            os.path.abspath(args.project),
+            users=args.users,
+            concurrency_limit=args.concurrency_limit,
+        )
+    dashboard = factory()
+    requests = build_requests(dashboard.project, mix=args.mix, seed=args.seed)
+    result = run_load_test(
+        factory if args.processes else dashboard,
+        requests=requests,
+        users=args.users,
+        duration=args.duration,
+        processes=args.processes,
+        change_interval=args.change_interval,
+        seed=args.seed,
+    )
+    if args.json:
+        print(json.dumps(result.summary(), indent=2))
+    else:
+        print(result.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import bisect
+import threading
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, labels):
+        return tuple((name, labels[name]) for name in self.labelnames)
+
+    def _header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per set of labels."""
+
+    type = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        key = self._labels(labels)
+        with self._lock:
+            self._values[key] += amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._labels(labels), 0)
+
+    def expose(self):
+        lines = self._header()
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return lines
+
+
+class Histogram(_Metric):
+    """Counts of observed values in cumulative buckets per set of labels."""
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = self._labels(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def expose(self):
+        lines = self._header()
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bucket, count in zip(self.buckets, counts):
+                    cumulative += count
+                    bucket_labels = _format_labels(
+                        labels, [("le", _format_value(bucket))]
+                    )
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {total!r}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Values computed when the metrics are exposed.
+
+    :param collect: Callable returning an iterable of pairs of a label
+        dictionary and a value.
+    :type collect: callable
+    :param type: Metric type reported to Prometheus, e.g. :code:`'counter'`
+        for totals maintained elsewhere (default: :code:`'gauge'`).
+    :type type: str
+    """
+
+    type = "gauge"
+
+    def __init__(self, name, documentation, labelnames, collect, type=None):
+        super().__init__(name, documentation, labelnames)
+        self._collect = collect
+        if type is not None:
+            self.type = type
+
+    def expose(self):
+        lines = self._header()
+        for labels, value in self._collect():
+            lines.append(
+                f"{self.name}{_format_labels(self._labels(labels))} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Metrics:
+    """A registry of metrics exposed in the Prometheus text format.
+
+    Metrics are looked up by their name without the namespace prefix, e.g.
+    :code:`metrics["requests_total"].inc(...)`.
+
+    :param namespace: Prefix of all metric names (default:
+        :code:`'signac_dashboard'`).
+    :type namespace: str
+    """
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, namespace="signac_dashboard"):
+        self.namespace = namespace
+        self._metrics = {}
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def _register(self, cls, name, *args, **kwargs):
+        if name in self._metrics:
+            raise ValueError(f"A metric named '{name}' is already registered.")
+        full_name = f"{self.namespace}_{name}" if self.namespace else name
+        metric = self._metrics[name] = cls(full_name, *args, **kwargs)
+        return metric
+
+    def counter(self, name, *args, **kwargs):
+        return self._register(Counter, name, *args, **kwargs)
+
+    def histogram(self, name, *args, **kwargs):
+        return self._register(Histogram, name, *args, **kwargs)
+
+    def gauge(self, name, *args, **kwargs):
+        return self._register(Gauge, name, *args, **kwargs)
+
+    def expose(self):
+        """Return all metrics in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,317 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Measure the cost of :py:meth:`Module.get_cards` for built-in and user modules.
+
+Each module is registered with its own dashboard and :code:`get_cards` is
+called for a sample of jobs (or the project, for modules in the
+:code:`'ProjectContext'`) inside a request context. Example:
+
+.. code-block:: bash
+
+    python -m signac_dashboard.module_benchmark signac_dashboard.modules.DocumentList \\
+        --project /path/to/project --max-median-ms 20
+
+Without a project, a synthetic project is generated in a temporary directory.
+The command exits with status 1 if a module exceeds one of the given limits,
+so that it can be used in continuous integration.
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import signac
+from werkzeug.utils import import_string
+
+from .dashboard import Dashboard
+from .synthetic import builtin_modules, generate_project
+
+logger = logging.getLogger(__name__)
+
+
+class ModuleBenchmarkResult:
+    """Measurements of calls to a module's :code:`get_cards`.
+
+    :param module: The benchmarked module.
+    :type module: :py:class:`~.Module`
+    :param latencies: Latencies of all calls in seconds.
+    :type latencies: list
+    :param cards: Number of cards returned by each measured call.
+    :type cards: list
+    :param html_sizes: Total characters of rendered card content of each
+        measured call.
+    :type html_sizes: list
+    :param allocations: Number of memory blocks allocated by each call and
+        still alive after it returned, from :py:mod:`tracemalloc`.
+    :type allocations: list
+    :param peak_memory: Peak memory traced during each call in bytes.
+    :type peak_memory: list
+    """
+
+    def __init__(self, module, latencies, cards, html_sizes, allocations, peak_memory):
+        self.module = module
+        self.latencies = latencies
+        self.cards = cards
+        self.html_sizes = html_sizes
+        self.allocations = allocations
+        self.peak_memory = peak_memory
+
+    def summary(self):
+        """Return summary statistics of the measurements.
+
+        :returns: Dictionary with the module name, type, and context, the
+            number of calls, the median, p95, and maximum latency per call and
+            the median latency per card in milliseconds, the mean number of
+            cards and HTML characters per call, the maximum HTML characters,
+            and the mean allocated blocks and peak memory in bytes per call.
+        :rtype: dict
+        """
+        latencies = sorted(self.latencies)
+        num_cards = sum(self.cards)
+        median = statistics.median(latencies) if latencies else float("nan")
+        return {
+            "module": self.module.name,
+            "type": f"{type(self.module).__module__}.{type(self.module).__name__}",
+            "context": self.module.context,
+            "calls": len(latencies),
+            "median_ms": 1000 * median,
+            "p95_ms": (
+                1000 * latencies[max(0, math.ceil(0.95 * len(latencies)) - 1)]
+                if latencies
+                else float("nan")
+            ),
+            "max_ms": 1000 * max(latencies, default=float("nan")),
+            "median_ms_per_card": (
+                1000 * median * len(self.cards) / num_cards
+                if num_cards
+                else float("nan")
+            ),
+            "cards": statistics.mean(self.cards) if self.cards else 0,
+            "html_chars": statistics.mean(self.html_sizes) if self.html_sizes else 0,
+            "max_html_chars": max(self.html_sizes, default=0),
+            "allocations": statistics.mean(self.allocations) if self.allocations else 0,
+            "peak_memory": statistics.mean(self.peak_memory) if self.peak_memory else 0,
+        }
+
+
+def benchmark_module(
+    module, project=None, sample=20, repeat=3, trace_memory=True, seed=0
+):
+    """Benchmark the :code:`get_cards` method of a module.
+
+    The module is registered with a new dashboard for the project. Each
+    sampled job (or the project) is first rendered once without
+    measurements to warm up caches of the module, then :code:`repeat` times
+    with timing, and once more with :py:mod:`tracemalloc` tracing if
+    :code:`trace_memory` is true. Latencies are measured without tracing,
+    because tracing slows down allocations.
+
+    :param module: The module to benchmark.
+    :type module: :py:class:`~.Module`
+    :param project: The project (default: :code:`None`, a synthetic project
+        with 100 jobs in a temporary directory).
+    :type project: :py:class:`signac.Project`
+    :param sample: Number of randomly sampled jobs (default: 20).
+    :type sample: int
+    :param repeat: Number of timed calls per job (default: 3).
+    :type repeat: int
+    :param trace_memory: Whether to measure allocations (default: :code:`True`).
+    :type trace_memory: bool
+    :param seed: Seed for sampling jobs (default: 0).
+    :type seed: int
+    :rtype: :py:class:`ModuleBenchmarkResult`
+    """
+    if project is None:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            return benchmark_module(
+                module,
+                generate_project(tmp_dir, 100),
+                sample=sample,
+                repeat=repeat,
+                trace_memory=trace_memory,
+                seed=seed,
+            )
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    dashboard = Dashboard(
+        config={"ACCESS_TOKEN": None, "SERVER_TIMING": False},
+        project=project,
+        modules=[module],
+    )
+    if module not in dashboard.modules:
+        raise RuntimeError(f"The module {module.name} could not be registered.")
+    if module.context == "ProjectContext":
+        targets = [project]
+    else:
+        jobs = dashboard._get_all_jobs()
+        targets = random.Random(seed).sample(jobs, min(sample, len(jobs)))
+
+    latencies, cards, html_sizes, allocations, peak_memory = [], [], [], [], []
+    with dashboard.app.test_request_context("/jobs/"):
+        for target in targets:
+            list(module.get_cards(target))
+            for _ in range(repeat):
+                start = time.perf_counter()
+                target_cards = list(module.get_cards(target))
+                latencies.append(time.perf_counter() - start)
+            cards.append(len(target_cards))
+            html_sizes.append(sum(len(str(card["content"])) for card in target_cards))
+            if trace_memory:
+                was_tracing = tracemalloc.is_tracing()
+                if not was_tracing:
+                    tracemalloc.start()
+                try:
+                    before = tracemalloc.take_snapshot()
+                    tracemalloc.reset_peak()
+                    current = tracemalloc.get_traced_memory()[0]
+                    target_cards = list(module.get_cards(target))
+                    peak = tracemalloc.get_traced_memory()[1]
+                    after = tracemalloc.take_snapshot()
+                finally:
+                    if not was_tracing:
+                        tracemalloc.stop()
+                allocations.append(
+                    sum(
+                        max(0, stat.count_diff)
+                        for stat in after.compare_to(before, "lineno")
+                    )
+                )
+                peak_memory.append(peak - current)
+                del target_cards
+    return ModuleBenchmarkResult(
+        module, latencies, cards, html_sizes, allocations, peak_memory
+    )
+
+
+def format_results(results):
+    """Return a table of benchmark results.
+
+    :param results: Results of :py:func:`benchmark_module`.
+    :type results: list of :py:class:`ModuleBenchmarkResult`
+    :rtype: str
+    """
+    lines = [
+        f"{'module':<32} {'context':<15} {'median ms':>10} {'p95 ms':>9} "
+        f"{'ms/card':>8} {'cards':>6} {'HTML chars':>11} {'blocks':>8} {'peak KB':>8}"
+    ]
+    for result in results:
+        row = result.summary()
+        lines.append(
+            f"{row['module'][:32]:<32} {row['context']:<15} {row['median_ms']:>10.2f} "
+            f"{row['p95_ms']:>9.2f} {row['median_ms_per_card']:>8.2f} "
+            f"{row['cards']:>6.1f} {row['html_chars']:>11.0f} "
+            f"{row['allocations']:>8.0f} {row['peak_memory'] / 1024:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(command_args=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark get_cards of signac-dashboard modules."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="Import paths of module classes or callables returning a module, "
+        "e.g. 'my_modules:MyModule'. Default: all built-in modules.",
+    )
+    parser.add_argument(
+        "--kwargs",
+        type=json.loads,
+        default={},
+        help="JSON object of keyword arguments passed to each module.",
+    )
+    parser.add_argument(
+        "--project",
+        help="Project directory. Default: a synthetic project with 100 jobs.",
+    )
+    parser.add_argument(
+        "-n", "--sample", type=int, default=20, help="Jobs to sample. Default: 20"
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="Calls per job. Default: 3"
+    )
+    parser.add_argument(
+        "--no-trace-memory", action="store_true", help="Skip tracemalloc."
+    )
+    parser.add_argument(
+        "--max-median-ms",
+        type=float,
+        help="Fail if the median latency of a module exceeds this value.",
+    )
+    parser.add_argument(
+        "--max-html-chars",
+        type=int,
+        help="Fail if the rendered HTML of a call exceeds this size.",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON.")
+    args = parser.parse_args(command_args)
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.modules:
+        modules = [import_string(path)(**args.kwargs) for path in args.modules]
+    else:
+        modules = builtin_modules()
+
+    tmp_dir = None
+    if args.project is None:
+        tmp_dir = tempfile.mkdtemp()
+        project = generate_project(tmp_dir, 100)
+    else:
+        project = signac.get_project(args.project)
+    try:
+        results = [
+            benchmark_module(
+                module,
+                project,
+                sample=args.sample,
+                repeat=args.repeat,
+                trace_memory=not args.no_trace_memory,
+            )
+            for module in modules
+        ]
+    finally:
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir)
+
+    if args.json:
+        print(json.dumps([result.summary() for result in results], indent=2))
+    else:
+        print(format_results(results))
+
+    failed = False
+    for result in results:
+        row = result.summary()
+        if args.max_median_ms is not None and row["median_ms"] > args.max_median_ms:
+            print(
+                f"{row['module']}: median latency {row['median_ms']:.2f} ms exceeds "
+                f"{args.max_median_ms} ms.",
+                file=sys.stderr,
+            )
+            failed = True
+        if (
+            args.max_html_chars is not None
+            and row["max_html_chars"] > args.max_html_chars
+        ):
+            print(
+                f"{row['module']}: {row['max_html_chars']} HTML characters exceed "
+                f"{args.max_html_chars}.",
+                file=sys.stderr,
+            )
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
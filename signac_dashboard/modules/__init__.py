@@ -1,25 +1,31 @@
+from .array_preview import ArrayPreview
 from .document_editor import DocumentEditor
 from .document_list import DocumentList
 from .file_list import FileList
 from .flow_status import FlowStatus
 from .image_viewer import ImageViewer
+from .log_tail import LogTail
 from .navigator import Navigator
 from .notes import Notes
 from .schema import Schema
 from .statepoint_list import StatepointList
 from .text_display import TextDisplay
+from .time_series import TimeSeries
 from .video_viewer import VideoViewer
 
 __all__ = [
+    "ArrayPreview",
     "DocumentEditor",
     "DocumentList",
     "FileList",
     "FlowStatus",
     "ImageViewer",
+    "LogTail",
     "Navigator",
     "Notes",
     "Schema",
     "StatepointList",
     "TextDisplay",
+    "TimeSeries",
     "VideoViewer",
 ]
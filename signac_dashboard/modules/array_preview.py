@@ -0,0 +1,153 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+from flask import render_template
+
+from signac_dashboard.arrays import (
+    FileCache,
+    is_numeric,
+    open_arrays,
+    png_data_uri,
+    required_library,
+    strided_sample,
+    summarize,
+    svg_points,
+)
+from signac_dashboard.listing import glob_files
+from signac_dashboard.module import Module
+from signac_dashboard.util import format_size
+
+
+class ArrayPreview(Module):
+    """Summarizes NumPy and HDF5 arrays and shows a downsampled preview.
+
+    Each :code:`.npy` file and each dataset of an HDF5 file, including the
+    job data in :code:`signac_data.h5`, yields a card with its shape, data
+    type, chunking and compression, statistics of a strided sample, and a
+    preview: a line for one-dimensional arrays and a grayscale image of the
+    first two-dimensional slice of other arrays.
+
+    Arrays are never read completely: NumPy files are memory-mapped and HDF5
+    datasets are read lazily, and only a strided sample of at most
+    :code:`max_samples` elements is read. Summaries are cached until the
+    modification time of the file changes. This module requires the
+    :code:`numpy` library, and the :code:`h5py` library for HDF5 files.
+
+    :Example:
+
+    .. code-block:: python
+
+        from signac_dashboard.modules import ArrayPreview
+        array_mod = ArrayPreview(filenames=['*.npy', 'signac_data.h5'])
+
+    :param context: Supports :code:`'JobContext'` and :code:`'ProjectContext'`.
+    :type context: str
+    :param filenames: Glob expressions or exact filenames, relative to the
+        job or project directory, of the array files (default:
+        :code:`['*.npy', '*.h5', '*.hdf5']`).
+    :type filenames: list
+    :param max_samples: Maximum number of elements read from each array
+        (default: 100000).
+    :type max_samples: int
+    :param preview_size: Maximum number of points of a line preview and of
+        pixels along each axis of an image preview (default: 128).
+    :type preview_size: int
+    :param max_datasets: Maximum number of datasets shown per HDF5 file
+        (default: 16).
+    :type max_datasets: int
+    """
+
+    _supported_contexts = {"JobContext", "ProjectContext"}
+
+    def __init__(
+        self,
+        name="Array Preview",
+        context="JobContext",
+        template="cards/array_preview.html",
+        filenames=("*.npy", "*.h5", "*.hdf5"),
+        max_samples=100000,
+        preview_size=128,
+        max_datasets=16,
+        **kwargs,
+    ):
+        super().__init__(
+            name=name,
+            context=context,
+            template=template,
+            **kwargs,
+        )
+        self.filenames = filenames
+        self.max_samples = max_samples
+        self.preview_size = preview_size
+        self.max_datasets = max_datasets
+        self._summaries = FileCache()
+
+    def _preview(self, array):
+        if array.ndim == 0 or array.size == 0 or not is_numeric(array.dtype):
+            return None
+        if array.ndim == 1:
+            values, _ = strided_sample(array, self.preview_size)
+            return {
+                "points": svg_points(range(len(values)), values, self.preview_size, 48),
+                "width": self.preview_size,
+                "height": 48,
+            }
+        image, _ = strided_sample(
+            array, self.preview_size**2, index=(0,) * (array.ndim - 2)
+        )
+        return {"image": png_data_uri(image), "sliced": array.ndim > 2}
+
+    def _summarize_array(self, name, array):
+        summary = {
+            "dataset": name,
+            "shape": " × ".join(map(str, array.shape)) or "scalar",
+            "dtype": str(array.dtype),
+            "size": format_size(array.size * array.dtype.itemsize),
+            "chunks": getattr(array, "chunks", None),
+            "compression": getattr(array, "compression", None),
+        }
+        try:
+            sample, steps = strided_sample(array, self.max_samples)
+            summary["sampled"] = sample.size
+            summary["elements"] = array.size
+            summary["steps"] = steps
+            summary["stats"] = summarize(sample) if array.size else None
+            if array.ndim == 0:
+                summary["value"] = str(sample)
+            summary["preview"] = self._preview(array)
+        except (OSError, ValueError, TypeError) as error:
+            # For example, HDF5 filters that are not available.
+            summary["error"] = f"The array could not be read: {error}"
+        return summary
+
+    def _summarize(self, path):
+        with open_arrays(path, self.max_datasets) as (arrays, omitted):
+            summaries = [self._summarize_array(name, array) for name, array in arrays]
+        if summaries:
+            summaries[-1]["omitted"] = omitted
+        return summaries
+
+    def get_cards(self, job_or_project):
+        for filename in glob_files(job_or_project.fn(""), self.filenames):
+            path = job_or_project.fn(filename)
+            library = required_library(path)
+            if library is not None:
+                summaries = [
+                    {"error": f"Install the '{library}' library to preview arrays."}
+                ]
+            else:
+                try:
+                    summaries = self._summaries.get_or_compute(
+                        path, lambda: self._summarize(path)
+                    )
+                except (OSError, ValueError) as error:
+                    summaries = [{"error": f"The file could not be read: {error}"}]
+            for summary in summaries:
+                dataset = summary.get("dataset")
+                yield {
+                    "name": f"{self.name}: {filename}"
+                    + (f"/{dataset}" if dataset else ""),
+                    "content": render_template(
+                        self.template, filename=filename, **summary
+                    ),
+                }
@@ -1,6 +1,7 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import json
 from ast import literal_eval
 from collections import OrderedDict
 
@@ -10,6 +11,7 @@ from jinja2.exceptions import TemplateNotFound
 from markupsafe import escape
 
 from signac_dashboard.module import Module
+from signac_dashboard.util import bounded_repr
 
 
 class DocumentEditor(Module):
@@ -19,10 +21,14 @@ class DocumentEditor(Module):
     to edit their contents. When saving, the edited strings are parsed into
     JSON-compatible Python data structures (e.g., :py:class:`list` and
     :py:class:`dict`). Job document keys beginning with an underscore
-    :code:`_` are treated as private and are not displayed.
+    :code:`_` are treated as private and are not displayed. Values whose
+    representation is longer than :code:`max_chars` are shown truncated and
+    cannot be edited.
 
     :param context: Supports :code:`'JobContext'`.
     :type context: str
+    :param max_chars: Maximum length of editable values (default: 10000).
+    :type max_chars: int
     """
 
     _supported_contexts = {"JobContext"}
@@ -32,6 +38,7 @@ class DocumentEditor(Module):
         name="Document Editor",
         context="JobContext",
         template="cards/document_editor.html",
+        max_chars=10000,
         **kwargs,
     ):
         super().__init__(
@@ -40,20 +47,26 @@ class DocumentEditor(Module):
             template=template,
             **kwargs,
         )
+        self.max_chars = max_chars
 
     def get_cards(self, job):
-        doc = OrderedDict(sorted(job.document.items(), key=lambda t: t[0]))
-
-        for key in doc:
+        doc = OrderedDict()
+        read_only = set()
+        for key, value in sorted(job.document().items(), key=lambda t: t[0]):
             if key.startswith("_"):
                 # Don't allow users to edit "private" keys that begin with _
-                del doc[key]
-            else:
-                doc[key] = escape(repr(doc[key]))
+                continue
+            value_repr, truncated = bounded_repr(value, self.max_chars)
+            if truncated:
+                value_repr += "..."
+                read_only.add(key)
+            doc[key] = escape(value_repr)
         return [
             {
                 "name": self.name,
-                "content": render_template(self.template, document=doc, jobid=job._id),
+                "content": render_template(
+                    self.template, document=doc, read_only=read_only, jobid=job._id
+                ),
             }
         ]
 
@@ -64,16 +77,29 @@ class DocumentEditor(Module):
         def document_editor_update():
             jobid = request.form.get("jobid")
             job = dashboard.project.open_job(id=jobid)
+
+            # Parse and validate all fields before saving any of them
+            updates = {}
             for key, value in request.form.items():
                 if key.startswith("doc:"):
                     key = key[4:]
                     try:
-                        job.doc[key] = literal_eval(value)
+                        updates[key] = literal_eval(value)
+                        json.dumps(updates[key])
                     except (SyntaxError, TypeError, ValueError) as e:
                         return (
-                            f"Error in key <strong>{key}</strong>: {e}",
+                            f"Error in key <strong>{escape(key)}</strong>: "
+                            f"{escape(e)}",
                             422,
                         )
+
+            # Write the document once instead of once per key
+            try:
+                with dashboard._document_locks.hold(job.id):
+                    job.doc.update(updates)
+            except (TypeError, ValueError) as e:
+                return f"Error: {escape(e)}", 422
+            dashboard._update_job_cache(job)
             return "Saved."
 
         @dashboard.app.route("/module/document_editor/<path:filename>")
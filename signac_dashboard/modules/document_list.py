@@ -12,12 +12,15 @@ from signac_dashboard.util import escape_truncated_values
 class DocumentList(Module):
     """Displays the job or project document.
 
-    Long values can be optionally truncated.
+    Long values are truncated. Truncated values are rendered in time and
+    memory proportional to :code:`max_chars`, regardless of their size.
 
     :param context: Supports :code:`'JobContext'` and :code:`'ProjectContext'`.
     :type context: str
-    :param max_chars: Truncation length for document values (default:
-        :code:`None`).
+    :param max_chars: Truncation length for document values. If :code:`None`,
+        values are only truncated beyond
+        :py:data:`signac_dashboard.util.MAX_VALUE_CHARS` characters (default:
+        1000).
     :type max_chars: int
     """
 
@@ -28,7 +31,7 @@ class DocumentList(Module):
         name=None,
         context="JobContext",
         template="cards/escaped_dict_display.html",
-        max_chars=None,
+        max_chars=1000,
         **kwargs,
     ):
         # Set name based on context
@@ -47,7 +50,8 @@ class DocumentList(Module):
         self.max_chars = max_chars
 
     def get_cards(self, job_or_project):
-        doc = OrderedDict(sorted(job_or_project.document.items(), key=lambda t: t[0]))
+        # Calling the document loads it once as plain Python objects
+        doc = OrderedDict(sorted(job_or_project.document().items(), key=lambda t: t[0]))
 
         # We manually escape the document's contents since the field is marked
         # "safe" in the Jinja template. This is necessary because we added
@@ -1,21 +1,32 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
-import os
+from datetime import datetime
 
-from flask import render_template
+import flask_login
+from flask import abort, render_template, request
+from jinja2.exceptions import TemplateNotFound
 
+from signac_dashboard.listing import scan_directory
 from signac_dashboard.module import Module
+from signac_dashboard.pagination import Pagination
+from signac_dashboard.util import format_size
 
 
 class FileList(Module):
     """Lists files in the job directory with download links.
 
+    Directory listings are cached until the job directory changes. Large
+    directories are paginated within the card.
+
     :param context: Supports :code:`'JobContext'`.
     :type context: str
     :param prefix_jobid: Whether filenames should be prefixed with the job id
         when being downloaded (default: :code:`True`).
     :type prefix_jobid: bool
+    :param per_page: Maximum number of files shown at once in a card
+        (default: 100).
+    :type per_page: int
     """
 
     _supported_contexts = {"JobContext"}
@@ -26,6 +37,7 @@ class FileList(Module):
         context="JobContext",
         template="cards/file_list.html",
         prefix_jobid=True,
+        per_page=100,
         **kwargs,
     ):
         super().__init__(
@@ -35,6 +47,7 @@ class FileList(Module):
             **kwargs,
         )
         self.prefix_jobid = prefix_jobid
+        self.per_page = per_page
 
     def download_name(self, job, filename):
         if self.prefix_jobid:
@@ -42,18 +55,61 @@ class FileList(Module):
         else:
             return filename
 
+    def _render_content(self, job, page=1):
+        entries = scan_directory(job.path)
+        pagination = Pagination(page, self.per_page, len(entries))
+        pagination.page = max(1, min(pagination.page, pagination.pages))
+        files = [
+            {
+                "name": entry.name,
+                "jobid": job._id,
+                "download": self.download_name(job, entry.name),
+                "is_dir": entry.is_dir,
+                "size": "" if entry.is_dir else format_size(entry.size),
+                "modified": datetime.fromtimestamp(entry.mtime).strftime(
+                    "%Y-%m-%d %H:%M"
+                ),
+            }
+            for entry in pagination.paginate(entries)
+        ]
+        return render_template(
+            self.template,
+            files=files,
+            jobid=job._id,
+            pagination=pagination,
+            total_size=format_size(sum(entry.size for entry in entries)),
+        )
+
     def get_cards(self, job):
-        files = sorted(
-            (
+        return [{"name": self.name, "content": self._render_content(job)}]
+
+    def register(self, dashboard):
+        # Register routes
+        @dashboard.app.route("/module/file_list/page/<jobid>")
+        @flask_login.login_required
+        def file_list_page(jobid):
+            try:
+                job = dashboard.project.open_job(id=jobid)
+            except KeyError:
+                abort(404, "The job id requested could not be found.")
+            page = request.args.get("page", 1, type=int)
+            return self._render_content(job, page=page)
+
+        @dashboard.app.route("/module/file_list/<path:filename>")
+        @flask_login.login_required
+        def file_list_asset(filename):
+            path = f"file_list/{filename}"
+            try:
+                return render_template(path)
+            except TemplateNotFound:
+                abort(404, "The file requested does not exist.")
+
+        # Register assets
+        assets = ["js/file_list.js"]
+        for asset_file in assets:
+            dashboard.register_module_asset(
                 {
-                    "name": filename,
-                    "jobid": job._id,
-                    "download": self.download_name(job, filename),
+                    "file": f"templates/file_list/{asset_file}",
+                    "url": f"/module/file_list/{asset_file}",
                 }
-                for filename in os.listdir(job.path)
-            ),
-            key=lambda filedata: filedata["name"],
-        )
-        return [
-            {"name": self.name, "content": render_template(self.template, files=files)}
-        ]
+            )
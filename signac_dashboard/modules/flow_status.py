@@ -2,13 +2,22 @@
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
-from flask import render_template
+from flask import g, render_template
 
 from signac_dashboard.module import Module
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of jobs whose labels are cached.
+_MAX_CACHED_JOBS = 65536
+
 
 class FlowStatus(Module):
     """Show job labels from a :py:class:`flow.FlowProject`.
@@ -25,8 +34,23 @@ class FlowStatus(Module):
         if __name__ == '__main__':
             Dashboard(project=Project()).main()
 
+    Labels are computed for all jobs on a page at once on a pool of worker
+    threads. They are cached until the job directory or job document changes
+    or until the cached labels are older than :code:`ttl` seconds. If the
+    labels of a job are not computed within :code:`timeout` seconds of the
+    start of rendering the page, a pending card is shown and the labels are
+    available on a later page load.
+
     :param context: Supports :code:`'JobContext'`.
     :type context: str
+    :param workers: Number of threads computing labels (default: 8).
+    :type workers: int
+    :param ttl: Seconds after which cached labels are recomputed
+        (default: 60).
+    :type ttl: float
+    :param timeout: Seconds to wait for the labels of the jobs on a page
+        before showing pending cards (default: 5).
+    :type timeout: float
     """
 
     _supported_contexts = {"JobContext"}
@@ -38,6 +62,9 @@ class FlowStatus(Module):
         template="cards/flow_status.html",
         project_module="project",
         project_class="Project",
+        workers=8,
+        ttl=60,
+        timeout=5,
         **kwargs,
     ):
         super().__init__(
@@ -46,6 +73,13 @@ class FlowStatus(Module):
             template=template,
             **kwargs,
         )
+        self.workers = workers
+        self.ttl = ttl
+        self.timeout = timeout
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = None
 
     def register(self, dashboard):
         self.project = dashboard.project
@@ -55,15 +89,84 @@ class FlowStatus(Module):
                 "Try providing a FlowProject to the Dashboard's "
                 "project argument."
             )
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="flow-status"
+        )
 
-    def get_cards(self, job):
+    @staticmethod
+    def _job_state(job):
+        """Return a key that changes when the job directory or document changes."""
+        state = []
+        for path in (job.path, job.fn(job.FN_DOCUMENT)):
+            try:
+                state.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                state.append(None)
+        return tuple(state)
+
+    def _compute_labels(self, job, state):
         try:
-            labels = self.project.labels(job)
+            labels = tuple(self.project.labels(job))
         except AttributeError:
             labels = ("Error: Project cannot provide labels.",)
+        except Exception as error:
+            logger.warning(f"Error while computing labels of job {job}: {error}")
+            labels = (f"Error: {type(error).__name__}: {error}",)
+        with self._lock:
+            self._cache[job.id] = (state, time.monotonic(), labels)
+            self._cache.move_to_end(job.id)
+            while len(self._cache) > _MAX_CACHED_JOBS:
+                self._cache.popitem(last=False)
+            del self._pending[job.id]
+        return labels
+
+    def _submit(self, job):
+        """Return cached labels or a future computing them."""
+        state = self._job_state(job)
+        with self._lock:
+            cached = self._cache.get(job.id)
+            if (
+                cached is not None
+                and cached[0] == state
+                and time.monotonic() - cached[1] < self.ttl
+            ):
+                return cached[2]
+            if job.id not in self._pending:
+                self._pending[job.id] = self._pool.submit(
+                    self._compute_labels, job, state
+                )
+            return self._pending[job.id]
+
+    def _prefetch(self):
+        """Submit all jobs on the current page, once per request.
+
+        :returns: The deadline of the request for waiting for labels, shared
+            by all cards so that a page waits at most :code:`timeout` seconds.
+        :rtype: float
+        """
+        deadlines = g.setdefault("_flow_status_deadlines", {})
+        deadline = deadlines.get(id(self))
+        if deadline is None:
+            deadline = deadlines[id(self)] = time.monotonic() + self.timeout
+            for job_details in getattr(g, "jobs", None) or []:
+                self._submit(job_details["job"])
+        return deadline
+
+    def get_cards(self, job):
+        deadline = self._prefetch()
+        labels = self._submit(job)
+        pending = False
+        if not isinstance(labels, tuple):
+            try:
+                labels = labels.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                labels = ()
+                pending = True
         return [
             {
                 "name": self.name,
-                "content": render_template(self.template, labels=labels),
+                "content": render_template(
+                    self.template, labels=labels, pending=pending
+                ),
             }
         ]
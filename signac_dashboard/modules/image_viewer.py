@@ -1,12 +1,9 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
-import glob
-import itertools
-import os
-
 from flask import render_template
 
+from signac_dashboard.listing import glob_files
 from signac_dashboard.module import Module
 
 
@@ -19,7 +16,8 @@ class ImageViewer(Module):
     defined to select specific filenames. Each matching file yields a card.
 
     Multiple ImageViewer modules can be defined with different filenames or
-    globs to enable/disable cards for each image or image group.
+    globs to enable/disable cards for each image or image group. Matching files
+    are cached until the directories they were found in change.
 
     :Example:
 
@@ -34,7 +32,8 @@ class ImageViewer(Module):
     :param context: Supports :code:`'JobContext'` and :code:`'ProjectContext'`.
     :type context: str
     :param img_globs: A list of glob expressions or exact filenames,
-        relative to the job or project directory, to be displayed
+        relative to the job or project directory, to be displayed. Recursive
+        :code:`**` patterns are supported
         (default: :code:`['*.png', '*.jpg', '*.gif', '*.svg']`).
     :type img_globs: list
     :type sort_key: callable
@@ -81,10 +80,8 @@ class ImageViewer(Module):
                 ),
             }
 
-        image_globs = [
-            glob.iglob(job_or_project.fn(image_glob)) for image_glob in self.img_globs
-        ]
-        image_files = itertools.chain(*image_globs)
-        image_files = sorted(image_files, key=self.sort_key)
-        for filepath in image_files:
-            yield make_card(os.path.relpath(filepath, job_or_project.fn("")))
+        image_files = glob_files(
+            job_or_project.fn(""), self.img_globs, sort_key=self.sort_key
+        )
+        for filename in image_files:
+            yield make_card(filename)
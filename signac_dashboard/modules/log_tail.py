@@ -0,0 +1,324 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import json
+import os
+import time
+
+import flask_login
+from flask import abort, jsonify, render_template, request, url_for
+from jinja2.exceptions import TemplateNotFound
+from werkzeug.exceptions import ServiceUnavailable
+
+from signac_dashboard.admission import AdmissionLimiter
+from signac_dashboard.listing import glob_files
+from signac_dashboard.module import Module
+from signac_dashboard.util import format_size
+
+# Size of the blocks read backwards from the end of a file.
+_BLOCK_SIZE = 8192
+
+# Maximum number of files followed by one poll.
+_MAX_TAILS = 100
+
+
+def tail(path, lines, max_bytes):
+    """Read the last lines of a file, reading backwards from its end.
+
+    At most :code:`max_bytes` are read, so that files of any size are read
+    in bounded time and memory.
+
+    :param path: Path of the file.
+    :type path: str
+    :param lines: Maximum number of lines.
+    :type lines: int
+    :param max_bytes: Maximum number of bytes to read.
+    :type max_bytes: int
+    :returns: The last lines, the size of the file at the time it was read,
+        whether the beginning of the file was omitted, and the inode number
+        of the file.
+    :rtype: tuple of (bytes, int, bool, int)
+    """
+    with open(path, "rb") as file:
+        inode = os.fstat(file.fileno()).st_ino
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        data = b""
+        # One more newline than lines is needed to find the first line.
+        while (
+            position > 0 and data.count(b"\n") <= lines and end - position < max_bytes
+        ):
+            size = min(_BLOCK_SIZE, position, max_bytes - (end - position))
+            position -= size
+            file.seek(position)
+            data = file.read(size) + data
+    selected = data.splitlines(keepends=True)
+    if position > 0 and selected:
+        # The first line may have been read partially.
+        selected = selected[1:]
+    truncated = position > 0 or len(selected) > lines
+    data = b"".join(selected[-lines:] if lines > 0 else [])
+    return data, end, truncated, inode
+
+
+def read_appended(path, offset, max_bytes, inode=None):
+    """Read the complete lines appended to a file after an offset.
+
+    :param path: Path of the file.
+    :type path: str
+    :param offset: Offset from which to read.
+    :type offset: int
+    :param max_bytes: Maximum number of bytes to read.
+    :type max_bytes: int
+    :param inode: Inode number of the file that was read up to the offset,
+        or :code:`None` to not check it (default: :code:`None`).
+    :type inode: int
+    :returns: The appended data and the offset after it. A line that is still
+        being written is only returned if it is longer than
+        :code:`max_bytes`. If the file is smaller than the offset or has
+        another inode number, it was truncated or replaced and :code:`None`
+        is returned instead.
+    :rtype: tuple of (bytes, int) or None
+    """
+    with open(path, "rb") as file:
+        if inode is not None and os.fstat(file.fileno()).st_ino != inode:
+            return None
+        end = file.seek(0, os.SEEK_END)
+        if end < offset:
+            return None
+        file.seek(offset)
+        data = file.read(max_bytes)
+    newline = data.rfind(b"\n")
+    if newline >= 0:
+        data = data[: newline + 1]
+    elif len(data) < max_bytes:
+        data = b""
+    return data, offset + len(data)
+
+
+class LogTail(Module):
+    """Shows the end of log files and follows the lines appended to them.
+
+    Each matching file yields a card with its last lines. A page polls the
+    dashboard with a single request for the lines appended to the files of
+    all its cards after the offsets they have shown, and the dashboard holds
+    each poll until a file grows or :code:`wait` seconds have passed. Files
+    that were truncated or replaced, detected by their size and inode
+    number, are shown from their end again. At most a quarter of the
+    **THREADS** of the dashboard, and at least one, hold polls at the same
+    time, further polls are rejected with the status 503. Files are never
+    read completely: the last lines are read backwards from the end of the
+    file, and at most :code:`max_bytes` are read per file and request.
+
+    :Example:
+
+    .. code-block:: python
+
+        from signac_dashboard.modules import LogTail
+        log_mod = LogTail(filenames=['log.txt', '*.out'], lines=200)
+
+    :param context: Supports :code:`'JobContext'`.
+    :type context: str
+    :param filenames: Glob expressions or exact filenames, relative to the
+        job directory, of the log files (default:
+        :code:`['*.log', '*.out', 'log.txt']`).
+    :type filenames: list
+    :param lines: Number of lines shown initially (default: 100).
+    :type lines: int
+    :param max_lines: Number of lines kept in the card while following the
+        file (default: 1000).
+    :type max_lines: int
+    :param max_bytes: Maximum number of bytes read per file and request
+        (default: 65536).
+    :type max_bytes: int
+    :param wait: Maximum time in seconds that the dashboard waits for new
+        lines before answering a poll (default: 10).
+    :type wait: float
+    :param encoding: Encoding of the log files (default: :code:`'utf-8'`).
+    :type encoding: str
+    """
+
+    _supported_contexts = {"JobContext"}
+
+    def __init__(
+        self,
+        name="Log Tail",
+        context="JobContext",
+        template="cards/log_tail.html",
+        filenames=("*.log", "*.out", "log.txt"),
+        lines=100,
+        max_lines=1000,
+        max_bytes=65536,
+        wait=10,
+        encoding="utf-8",
+        **kwargs,
+    ):
+        super().__init__(
+            name=name,
+            context=context,
+            template=template,
+            **kwargs,
+        )
+        self.filenames = filenames
+        self.lines = lines
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.wait = wait
+        self.encoding = encoding
+        self._module_id = None
+
+    def _decode(self, data):
+        return data.decode(self.encoding, errors="replace")
+
+    def _files(self, job):
+        return glob_files(job.fn(""), self.filenames)
+
+    def get_cards(self, job):
+        for filename in self._files(job):
+            path = job.fn(filename)
+            try:
+                data, size, truncated, inode = tail(path, self.lines, self.max_bytes)
+            except OSError:
+                continue
+            yield {
+                "name": f"{self.name}: {filename}",
+                "content": render_template(
+                    self.template,
+                    filename=filename,
+                    size=format_size(size),
+                    text=self._decode(data),
+                    truncated=truncated,
+                    lines=self.lines,
+                    max_lines=self.max_lines,
+                    offset=size,
+                    inode=inode,
+                    module_id=self._module_id,
+                    jobid=job._id,
+                    url=url_for("log_tail_poll"),
+                ),
+            }
+
+    def _read(self, job, filename, offset, inode):
+        """Read the lines appended to a file for a poll.
+
+        :returns: A dictionary with the keys :code:`'text'`, :code:`'offset'`,
+            :code:`'inode'` and :code:`'reset'`, or with the key
+            :code:`'error'` if the file cannot be read.
+        :rtype: dict
+        """
+        path = job.fn(filename)
+        try:
+            result = read_appended(path, offset, self.max_bytes, inode)
+            if result is None:
+                # The file was truncated or replaced, show its end again.
+                data, size, _, inode = tail(path, self.lines, self.max_bytes)
+                return {
+                    "text": self._decode(data),
+                    "offset": size,
+                    "inode": inode,
+                    "reset": True,
+                }
+        except OSError:
+            return {"error": "The file requested does not exist."}
+        data, offset = result
+        return {
+            "text": self._decode(data),
+            "offset": offset,
+            "inode": inode,
+            "reset": False,
+        }
+
+    def register(self, dashboard):
+        # All LogTail modules of a dashboard share their routes.
+        modules = dashboard.app.extensions.get("log_tail")
+        if modules is None:
+            modules = dashboard.app.extensions["log_tail"] = []
+            self._register_routes(dashboard, modules)
+        self._module_id = len(modules)
+        modules.append(self)
+
+    @staticmethod
+    def _poll(dashboard, modules):
+        """Answer a poll for the appended lines of the files of a page.
+
+        Each :code:`tail` argument is a JSON list of the module id, job id,
+        filename, offset and inode number of a card. The results are returned
+        in the same order, as soon as a file grew or was replaced, or when the
+        shortest :code:`wait` of the modules has passed.
+        """
+        tails = []
+        for value in request.args.getlist("tail")[:_MAX_TAILS]:
+            try:
+                module_id, jobid, filename, offset, inode = json.loads(value)
+                module = modules[int(module_id)]
+                offset = int(offset)
+                inode = None if inode is None else int(inode)
+            except (ValueError, TypeError, IndexError):
+                abort(400, "The files requested are invalid.")
+            try:
+                job = dashboard.project.open_job(id=jobid)
+            except (KeyError, LookupError, TypeError):
+                job = None
+            if job is None or filename not in module._files(job):
+                tails.append(None)
+            else:
+                tails.append((module, job, filename, offset, inode))
+        if not tails:
+            return jsonify(tails=[])
+        wait = min(module.wait for module in modules)
+        wait = min(request.args.get("wait", wait, type=float), wait)
+        deadline = time.monotonic() + wait
+        while True:
+            results = [
+                (
+                    {"error": "The file requested does not exist."}
+                    if entry is None
+                    else entry[0]._read(*entry[1:])
+                )
+                for entry in tails
+            ]
+            changed = any(
+                "error" in result or result["reset"] or result["text"]
+                for result in results
+            )
+            if changed or time.monotonic() >= deadline:
+                return jsonify(tails=results)
+            time.sleep(min(0.5, max(0, deadline - time.monotonic())))
+
+    @staticmethod
+    def _register_routes(dashboard, modules):
+        # Polls are held for up to the wait time of the modules, so that only
+        # a share of the request threads is used to follow files.
+        limiter = AdmissionLimiter(max(dashboard.config["THREADS"] // 4, 1))
+
+        @dashboard.app.route("/module/log_tail/poll")
+        @flask_login.login_required
+        def log_tail_poll():
+            if not limiter.acquire():
+                raise ServiceUnavailable(
+                    "Too many files are followed, please retry later.",
+                    retry_after=dashboard.config["RETRY_AFTER"],
+                )
+            try:
+                return LogTail._poll(dashboard, modules)
+            finally:
+                limiter.release()
+
+        @dashboard.app.route("/module/log_tail/<path:filename>")
+        @flask_login.login_required
+        def log_tail_asset(filename):
+            path = f"log_tail/{filename}"
+            try:
+                return render_template(path)
+            except TemplateNotFound:
+                abort(404, "The file requested does not exist.")
+
+        # Register assets
+        assets = ["js/log_tail.js"]
+        for asset_file in assets:
+            dashboard.register_module_asset(
+                {
+                    "file": f"templates/log_tail/{asset_file}",
+                    "url": f"/module/log_tail/{asset_file}",
+                }
+            )
@@ -112,7 +112,7 @@ class Navigator(Module):
 
         # Tell user because this can take a long time
         print("Detecting project schema for Navigator...", end="", flush=True)
-        schema = dashboard.project.detect_schema(exclude_const=True)
+        schema = dashboard._detect_schema(exclude_const=True)
         print("done.")
 
         # turn dict of sets of lists ...into list of parameters
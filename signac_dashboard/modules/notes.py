@@ -1,11 +1,100 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import logging
+import re
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import flask_login
-from flask import abort, render_template, request
+from flask import abort, g, jsonify, render_template, request, url_for
 from jinja2.exceptions import TemplateNotFound
+from markupsafe import escape
 
 from signac_dashboard.module import Module
+from signac_dashboard.util import KeyedLock
+
+logger = logging.getLogger(__name__)
+
+# Number of finished bulk updates whose status is kept.
+_MAX_BULK_UPDATES = 20
+
+# Number of bulk updates that run at the same time.
+_MAX_RUNNING_BULK_UPDATES = 4
+
+
+class _BulkUpdate:
+    """Apply a note operation to many jobs in batches on a worker pool.
+
+    The document of each job is read and written while holding the lock of
+    the job in :code:`locks`, so that concurrent writes are not lost.
+    """
+
+    def __init__(self, project, key, jobids, operation, note_text, locks=None):
+        self.id = secrets.token_hex(8)
+        self.project = project
+        self.key = key
+        self.jobids = jobids
+        self.operation = operation
+        self.note_text = note_text
+        self.locks = KeyedLock() if locks is None else locks
+        self.done = 0
+        self.failed = {}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def _apply(self, jobid):
+        # Open a separate job instance so that the document is not shared
+        # with request threads.
+        job = self.project.open_job(id=jobid)
+        with self.locks.hold(job.id):
+            if self.operation == "set":
+                job.document[self.key] = self.note_text
+                return
+            note = job.document.get(self.key, "")
+            if self.operation == "tag" and self.note_text in note.splitlines():
+                return
+            job.document[self.key] = (
+                note + "\n" + self.note_text if note else self.note_text
+            )
+
+    def run(self, workers, batch_size, on_finished=None):
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for i in range(0, len(self.jobids), batch_size):
+                    batch = self.jobids[i : i + batch_size]
+                    futures = [pool.submit(self._apply, jobid) for jobid in batch]
+                    for jobid, future in zip(batch, futures):
+                        try:
+                            future.result()
+                        except Exception as error:
+                            logger.warning(
+                                f"Failed to update notes of job {jobid}: {error}"
+                            )
+                            with self._lock:
+                                self.failed[jobid] = f"{type(error).__name__}: {error}"
+                        with self._lock:
+                            self.done += 1
+            if on_finished is not None:
+                on_finished()
+        except Exception:
+            logger.exception(f"Bulk update {self.id} failed.")
+        finally:
+            with self._lock:
+                self.finished = True
+
+    def status(self):
+        with self._lock:
+            return {
+                "id": self.id,
+                "operation": self.operation,
+                "total": len(self.jobids),
+                "done": self.done,
+                "failed": dict(self.failed),
+                "finished": self.finished,
+            }
 
 
 class Notes(Module):
@@ -15,13 +104,29 @@ class Notes(Module):
     The Notes module can be used to annotate a large data space with tags or
     human-readable descriptions for post-processing, parsing, or searching.
 
+    Notes can also be edited in bulk for all jobs of a search result or a list
+    of job ids, from the page linked in the card. The note can replace the
+    existing notes (``set``), be appended to them (``append``), or be appended
+    only if no line of the existing notes is equal to it (``tag``). Bulk edits
+    run in batches on a worker pool and report their progress and per-job
+    failures. At most 4 bulk edits run at the same time, further edits are
+    rejected with the status 503, and the status of the last 20 finished
+    edits is kept. Edits of the same job by bulk edits, the text box, and the
+    :py:class:`~.DocumentEditor` module are applied one after another.
+
     :param context: Supports :code:`'JobContext'`.
     :type context: str
     :param key: Document key to display and update (default: :code:`'notes'`).
     :type key: str
+    :param bulk_workers: Number of threads used for bulk edits (default: 8).
+    :type bulk_workers: int
+    :param bulk_batch_size: Number of jobs submitted to the worker pool at once
+        during bulk edits (default: 100).
+    :type bulk_batch_size: int
     """
 
     _supported_contexts = {"JobContext"}
+    _bulk_operations = ("set", "append", "tag")
 
     def __init__(
         self,
@@ -29,6 +134,8 @@ class Notes(Module):
         context="JobContext",
         template="cards/notes.html",
         key="notes",
+        bulk_workers=8,
+        bulk_batch_size=100,
         **kwargs,
     ):
         super().__init__(
@@ -38,6 +145,10 @@ class Notes(Module):
             **kwargs,
         )
         self.key = key
+        self.bulk_workers = bulk_workers
+        self.bulk_batch_size = bulk_batch_size
+        self._bulk_updates = OrderedDict()
+        self._bulk_updates_lock = threading.Lock()
 
     def get_cards(self, job):
         note_text = job.document.get(self.key, "")
@@ -50,6 +161,41 @@ class Notes(Module):
             }
         ]
 
+    def _start_bulk_update(self, dashboard, jobids, operation, note_text):
+        """Start a bulk update, or return None if too many are running."""
+        bulk_update = _BulkUpdate(
+            dashboard.project,
+            self.key,
+            jobids,
+            operation,
+            note_text,
+            locks=dashboard._document_locks,
+        )
+        with self._bulk_updates_lock:
+            finished = [
+                update_id
+                for update_id, update in self._bulk_updates.items()
+                if update.finished
+            ]
+            running = len(self._bulk_updates) - len(finished)
+            if running >= _MAX_RUNNING_BULK_UPDATES:
+                return None
+            # Forget the oldest finished updates.
+            for update_id in finished[: max(len(finished) - _MAX_BULK_UPDATES + 1, 0)]:
+                del self._bulk_updates[update_id]
+            self._bulk_updates[bulk_update.id] = bulk_update
+
+        def on_finished():
+            dashboard._update_job_cache(*jobids)
+
+        threading.Thread(
+            target=bulk_update.run,
+            args=(self.bulk_workers, self.bulk_batch_size, on_finished),
+            name=f"notes-bulk-update-{bulk_update.id}",
+            daemon=True,
+        ).start()
+        return bulk_update
+
     def register(self, dashboard):
         # Register routes
         @dashboard.app.route("/module/notes/update", methods=["POST"])
@@ -58,9 +204,65 @@ class Notes(Module):
             note_text = request.form.get("note_text")
             jobid = request.form.get("jobid")
             job = dashboard.project.open_job(id=jobid)
-            job.document[self.key] = note_text
+            with dashboard._document_locks.hold(job.id):
+                job.document[self.key] = note_text
+            dashboard._update_job_cache(job)
             return "Saved."
 
+        @dashboard.app.route("/module/notes/bulk", methods=["GET", "POST"])
+        @flask_login.login_required
+        def notes_bulk():
+            g.active_page = "jobs"
+            g.query = request.values.get("q") or None
+            jobids_text = request.values.get("jobids", "")
+            if request.method == "GET":
+                return render_template(
+                    "notes/bulk.html",
+                    query=g.query,
+                    jobids=jobids_text,
+                    operations=self._bulk_operations,
+                )
+
+            operation = request.form.get("operation", "append")
+            if operation not in self._bulk_operations:
+                return f"Unknown operation '{escape(operation)}'.", 422
+            note_text = request.form.get("note_text", "")
+            jobids = re.split(r"[\s,]+", jobids_text.strip())
+            jobids = [jobid for jobid in jobids if jobid]
+            if g.query is not None:
+                try:
+                    jobs = dashboard._job_search(g.query)
+                except Exception as error:
+                    return f"Invalid query: {escape(error)}", 422
+                jobids.extend(job.id for job in jobs)
+            jobids = list(dict.fromkeys(jobids))
+            if not jobids:
+                return "No jobs selected.", 422
+
+            bulk_update = self._start_bulk_update(
+                dashboard, jobids, operation, note_text
+            )
+            if bulk_update is None:
+                return (
+                    "Too many bulk updates are running, please retry later.",
+                    503,
+                    {"Retry-After": str(dashboard.config["RETRY_AFTER"])},
+                )
+            return (
+                jsonify(bulk_update.status()),
+                202,
+                {"Location": url_for("notes_bulk_status", update_id=bulk_update.id)},
+            )
+
+        @dashboard.app.route("/module/notes/bulk/<update_id>")
+        @flask_login.login_required
+        def notes_bulk_status(update_id):
+            with self._bulk_updates_lock:
+                bulk_update = self._bulk_updates.get(update_id)
+            if bulk_update is None:
+                abort(404, "The requested bulk update does not exist.")
+            return jsonify(bulk_update.status())
+
         @dashboard.app.route("/module/notes/<path:filename>")
         @flask_login.login_required
         def notes_asset(filename):
@@ -3,6 +3,7 @@
 # This software is licensed under the BSD 3-Clause License.
 from flask import render_template
 
+from signac_dashboard.index import detect_schema
 from signac_dashboard.module import Module
 from signac_dashboard.util import escape_truncated_values
 
@@ -45,11 +46,27 @@ class Schema(Module):
         self.max_chars = max_chars
         self.exclude_const = exclude_const
         self.subset = subset
+        self._dashboard = None
+
+    def register(self, dashboard):
+        self._dashboard = dashboard
 
     def get_cards(self, project):
-        schema = project.detect_schema(
-            exclude_const=self.exclude_const, subset=self.subset
-        )
+        if self._dashboard is None:
+            schema = project.detect_schema(
+                exclude_const=self.exclude_const, subset=self.subset
+            )
+        elif self.subset is None:
+            # The dashboard caches the full schema until update_cache is called
+            schema = self._dashboard._detect_schema(exclude_const=self.exclude_const)
+        else:
+            schema = detect_schema(
+                project,
+                exclude_const=self.exclude_const,
+                subset=self.subset,
+                workers=self._dashboard.config["INDEX_WORKERS"],
+                executor=self._dashboard.config["INDEX_EXECUTOR"],
+            )
         schema = dict(schema.items())
 
         # We manually escape the schema contents since the field is marked
@@ -1,6 +1,12 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
 from flask import render_template
 from markupsafe import Markup
 
@@ -13,6 +19,28 @@ try:
 except ImportError:
     MARKDOWN = False
 
+# Maximum number of rendered Markdown messages and memoized messages cached.
+_MAX_CACHED_MESSAGES = 4096
+
+_markdown_cache: "OrderedDict[str, Markup]" = OrderedDict()
+_markdown_lock = threading.Lock()
+
+
+def _render_markdown(msg):
+    """Render Markdown, caching the result by a hash of the text."""
+    digest = hashlib.sha256(msg.encode()).hexdigest()
+    with _markdown_lock:
+        html = _markdown_cache.get(digest)
+        if html is not None:
+            _markdown_cache.move_to_end(digest)
+            return html
+    html = Markup(markdown.markdown(msg, extensions=["markdown.extensions.attr_list"]))
+    with _markdown_lock:
+        _markdown_cache[digest] = html
+        while len(_markdown_cache) > _MAX_CACHED_MESSAGES:
+            _markdown_cache.popitem(last=False)
+    return html
+
 
 class TextDisplay(Module):
     """Render custom text or Markdown in a card.
@@ -30,6 +58,13 @@ class TextDisplay(Module):
 
         modules = [TextDisplay(message=my_text)]
 
+    Messages that are expensive to compute can be memoized, e.g. until a
+    trajectory file changes:
+
+    .. code-block:: python
+
+        TextDisplay(message=summarize, cache=True, depends_on=["dump.gsd"])
+
     :param context: Supports :code:`'JobContext'` and :code:`'ProjectContext'`.
     :type context: str
     :param message: A callable accepting one argument of type
@@ -37,7 +72,21 @@ class TextDisplay(Module):
         and returning text or Markdown content.
     :type message: callable
     :param markdown: Enables Markdown rendering if True (default: :code:`False`).
+        Rendered Markdown is cached by the text of the message.
     :type markdown: bool
+    :param cache: Memoize the message of each job or project if True
+        (default: :code:`False`). The memoized message is recomputed when the
+        result of :code:`depends_on` changes or after :code:`ttl` seconds.
+    :type cache: bool
+    :param depends_on: Either a callable accepting the job or project and
+        returning a hashable value that changes whenever the message should be
+        recomputed, or a list of filenames in the job or project directory
+        whose modification times are used (default: :code:`None`, the message
+        only expires after :code:`ttl` seconds).
+    :type depends_on: callable or list
+    :param ttl: Seconds after which a memoized message is recomputed
+        (default: :code:`None`, no expiry).
+    :type ttl: float
     """
 
     _supported_contexts = {"JobContext", "ProjectContext"}
@@ -48,6 +97,9 @@ class TextDisplay(Module):
         context="JobContext",
         message=lambda job_or_project: "No message provided.",
         markdown=False,
+        cache=False,
+        depends_on=None,
+        ttl=None,
         **kwargs,
     ):
         super().__init__(
@@ -58,14 +110,53 @@ class TextDisplay(Module):
         )
         self.message = message
         self.markdown = markdown
+        self.cache = cache
+        self.depends_on = depends_on
+        self.ttl = ttl
+        self._messages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _dependency_key(self, job_or_project):
+        if self.depends_on is None:
+            return None
+        if callable(self.depends_on):
+            return self.depends_on(job_or_project)
+        key = []
+        for filename in self.depends_on:
+            try:
+                key.append(os.stat(job_or_project.fn(filename)).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _get_message(self, job_or_project):
+        if not self.cache:
+            return self.message(job_or_project)
+
+        cache_key = getattr(job_or_project, "id", None)
+        dependency_key = self._dependency_key(job_or_project)
+        with self._lock:
+            cached = self._messages.get(cache_key)
+        if (
+            cached is not None
+            and cached[0] == dependency_key
+            and (self.ttl is None or time.monotonic() - cached[1] < self.ttl)
+        ):
+            return cached[2]
 
-    def get_cards(self, job_or_project):
         msg = self.message(job_or_project)
+        with self._lock:
+            self._messages[cache_key] = (dependency_key, time.monotonic(), msg)
+            self._messages.move_to_end(cache_key)
+            while len(self._messages) > _MAX_CACHED_MESSAGES:
+                self._messages.popitem(last=False)
+        return msg
+
+    def get_cards(self, job_or_project):
+        msg = self._get_message(job_or_project)
         if self.markdown:
             if MARKDOWN:
-                msg = Markup(
-                    markdown.markdown(msg, extensions=["markdown.extensions.attr_list"])
-                )
+                msg = _render_markdown(msg)
             else:
                 msg = "Error: Install the 'markdown' library to render Markdown."
         return [{"name": self.name, "content": render_template(self.template, msg=msg)}]
@@ -0,0 +1,353 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import csv
+import itertools
+from contextlib import contextmanager
+
+import flask_login
+from flask import abort, jsonify, render_template, request
+
+from signac_dashboard.arrays import (
+    FileCache,
+    MinMaxDownsampler,
+    is_numeric,
+    lttb,
+    open_arrays,
+    required_library,
+    svg_points,
+)
+from signac_dashboard.listing import glob_files
+from signac_dashboard.module import Module
+
+try:
+    import numpy as np
+except ImportError:
+    # Files are only read if required_library() found numpy.
+    np = None
+
+# Number of rows read at once.
+_CHUNK_SIZE = 65536
+
+# Number of bytes read at once when counting the rows of a CSV file.
+_BLOCK_SIZE = 1 << 20
+
+# Size of the SVG view box of a plot.
+_PLOT_HEIGHT = 150
+
+
+def _parse_floats(values):
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        # Parse values one by one only if some are not numbers.
+        parsed = np.full(len(values), np.nan)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                pass
+        return parsed
+
+
+class _CSVTable:
+    """Columns of a CSV file with a header row, read row by row."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, newline="") as file:
+            self.columns = next(csv.reader(file), [])
+
+    def length(self, names):
+        rows = 0
+        last = b"\n"
+        with open(self.path, "rb") as file:
+            while block := file.read(_BLOCK_SIZE):
+                rows += block.count(b"\n")
+                last = block[-1:]
+        # The header is not a row, and the last line may lack a newline.
+        return max(rows - 1 + (last != b"\n"), 0)
+
+    def chunks(self, names):
+        indices = [self.columns.index(name) for name in names]
+        with open(self.path, newline="") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            while rows := list(itertools.islice(reader, _CHUNK_SIZE)):
+                yield [
+                    _parse_floats([row[i] if i < len(row) else "" for row in rows])
+                    for i in indices
+                ]
+
+
+class _ArrayTable:
+    """Columns of memory-mapped NumPy arrays or lazily read HDF5 datasets.
+
+    The columns of a one-dimensional array are its fields, or the array
+    itself, named :code:`'0'`. The columns of a two-dimensional array are its
+    columns, named by their index. The columns of an HDF5 file are its
+    one-dimensional numeric datasets.
+    """
+
+    def __init__(self, arrays):
+        self._columns = {}
+        for name, array in arrays:
+            if array.ndim == 1 and array.dtype.names:
+                for field in array.dtype.names:
+                    self._add(field, array, field)
+            elif array.ndim == 1 and not name:
+                self._add("0", array)
+            elif array.ndim == 1:
+                self._add(name, array)
+            elif array.ndim == 2 and not name:
+                for column in range(array.shape[1]):
+                    self._add(str(column), array, (slice(None), column))
+        self.columns = list(self._columns)
+
+    def _add(self, name, array, key=None):
+        dtype = array.dtype.fields[key][0] if isinstance(key, str) else array.dtype
+        if is_numeric(dtype):
+            self._columns[name] = (array, key)
+
+    def _read(self, name, start, stop):
+        array, key = self._columns[name]
+        rows = slice(start, stop)
+        if key is None:
+            return array[rows]
+        if isinstance(key, str):
+            return array[rows][key]
+        return array[(rows,) + key[1:]]
+
+    def length(self, names):
+        lengths = {len(self._columns[name][0]) for name in names}
+        if len(lengths) > 1:
+            raise ValueError("The columns have different lengths.")
+        return lengths.pop() if lengths else 0
+
+    def chunks(self, names):
+        for start in range(0, self.length(names), _CHUNK_SIZE):
+            yield [self._read(name, start, start + _CHUNK_SIZE) for name in names]
+
+
+@contextmanager
+def _open_table(path):
+    if path.lower().endswith(".csv"):
+        yield _CSVTable(path)
+        return
+    with open_arrays(path) as (arrays, _):
+        yield _ArrayTable(arrays)
+
+
+class TimeSeries(Module):
+    """Plots columns of large time series downsampled on the server.
+
+    Each column of a matching file yields a card with a line plot of the
+    column, versus the column :code:`x` or the row number. Supported files
+    are CSV files with a header row, NumPy :code:`.npy` files, whose columns
+    are the fields or columns of a one- or two-dimensional array, and HDF5
+    files, including the job data in :code:`signac_data.h5`, whose columns
+    are the one-dimensional numeric datasets.
+
+    Files are read in chunks of rows, CSV files as a stream and arrays
+    memory-mapped or lazily from HDF5, so that only one chunk is held in
+    memory. Each series is reduced to the minimum and maximum of
+    :code:`2 * points` buckets of rows while it is read, and then to
+    :code:`points` points with the Largest-Triangle-Three-Buckets algorithm
+    (:code:`method='lttb'`), or to the minimum and maximum of
+    :code:`points / 2` buckets (:code:`method='minmax'`). The downsampled
+    series are cached until the modification time of the file changes.
+
+    The downsampled series of a column is also available as JSON from
+    :code:`/module/time_series/<module>/<jobid>/<filename>?column=<column>`,
+    with an optional :code:`points` argument up to :code:`max_points`. This
+    module requires the :code:`numpy` library, and the :code:`h5py` library
+    for HDF5 files.
+
+    :Example:
+
+    .. code-block:: python
+
+        from signac_dashboard.modules import TimeSeries
+        ts_mod = TimeSeries(filenames=['thermo.csv'], x='step',
+                            columns=['energy', 'pressure'])
+
+    :param context: Supports :code:`'JobContext'`.
+    :type context: str
+    :param filenames: Glob expressions or exact filenames, relative to the
+        job directory, of the time series (default:
+        :code:`['*.csv', '*.npy']`).
+    :type filenames: list
+    :param x: Column of the horizontal axis, or :code:`None` to plot versus
+        the row number (default: :code:`None`).
+    :type x: str
+    :param columns: Columns to plot, or :code:`None` for all columns except
+        :code:`x` (default: :code:`None`).
+    :type columns: list
+    :param points: Number of points of each plot, about the width of the
+        plot in pixels (default: 500).
+    :type points: int
+    :param max_points: Maximum number of points requested as JSON
+        (default: 5000).
+    :type max_points: int
+    :param max_columns: Maximum number of columns plotted per file
+        (default: 8).
+    :type max_columns: int
+    :param method: Downsampling algorithm, :code:`'lttb'` or
+        :code:`'minmax'` (default: :code:`'lttb'`).
+    :type method: str
+    """
+
+    _supported_contexts = {"JobContext"}
+
+    def __init__(
+        self,
+        name="Time Series",
+        context="JobContext",
+        template="cards/time_series.html",
+        filenames=("*.csv", "*.npy"),
+        x=None,
+        columns=None,
+        points=500,
+        max_points=5000,
+        max_columns=8,
+        method="lttb",
+        **kwargs,
+    ):
+        super().__init__(
+            name=name,
+            context=context,
+            template=template,
+            **kwargs,
+        )
+        if method not in ("lttb", "minmax"):
+            raise ValueError(f"Unknown downsampling method '{method}'.")
+        self.filenames = filenames
+        self.x = x
+        self.columns = columns
+        self.points = points
+        self.max_points = max_points
+        self.max_columns = max_columns
+        self.method = method
+        self._series = FileCache()
+        self._module_id = None
+
+    def _select_columns(self, available):
+        if self.columns is None:
+            columns = [column for column in available if column != self.x]
+        else:
+            columns = [column for column in self.columns if column in available]
+        return columns[: self.max_columns]
+
+    def _downsample(self, path, columns, points):
+        """Read a file once and downsample the columns to points each."""
+        with _open_table(path) as table:
+            if self.x is not None and self.x not in table.columns:
+                raise ValueError(f"The file has no column '{self.x}'.")
+            if columns is None:
+                columns = self._select_columns(table.columns)
+            names = list(columns) + ([] if self.x is None else [self.x])
+            if not columns:
+                return {}
+            length = table.length(names)
+            buckets = 2 * points if self.method == "lttb" else max(points // 2, 1)
+            samplers = [MinMaxDownsampler(length, buckets) for _ in columns]
+            offset = 0
+            for chunk in table.chunks(names):
+                rows = len(chunk[0])
+                x = np.arange(offset, offset + rows) if self.x is None else chunk[-1]
+                offset += rows
+                for sampler, y in zip(samplers, chunk):
+                    sampler.add(x, y)
+        series = {}
+        for column, sampler in zip(columns, samplers):
+            x, y = sampler.result()
+            if self.method == "lttb":
+                x, y = lttb(x, y, points)
+            series[column] = {"x": x, "y": y, "length": length}
+        return series
+
+    def _get_series(self, job, filename, columns=None, points=None):
+        path = job.fn(filename)
+        points = self.points if points is None else points
+        key = (None if columns is None else tuple(columns), points)
+        return self._series.get_or_compute(
+            path, lambda: self._downsample(path, columns, points), key
+        )
+
+    def get_cards(self, job):
+        for filename in glob_files(job.fn(""), self.filenames):
+            library = required_library(job.fn(filename))
+            if library is not None:
+                error = f"Install the '{library}' library to plot time series."
+                series = {None: {"error": error}}
+            else:
+                try:
+                    series = self._get_series(job, filename)
+                except (OSError, ValueError, UnicodeDecodeError, csv.Error) as error:
+                    series = {None: {"error": f"The file could not be read: {error}"}}
+            for column, data in series.items():
+                context = {"filename": filename, "column": column, "x_label": self.x}
+                if "error" in data:
+                    context["error"] = data["error"]
+                elif len(data["y"]):
+                    context.update(
+                        points=svg_points(
+                            data["x"], data["y"], self.points, _PLOT_HEIGHT
+                        ),
+                        width=self.points,
+                        height=_PLOT_HEIGHT,
+                        length=data["length"],
+                        shown=len(data["y"]),
+                        x_range=(data["x"].min(), data["x"].max()),
+                        y_range=(data["y"].min(), data["y"].max()),
+                    )
+                yield {
+                    "name": f"{self.name}: {filename}"
+                    + ("" if column is None else f": {column}"),
+                    "content": render_template(self.template, **context),
+                }
+
+    def _series_json(self, job, filename):
+        path = job.fn(filename)
+        if filename not in glob_files(job.fn(""), self.filenames):
+            abort(404, "The file requested does not exist.")
+        if required_library(path) is not None:
+            abort(404, "The file requested cannot be read.")
+        column = request.args.get("column", "")
+        points = request.args.get("points", self.points, type=int)
+        points = min(max(points, 3), self.max_points)
+        try:
+            series = self._get_series(job, filename, [column], points)
+            data = series[column]
+        except (OSError, ValueError, KeyError, UnicodeDecodeError, csv.Error):
+            abort(404, "The column requested could not be read.")
+        return jsonify(
+            column=column,
+            length=data["length"],
+            x=data["x"].tolist(),
+            y=data["y"].tolist(),
+        )
+
+    def register(self, dashboard):
+        # All TimeSeries modules of a dashboard share their routes.
+        modules = dashboard.app.extensions.get("time_series")
+        if modules is None:
+            modules = dashboard.app.extensions["time_series"] = []
+            self._register_routes(dashboard, modules)
+        self._module_id = len(modules)
+        modules.append(self)
+
+    @staticmethod
+    def _register_routes(dashboard, modules):
+        @dashboard.app.route(
+            "/module/time_series/<int:module_id>/<jobid>/<path:filename>"
+        )
+        @flask_login.login_required
+        def time_series_data(module_id, jobid, filename):
+            if module_id >= len(modules):
+                abort(404, "The module requested does not exist.")
+            try:
+                job = dashboard.project.open_job(id=jobid)
+            except KeyError:
+                abort(404, "The job id requested could not be found.")
+            return modules[module_id]._series_json(job, filename)
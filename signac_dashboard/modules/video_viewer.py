@@ -1,12 +1,9 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
-import glob
-import itertools
-import os
-
 from flask import render_template
 
+from signac_dashboard.listing import glob_files
 from signac_dashboard.module import Module
 
 
@@ -43,8 +40,8 @@ class VideoViewer(Module):
     :param context: Supports :code:`'JobContext'` and :code:`'ProjectContext'`.
     :type context: str
     :param video_globs: A list of glob expressions or exact filenames,
-        relative to the job or project directory, to be displayed
-        (default: :code:`['*.mp4', '*.m4v']`).
+        relative to the job or project directory, to be displayed. Recursive
+        :code:`**` patterns are supported (default: :code:`['*.mp4', '*.m4v']`).
     :type video_globs: list
     :param preload: Option for preloading videos, one of :code:`'auto'`,
         :code:`'metadata'`, or :code:`'none'` (default: :code:`'none'`).
@@ -87,33 +84,26 @@ class VideoViewer(Module):
         elif self.context == "ProjectContext":
             jobid = None
 
+        root = job_or_project.fn("")
+        video_files = glob_files(root, self.video_globs, sort_key=self.sort_key)
+        if not video_files:
+            return
+        # The poster is resolved from the same cached listings as the videos.
+        poster = (
+            self.poster if self.poster and glob_files(root, [self.poster]) else None
+        )
+
         def make_card(filename):
-            if not job_or_project.isfile(filename):
-                raise FileNotFoundError(
-                    "The filename {} could not be found "
-                    "for {}.".format(
-                        filename, "the project" if jobid is None else f"job {jobid}"
-                    )
-                )
             return {
                 "name": self.name + ": " + filename,
                 "content": render_template(
                     self.template,
                     jobid=jobid,
-                    poster=(
-                        self.poster
-                        if self.poster and job_or_project.isfile(self.poster)
-                        else None
-                    ),
+                    poster=poster,
                     preload=self.preload,
                     filename=filename,
                 ),
             }
 
-        video_globs = [
-            glob.iglob(job_or_project.fn(video_glob)) for video_glob in self.video_globs
-        ]
-        video_files = itertools.chain(*video_globs)
-        video_files = sorted(video_files, key=self.sort_key)
-        for filepath in video_files:
-            yield make_card(os.path.relpath(filepath, job_or_project.fn("")))
+        for filename in video_files:
+            yield make_card(filename)
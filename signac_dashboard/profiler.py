@@ -0,0 +1,227 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import cProfile
+import heapq
+import itertools
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import NamedTuple
+
+from werkzeug.exceptions import HTTPException
+
+
+class ProfileRecord(NamedTuple):
+    """A profiled request."""
+
+    method: str
+    route: str
+    path: str
+    status: str
+    seconds: float
+    timestamp: float
+    filename: str
+
+
+@lru_cache(maxsize=256)
+def _top_functions(path, count):
+    stats = pstats.Stats(path)
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    return tuple(
+        {
+            "function": pstats.func_std_string(function),
+            "calls": (
+                primitive_calls
+                if primitive_calls == calls
+                else f"{calls}/{primitive_calls}"
+            ),
+            "total": total_time,
+            "cumulative": cumulative_time,
+        }
+        for function, (
+            primitive_calls,
+            calls,
+            total_time,
+            cumulative_time,
+            _,
+        ) in entries[:count]
+    )
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9.-]+", "_", text).strip("_") or "root"
+
+
+class _ResumedResponse:
+    """Response iterable continuing after the chunks consumed while profiling."""
+
+    def __init__(self, first, iterator, app_iter):
+        self._first = first
+        self._iterator = iterator
+        self._app_iter = app_iter
+
+    def __iter__(self):
+        yield from self._first
+        yield from self._iterator
+
+    def close(self):
+        if hasattr(self._app_iter, "close"):
+            self._app_iter.close()
+
+
+class Profiler:
+    """WSGI middleware profiling a sample of requests with :py:mod:`cProfile`.
+
+    The profile of each sampled request is written to a :code:`.prof` file in
+    a subdirectory of :code:`profile_dir` named after the request method and
+    route, which can be inspected with :py:mod:`pstats` or tools like
+    ``snakeviz``. The slowest profiled requests are kept in memory for the
+    :code:`/profiles` page, and the files of other requests are deleted, so
+    that at most :code:`max_records` files are kept.
+
+    A request is profiled until the first chunk of its response is
+    generated, so that streamed responses, such as downloads and exports,
+    are neither buffered nor profiled while they are sent. Only one request
+    is profiled at a time. Requests arriving while another request is being
+    profiled, and requests for server-sent event streams, are served without
+    profiling.
+
+    :param app: The WSGI application to profile.
+    :type app: callable
+    :param url_map: URL map used to determine the route of a request.
+    :type url_map: :py:class:`werkzeug.routing.Map`
+    :param profile_dir: Directory to write profiles to.
+    :type profile_dir: str
+    :param sample_rate: Fraction of requests to profile (default: 0.1).
+    :type sample_rate: float
+    :param max_records: Number of slowest requests to keep (default: 100).
+    :type max_records: int
+    """
+
+    def __init__(self, app, url_map, profile_dir, sample_rate=0.1, max_records=100):
+        self.app = app
+        self.url_map = url_map
+        self.profile_dir = profile_dir
+        self.sample_rate = sample_rate
+        self.max_records = max_records
+        self._records = []
+        self._counter = itertools.count()
+        self._profiling = threading.Lock()
+        self._records_lock = threading.Lock()
+        os.makedirs(profile_dir, exist_ok=True)
+
+    def _route(self, environ):
+        try:
+            rule, _ = self.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            return "<unmatched>"
+        return rule.rule
+
+    def __call__(self, environ, start_response):
+        if random.random() >= self.sample_rate:
+            return self.app(environ, start_response)
+        if "text/event-stream" in environ.get("HTTP_ACCEPT", ""):
+            # Event streams stay open and their profiles are meaningless.
+            return self.app(environ, start_response)
+        if not self._profiling.acquire(blocking=False):
+            return self.app(environ, start_response)
+        try:
+            status = []
+
+            def catching_start_response(response_status, headers, exc_info=None):
+                status.append(response_status)
+                return start_response(response_status, headers, exc_info)
+
+            def run_app():
+                app_iter = self.app(environ, catching_start_response)
+                iterator = iter(app_iter)
+                try:
+                    first = [next(iterator)]
+                except StopIteration:
+                    first = []
+                except BaseException:
+                    if hasattr(app_iter, "close"):
+                        app_iter.close()
+                    raise
+                return _ResumedResponse(first, iterator, app_iter)
+
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            response = profile.runcall(run_app)
+            seconds = time.perf_counter() - start
+            self._save(environ, profile, seconds, status[0] if status else "")
+        finally:
+            self._profiling.release()
+        return response
+
+    def _save(self, environ, profile, seconds, status):
+        with self._records_lock:
+            if (
+                len(self._records) >= self.max_records
+                and self._records
+                and seconds <= self._records[0][0]
+            ):
+                # The request is faster than all kept requests.
+                return
+        method = environ.get("REQUEST_METHOD", "GET")
+        route = self._route(environ)
+        path = environ.get("PATH_INFO", "")
+        if environ.get("QUERY_STRING"):
+            path += "?" + environ["QUERY_STRING"]
+        timestamp = time.time()
+        filename = os.path.join(
+            _slug(f"{method}_{route}"),
+            f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(timestamp))}"
+            f"-{1000 * seconds:.0f}ms-{next(self._counter)}.prof",
+        )
+        os.makedirs(
+            os.path.join(self.profile_dir, os.path.dirname(filename)), exist_ok=True
+        )
+        profile.dump_stats(os.path.join(self.profile_dir, filename))
+
+        record = ProfileRecord(
+            method, route, path, status, seconds, timestamp, filename
+        )
+        with self._records_lock:
+            entry = (seconds, next(self._counter), record)
+            if len(self._records) < self.max_records:
+                heapq.heappush(self._records, entry)
+                return
+            evicted = heapq.heappushpop(self._records, entry)
+        try:
+            os.remove(os.path.join(self.profile_dir, evicted[2].filename))
+        except OSError:
+            pass
+
+    def records(self):
+        """Return the slowest profiled requests, slowest first.
+
+        :rtype: list of :py:class:`ProfileRecord`
+        """
+        with self._records_lock:
+            entries = sorted(self._records, reverse=True)
+        return [record for _, _, record in entries]
+
+    def top_functions(self, record, count=10):
+        """Return the functions with the highest cumulative time in a profile.
+
+        :param record: The profiled request.
+        :type record: :py:class:`ProfileRecord`
+        :param count: Number of functions to return (default: 10).
+        :type count: int
+        :returns: Dictionaries with the keys :code:`'function'`,
+            :code:`'calls'`, :code:`'total'`, and :code:`'cumulative'`, or
+            none if the profile was deleted in the meantime.
+        :rtype: tuple of dict
+        """
+        try:
+            return _top_functions(
+                os.path.join(self.profile_dir, record.filename), count
+            )
+        except OSError:
+            return ()
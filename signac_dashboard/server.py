@@ -0,0 +1,346 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Serve a dashboard from multiple processes without a separate WSGI server.
+
+The parent process loads the project and fills the dashboard caches, binds
+the listening socket, and then forks the worker processes, so that the
+preloaded data is shared copy-on-write between the workers. Each worker
+handles requests on a fixed pool of threads. The parent runs the only
+watcher of the workspace and sends its change events to the workers, one JSON
+object per line, or an empty line for other changes. The workers publish the
+events and invalidate their caches after receiving messages.
+"""
+
+import gc
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from .events import workspace_events
+
+logger = logging.getLogger(__name__)
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # Close connections after each response, so that idle keep-alive
+    # connections do not occupy the threads of the pool.
+    protocol_version = "HTTP/1.0"
+
+
+class _PooledWSGIServer(BaseWSGIServer):
+    """WSGI server handling requests on a fixed pool of threads.
+
+    At most :code:`backlog` accepted connections wait for a free thread.
+    Further connections are answered immediately with the status 503, so
+    that the queue of the pool stays bounded when all threads are busy. The
+    optional :code:`on_stop` callback is called before waiting for the
+    threads of the pool on shutdown, e.g. to end long-lived responses.
+    """
+
+    multithread = True
+
+    def __init__(
+        self, host, port, app, threads=8, backlog=None, retry_after=5, on_stop=None
+    ):
+        super().__init__(host, port, app, handler=_RequestHandler)
+        self.threads = threads
+        self.backlog = threads if backlog is None else backlog
+        self.retry_after = retry_after
+        self.on_stop = on_stop
+        self._pool = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def serve_forever(self, poll_interval=0.5):
+        with ThreadPoolExecutor(
+            max_workers=self.threads, thread_name_prefix="dashboard-request"
+        ) as pool:
+            self._pool = pool
+            try:
+                super().serve_forever(poll_interval)
+            finally:
+                self._pool = None
+                if self.on_stop is not None:
+                    self.on_stop()
+
+    def process_request(self, request, client_address):
+        with self._pending_lock:
+            saturated = self._pending >= self.threads + self.backlog
+            if not saturated:
+                self._pending += 1
+        if saturated:
+            self._reject(request)
+            return
+        self._pool.submit(self._process_request_thread, request, client_address)
+
+    def _reject(self, request):
+        try:
+            request.settimeout(1)
+            request.sendall(
+                b"HTTP/1.0 503 Service Unavailable\r\n"
+                + f"Retry-After: {self.retry_after}\r\n".encode()
+                + b"Content-Length: 0\r\nConnection: close\r\n\r\n"
+            )
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def _process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._pending_lock:
+                self._pending -= 1
+
+
+class _WorkerNotifier(FileSystemEventHandler):
+    def __init__(self, server, workspace):
+        self.server = server
+        self.workspace = os.path.realpath(workspace)
+
+    def on_any_event(self, event):
+        for change in workspace_events(event, self.workspace):
+            self.server._notify_workers(json.dumps(change).encode() + b"\n")
+
+    def on_modified(self, event):
+        if os.path.realpath(event.src_path) == self.workspace:
+            self.server._notify_workers(b"\n")
+
+
+def _raise_system_exit(signum, frame):
+    sys.exit(0)
+
+
+class PreforkServer:
+    """Serve a dashboard from preforked worker processes.
+
+    Workers that exit unexpectedly are replaced. The server stops all
+    workers when it receives :code:`SIGINT` or :code:`SIGTERM`. On platforms
+    without :py:func:`os.fork`, or with a single worker, requests are served
+    from the current process.
+
+    :param dashboard: The dashboard to serve.
+    :type dashboard: :py:class:`~.Dashboard`
+    :param host: Binding address.
+    :type host: str
+    :param port: Port to listen on, or 0 for a free port.
+    :type port: int
+    :param workers: Number of worker processes (default: 2).
+    :type workers: int
+    :param threads: Number of request threads per worker (default: 8).
+    :type threads: int
+    :param backlog: Number of connections per worker that wait for a free
+        thread before further connections are rejected with the status 503
+        (default: :code:`None`, the number of threads).
+    :type backlog: int
+    :param retry_after: Seconds sent in the :code:`Retry-After` header of
+        rejected connections (default: 5).
+    :type retry_after: int
+    :param on_stop: Function called when a worker stops, before it waits for
+        the requests in progress, e.g. to close event streams (default:
+        :code:`None`).
+    :type on_stop: callable
+    """
+
+    def __init__(
+        self,
+        dashboard,
+        host,
+        port,
+        workers=2,
+        threads=8,
+        backlog=None,
+        retry_after=5,
+        on_stop=None,
+    ):
+        self.dashboard = dashboard
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.backlog = backlog
+        self.retry_after = retry_after
+        self.on_stop = on_stop
+        self._server = None
+        self._notify_fds = {}
+        self._lock = threading.Lock()
+
+    def serve(self):
+        """Preload the dashboard, start the workers, and wait until stopped."""
+        self._preload()
+        self._server = _PooledWSGIServer(
+            self.host,
+            self.port,
+            self.dashboard,
+            threads=self.threads,
+            backlog=self.backlog,
+            retry_after=self.retry_after,
+            on_stop=self.on_stop,
+        )
+        self.port = self._server.port
+        logger.info(
+            f"Serving on http://{self.host}:{self.port}/ with {self.workers} "
+            f"worker(s) and {self.threads} thread(s) each."
+        )
+        try:
+            if self.workers > 1 and not hasattr(os, "fork"):
+                logger.warning("Worker processes require os.fork, using one process.")
+            if self.workers <= 1 or not hasattr(os, "fork"):
+                self._serve_in_process()
+            else:
+                self._serve_workers()
+        finally:
+            self._server.server_close()
+
+    def _preload(self):
+        dashboard = self.dashboard
+        if dashboard._cache_warmer is not None:
+            dashboard._cache_warmer.wait()
+        else:
+            dashboard._warm_caches()
+
+    def _serve_in_process(self):
+        observer = self.dashboard.observer
+        observer.start()
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _serve_workers(self):
+        # Accepting from a non-blocking socket lets a worker return to its
+        # event loop when another worker accepted the same connection.
+        self._server.socket.setblocking(False)
+        # Keep the garbage collector from touching, and thereby copying, the
+        # preloaded objects in the workers.
+        gc.freeze()
+        previous_handler = signal.signal(signal.SIGTERM, _raise_system_exit)
+        observer = None
+        try:
+            for _ in range(self.workers):
+                self._spawn(reload=False)
+            observer = Observer()
+            observer.schedule(
+                _WorkerNotifier(self, self.dashboard.project.workspace),
+                self.dashboard.project.workspace,
+            )
+            observer.start()
+            while True:
+                pid, status = os.wait()
+                with self._lock:
+                    fd = self._notify_fds.pop(pid, None)
+                if fd is not None:
+                    os.close(fd)
+                    logger.warning(
+                        f"Worker {pid} exited with status {status}, restarting."
+                    )
+                    self._spawn(reload=True)
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self._stop_workers()
+            signal.signal(signal.SIGTERM, previous_handler)
+            gc.unfreeze()
+
+    def _spawn(self, reload):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                os.close(write_fd)
+                for fd in self._notify_fds.values():
+                    os.close(fd)
+                self._run_worker(read_fd, reload)
+            except BaseException:
+                logger.exception("Worker failed.")
+                status = 1
+            finally:
+                os._exit(status)
+        os.close(read_fd)
+        os.set_blocking(write_fd, False)
+        with self._lock:
+            self._notify_fds[pid] = write_fd
+
+    def _run_worker(self, notify_fd, reload):
+        signal.signal(signal.SIGTERM, _raise_system_exit)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        dashboard = self.dashboard
+        dashboard._after_fork()
+        if reload:
+            # The project may have changed since it was preloaded.
+            dashboard._update_cache(cause="watcher")
+        threading.Thread(
+            target=self._listen, args=(notify_fd,), name="watcher", daemon=True
+        ).start()
+        try:
+            self._server.serve_forever()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+
+    def _listen(self, notify_fd):
+        buffer = b""
+        while True:
+            try:
+                data = os.read(notify_fd, 4096)
+            except OSError:
+                data = b""
+            if not data:
+                # The parent process exited.
+                os.kill(os.getpid(), signal.SIGTERM)
+                return
+            *lines, buffer = (buffer + data).split(b"\n")
+            for line in lines:
+                if line:
+                    self.dashboard.events.publish(json.loads(line))
+            self.dashboard._update_cache(cause="watcher")
+
+    def _notify_workers(self, message):
+        # Messages are shorter than PIPE_BUF, so they are written completely
+        # or not at all.
+        with self._lock:
+            for fd in self._notify_fds.values():
+                try:
+                    os.write(fd, message)
+                except BlockingIOError:
+                    # The pipe is full, the worker invalidates its caches
+                    # when it reads the pending messages.
+                    pass
+                except OSError:
+                    # The worker exited and is replaced.
+                    pass
+
+    def _stop_workers(self):
+        with self._lock:
+            notify_fds = dict(self._notify_fds)
+            self._notify_fds.clear()
+        for pid in notify_fds:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid, fd in notify_fds.items():
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+            os.close(fd)
@@ -0,0 +1,109 @@
+// Subscribe to server-sent events of the dashboard and update the cards of
+// changed jobs without reloading the page.
+var liveUpdates = {source: null, timers: {}};
+
+function liveUpdatesShowNotice() {
+  if (document.getElementById('live-updates-notice')) {
+    return;
+  }
+  var title = document.querySelector('h1.title');
+  if (!title) {
+    return;
+  }
+  var notice = document.createElement('div');
+  notice.id = 'live-updates-notice';
+  notice.className = 'notification is-info';
+  notice.innerHTML = 'The jobs of the project have changed. ' +
+    '<a href="' + window.location.href + '">Reload</a> to show them.';
+  title.parentNode.appendChild(notice);
+}
+
+function liveUpdatesRefreshJob(jobId) {
+  var url = document.body.dataset.jobCardsUrl.replace('JOBID', jobId);
+  fetch(url, {credentials: 'same-origin'})
+    .then(function(response) {
+      if (!response.ok) {
+        throw new Error(response.statusText);
+      }
+      return response.text();
+    })
+    .then(function(html) {
+      var fragment = document.createElement('div');
+      fragment.innerHTML = html;
+      var cards = document.querySelectorAll('[data-job-id="' + jobId + '"][data-card-key]');
+      var updated = fragment.querySelectorAll('[data-card-key]');
+      if (cards.length !== updated.length) {
+        // Cards were added or removed, which requires a reload.
+        liveUpdatesShowNotice();
+        return;
+      }
+      updated.forEach(function(card) {
+        if (card.querySelector('[data-live-updates="self"]')) {
+          // The card updates itself, e.g. by following a log file.
+          return;
+        }
+        var key = card.dataset.cardKey;
+        var target = document.querySelector(
+          '[data-job-id="' + jobId + '"][data-card-key="' + key + '"] .card-content');
+        if (target) {
+          target.innerHTML = card.innerHTML;
+        }
+      });
+    })
+    .catch(function(error) {
+      console.warn('Could not update the cards of job ' + jobId + ': ' + error);
+    });
+}
+
+function liveUpdatesScheduleRefresh(event) {
+  var jobId = JSON.parse(event.data).job;
+  // Coalesce bursts of changes, e.g. while a file is being written.
+  clearTimeout(liveUpdates.timers[jobId]);
+  liveUpdates.timers[jobId] = setTimeout(function() {
+    delete liveUpdates.timers[jobId];
+    liveUpdatesRefreshJob(jobId);
+  }, 500);
+}
+
+function liveUpdatesStop() {
+  if (liveUpdates.source !== null) {
+    liveUpdates.source.close();
+    liveUpdates.source = null;
+  }
+  Object.keys(liveUpdates.timers).forEach(function(jobId) {
+    clearTimeout(liveUpdates.timers[jobId]);
+  });
+  liveUpdates.timers = {};
+}
+
+$(document).on('turbolinks:load', function() {
+  liveUpdatesStop();
+  var url = document.body.dataset.eventsUrl;
+  if (!url || !window.EventSource) {
+    return;
+  }
+  var jobs = [];
+  document.querySelectorAll('[data-job-id][data-card-key]').forEach(function(card) {
+    if (jobs.indexOf(card.dataset.jobId) === -1) {
+      jobs.push(card.dataset.jobId);
+    }
+  });
+  var isJobList = document.body.hasAttribute('data-job-list');
+  if (jobs.length === 0 && !isJobList) {
+    return;
+  }
+  liveUpdates.source = new EventSource(url + '?jobs=' + jobs.join(','));
+  liveUpdates.source.addEventListener('document_changed', liveUpdatesScheduleRefresh);
+  liveUpdates.source.addEventListener('files_changed', liveUpdatesScheduleRefresh);
+  if (isJobList) {
+    liveUpdates.source.addEventListener('job_added', liveUpdatesShowNotice);
+    liveUpdates.source.addEventListener('job_removed', liveUpdatesShowNotice);
+    liveUpdates.source.addEventListener('resync', liveUpdatesShowNotice);
+  } else {
+    liveUpdates.source.addEventListener('resync', function() {
+      jobs.forEach(liveUpdatesRefreshJob);
+    });
+  }
+});
+
+$(document).on('turbolinks:before-visit', liveUpdatesStop);
@@ -0,0 +1,186 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+"""Generate synthetic signac projects for benchmarks and load tests.
+
+Projects with up to millions of jobs can be generated from the command line:
+
+.. code-block:: bash
+
+    python -m signac_dashboard.synthetic /tmp/project --jobs 100000 --images 1
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import signac
+from signac.job import Job, calc_id
+
+logger = logging.getLogger(__name__)
+
+_KINDS = ("lj", "wca", "gauss", "yukawa")
+_STATUSES = ("pending", "running", "done")
+
+
+def synthetic_statepoint(index):
+    """Return the nested state point of the synthetic job with an index.
+
+    State points contain an integer index, a nested model with a categorical
+    kind and numerical parameters, and a replica number, so that searches
+    can filter on categorical, numerical, and nested keys.
+
+    :param index: Index of the job.
+    :type index: int
+    :rtype: dict
+    """
+    return {
+        "index": index,
+        "model": {
+            "kind": _KINDS[index % len(_KINDS)],
+            "params": {
+                "T": round(0.5 + (index % 10) / 10, 1),
+                "N": 100 * (1 + index % 5),
+            },
+        },
+        "replica": index % 3,
+    }
+
+
+def synthetic_document(index):
+    """Return the document of the synthetic job with an index.
+
+    :param index: Index of the job.
+    :type index: int
+    :rtype: dict
+    """
+    return {
+        "status": _STATUSES[index % len(_STATUSES)],
+        "energy": -round((index % 97) / 7, 4),
+        "notes": f"Synthetic job {index}.",
+        "history": [index % (i + 2) for i in range(10)],
+    }
+
+
+def synthetic_png(width=16, height=16, value=0):
+    """Return the bytes of a grayscale PNG image.
+
+    :param width: Width in pixels (default: 16).
+    :type width: int
+    :param height: Height in pixels (default: 16).
+    :type height: int
+    :param value: Value added to the gradient of the image (default: 0).
+    :type value: int
+    :rtype: bytes
+    """
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    rows = b"".join(
+        b"\x00" + bytes((x + y + value) % 256 for x in range(width))
+        for y in range(height)
+    )
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(rows))
+        + chunk(b"IEND", b"")
+    )
+
+
+def _write_jobs(workspace, indices, images):
+    for index in indices:
+        statepoint = synthetic_statepoint(index)
+        job_dir = os.path.join(workspace, calc_id(statepoint))
+        os.makedirs(job_dir, exist_ok=True)
+        with open(os.path.join(job_dir, Job.FN_STATE_POINT), "w") as file:
+            json.dump(statepoint, file)
+        with open(os.path.join(job_dir, Job.FN_DOCUMENT), "w") as file:
+            json.dump(synthetic_document(index), file)
+        for image in range(images):
+            with open(os.path.join(job_dir, f"image_{image}.png"), "wb") as file:
+                file.write(synthetic_png(value=index + image))
+    return len(indices)
+
+
+def generate_project(root, num_jobs, images=1, workers=None, chunksize=1000):
+    """Create or extend a signac project with synthetic jobs.
+
+    Job directories, state points, documents, and images are written
+    directly to the workspace on a thread pool, which is much faster than
+    initializing jobs through :py:meth:`signac.Project.open_job` for large
+    projects. Jobs that already exist are overwritten with identical data.
+
+    :param root: Project directory.
+    :type root: str
+    :param num_jobs: Number of jobs.
+    :type num_jobs: int
+    :param images: Number of PNG images per job (default: 1).
+    :type images: int
+    :param workers: Number of threads writing jobs (default: :code:`None`,
+        chosen by :py:mod:`concurrent.futures`).
+    :type workers: int
+    :param chunksize: Number of jobs written per task (default: 1000).
+    :type chunksize: int
+    :returns: The project.
+    :rtype: :py:class:`signac.Project`
+    """
+    try:
+        project = signac.get_project(root, search=False)
+    except LookupError:
+        project = signac.init_project(root)
+    os.makedirs(project.workspace, exist_ok=True)
+    chunks = [
+        range(start, min(start + chunksize, num_jobs))
+        for start in range(0, num_jobs, chunksize)
+    ]
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for count in pool.map(
+            lambda indices: _write_jobs(project.workspace, indices, images), chunks
+        ):
+            written += count
+            logger.info(f"Wrote {written}/{num_jobs} synthetic jobs.")
+    return project
+
+
+def builtin_modules():
+    """Return an instance of every built-in module for each supported context.
+
+    :rtype: list of :py:class:`~.Module`
+    """
+    import signac_dashboard.modules
+
+    modules = []
+    for name in signac_dashboard.modules.__all__:
+        module_class = getattr(signac_dashboard.modules, name)
+        for context in sorted(module_class._supported_contexts):
+            modules.append(module_class(context=context))
+    return modules
+
+
+def main(command_args=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic signac project for benchmarks."
+    )
+    parser.add_argument("root", help="Project directory.")
+    parser.add_argument(
+        "-n", "--jobs", type=int, default=1000, help="Number of jobs. Default: 1000"
+    )
+    parser.add_argument(
+        "--images", type=int, default=1, help="Images per job. Default: 1"
+    )
+    parser.add_argument("--workers", type=int, help="Number of writer threads.")
+    args = parser.parse_args(command_args)
+    logging.basicConfig(level=logging.INFO)
+    generate_project(args.root, args.jobs, images=args.images, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
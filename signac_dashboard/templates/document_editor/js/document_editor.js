@@ -15,6 +15,10 @@ $(document).on('turbolinks:load', function() {
     var formdata = {};
     $form.find(':input').each(function(index){
       var name = $(this).attr('name');
+      if (name === undefined) {
+        // Skip read-only fields
+        return;
+      }
       var value = $(this).val();
       formdata[name] = value;
     });
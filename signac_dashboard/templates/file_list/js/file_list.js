@@ -0,0 +1,8 @@
+$(document).on('click', 'a.file-list-page', function(event) {
+  // Load the requested page of files into the card instead of navigating
+  event.preventDefault();
+  var $list = $(this).closest('.file-list');
+  $.get($(this).attr('href'), function(data) {
+    $list.replaceWith(data);
+  });
+});
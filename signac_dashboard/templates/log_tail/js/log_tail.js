@@ -0,0 +1,67 @@
+// All log tails of a page are followed with a single poll. Polls of a
+// previous page stop when a new page is loaded.
+var logTail = {generation: 0};
+
+function logTailShow(element, data) {
+  var pre = element.querySelector('.log-tail-text');
+  var following = pre.scrollTop + pre.clientHeight >= pre.scrollHeight - 5;
+  if (data.reset) {
+    pre.textContent = data.text;
+  } else if (data.text) {
+    pre.textContent += data.text;
+    var lines = pre.textContent.split('\n');
+    var maxLines = parseInt(element.dataset.maxLines, 10);
+    if (lines.length > maxLines) {
+      pre.textContent = lines.slice(lines.length - maxLines).join('\n');
+    }
+  }
+  element.dataset.offset = data.offset;
+  element.dataset.inode = data.inode;
+  if (following) {
+    pre.scrollTop = pre.scrollHeight;
+  }
+}
+
+function logTailPoll(elements, generation) {
+  // Stop following files whose cards were removed from the page
+  elements = elements.filter(function(element) {
+    return !element.logTailStopped && document.body.contains(element);
+  });
+  if (elements.length === 0 || generation !== logTail.generation) {
+    return;
+  }
+  var params = new URLSearchParams();
+  elements.forEach(function(element) {
+    params.append('tail', JSON.stringify([
+      parseInt(element.dataset.moduleId, 10),
+      element.dataset.jobId,
+      element.dataset.filename,
+      parseInt(element.dataset.offset, 10),
+      parseInt(element.dataset.inode, 10)
+    ]));
+  });
+  $.getJSON(elements[0].dataset.url + '?' + params.toString())
+    .done(function(data) {
+      data.tails.forEach(function(tail, i) {
+        if (tail.error) {
+          elements[i].logTailStopped = true;
+        } else {
+          logTailShow(elements[i], tail);
+        }
+      });
+      logTailPoll(elements, generation);
+    })
+    .fail(function() {
+      setTimeout(function() { logTailPoll(elements, generation); }, 5000);
+    });
+}
+
+$(document).on('turbolinks:load', function() {
+  var elements = Array.prototype.slice.call(document.querySelectorAll('.log-tail'));
+  elements.forEach(function(element) {
+    var pre = element.querySelector('.log-tail-text');
+    pre.scrollTop = pre.scrollHeight;
+  });
+  logTail.generation += 1;
+  logTailPoll(elements, logTail.generation);
+});
@@ -28,3 +28,44 @@ $(document).on('turbolinks:load', function() {
     });
   });
 });
+
+$(document).on('turbolinks:load', function() {
+  $('form.notes-bulk-form').submit(function(event) {
+    // Stop form from submitting normally
+    event.preventDefault();
+
+    var $form = $(this);
+    var $progress = $form.find('.notes-bulk-progress');
+    var $result = $form.find('.notes-bulk-result');
+    var $failures = $form.find('.notes-bulk-failures');
+    $failures.empty();
+
+    function showStatus(status) {
+      $progress.attr('max', status.total).val(status.done).prop('hidden', false);
+      $result.text(status.done + ' of ' + status.total + ' jobs updated, ' +
+                   Object.keys(status.failed).length + ' failed.');
+    }
+
+    function poll(url) {
+      $.getJSON(url, function(status) {
+        showStatus(status);
+        if (status.finished) {
+          $.each(status.failed, function(jobid, error) {
+            $failures.append($('<li>').text(jobid + ': ' + error));
+          });
+        } else {
+          setTimeout(function() { poll(url); }, 1000);
+        }
+      });
+    }
+
+    $.post($form.attr('action'), $form.serialize())
+      .done(function(status, textStatus, jqXHR) {
+        showStatus(status);
+        poll(jqXHR.getResponseHeader('Location'));
+      })
+      .fail(function(jqXHR) {
+        $result.text(jqXHR.responseText);
+      });
+  });
+});
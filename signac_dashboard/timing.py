@@ -0,0 +1,83 @@
+# Copyright (c) 2025 The Regents of the University of Michigan
+# All rights reserved.
+# This software is licensed under the BSD 3-Clause License.
+import re
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context
+
+
+def get_timings():
+    """Return the phase timings of the current request.
+
+    :returns: Dictionary mapping phase names to lists of the total duration in
+        seconds and a description, or :code:`None` outside of a request.
+    :rtype: dict
+    """
+    if not has_request_context():
+        return None
+    if "_timings" not in g:
+        g._timings = {}
+    return g._timings
+
+
+def record(name, seconds, description=None):
+    """Add the duration of a phase to the timings of the current request.
+
+    Durations of phases with the same name are summed. Outside of a request,
+    this function does nothing.
+
+    :param name: Name of the phase.
+    :type name: str
+    :param seconds: Duration in seconds.
+    :type seconds: float
+    :param description: Human-readable description (default: :code:`None`).
+    :type description: str
+    """
+    timings = get_timings()
+    if timings is None:
+        return
+    entry = timings.get(name)
+    if entry is None:
+        timings[name] = [seconds, description]
+    else:
+        entry[0] += seconds
+
+
+@contextmanager
+def timed(name, description=None):
+    """Time the enclosed block as a phase of the current request.
+
+    :param name: Name of the phase.
+    :type name: str
+    :param description: Human-readable description (default: :code:`None`).
+    :type description: str
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, description)
+
+
+def module_timing_name(module):
+    """Return the phase name used for a module's :code:`get_cards` calls."""
+    return "module." + re.sub(r"[^A-Za-z0-9_.-]", "_", module.name)
+
+
+def server_timing_header(timings):
+    """Format timings as the value of a ``Server-Timing`` response header.
+
+    :param timings: Timings as returned by :py:func:`get_timings`.
+    :type timings: dict
+    :rtype: str
+    """
+    metrics = []
+    for name, (seconds, description) in timings.items():
+        metric = f"{name};dur={1000 * seconds:.2f}"
+        if description:
+            description = description.replace("\\", "\\\\").replace('"', '\\"')
+            metric += f';desc="{description}"'
+        metrics.append(metric)
+    return ", ".join(metrics)
@@ -1,11 +1,21 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import re
+import threading
+from contextlib import contextmanager
 
 import flask_login
 from markupsafe import escape
 from werkzeug.utils import cached_property, import_string
 
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def is_job_id(name):
+    """Return whether a name is a valid job id."""
+    return _JOB_ID.match(name) is not None
+
 
 def ellipsis_truncate_middle(val, length=60):
     string = str(val)
@@ -33,21 +43,153 @@ def abbr_value(val, max_chars):
         return str(escape(val))
 
 
-def escape_truncated_values(data, max_chars):
-    """Truncate values in a dict to a maximum number of characters."""
-    if max_chars is not None and int(max_chars) > 0:
-        for key in data:
-            if len(str(data[key])) > max_chars:
-                data[key] = (
-                    str(escape(ellipsis_truncate_middle(data[key], length=max_chars)))
-                    + " <em>[Truncated]</em>"
-                )
+def format_size(num_bytes):
+    """Format a number of bytes as a human-readable string."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(num_bytes) < 1024 or unit == "TB":
+            break
+        num_bytes /= 1024
+    if unit == "B":
+        return f"{num_bytes} {unit}"
+    return f"{num_bytes:.1f} {unit}"
+
+
+# Upper bound on the number of characters rendered for any single value, even
+# when truncation is disabled.
+MAX_VALUE_CHARS = 100000
+
+
+def _repr_pieces(value, max_chars, reverse=False, as_str=False):
+    """Generate pieces of repr(value), or of str(value) if as_str is True.
+
+    Lists and dicts are traversed lazily so that callers can stop consuming
+    pieces once enough characters were produced. If reverse is True, the
+    pieces are generated from the end of the representation.
+    """
+    value_type = type(value)
+    if value_type is str:
+        # Only the characters that can still be shown are represented.
+        if len(value) > max_chars:
+            value = value[-max_chars - 1 :] if reverse else value[: max_chars + 1]
+        yield value if as_str else repr(value)
+    elif value_type is list or value_type is dict:
+        if value_type is list:
+            opening, closing = "[", "]"
+            items = reversed(value) if reverse else value
+        else:
+            opening, closing = "{", "}"
+            items = reversed(value.keys()) if reverse else value.keys()
+        yield closing if reverse else opening
+        for i, item in enumerate(items):
+            if i:
+                yield ", "
+            if value_type is list:
+                yield from _repr_pieces(item, max_chars, reverse)
+            elif reverse:
+                yield from _repr_pieces(value[item], max_chars, reverse)
+                yield ": "
+                yield repr(item)
+            else:
+                yield repr(item)
+                yield ": "
+                yield from _repr_pieces(value[item], max_chars, reverse)
+        yield opening if reverse else closing
     else:
-        for key in data:
-            data[key] = escape(data[key])
+        yield str(value) if as_str else repr(value)
+
+
+def bounded_repr(value, max_chars, reverse=False, as_str=False):
+    """Return the representation of a value, stopping after max_chars characters.
+
+    Unlike :code:`repr(value)[:max_chars]`, the time and memory required are
+    bounded by :code:`max_chars` for strings, lists and dicts, regardless of
+    the size of the value.
+
+    :param value: Value to represent.
+    :param max_chars: Maximum number of characters to produce.
+    :type max_chars: int
+    :param reverse: Return the last instead of the first characters
+        (default: :code:`False`).
+    :type reverse: bool
+    :param as_str: Use :code:`str` instead of :code:`repr` for the value
+        itself, which differs for strings (default: :code:`False`).
+    :type as_str: bool
+    :returns: The (possibly truncated) representation, and whether it was
+        truncated.
+    :rtype: tuple
+    """
+    pieces = []
+    length = 0
+    for piece in _repr_pieces(value, max_chars, reverse=reverse, as_str=as_str):
+        if length + len(piece) > max_chars:
+            remaining = max_chars - length
+            pieces.append(
+                piece[len(piece) - remaining :] if reverse else piece[:remaining]
+            )
+            truncated = True
+            break
+        pieces.append(piece)
+        length += len(piece)
+    else:
+        truncated = False
+    if reverse:
+        pieces.reverse()
+    return "".join(pieces), truncated
+
+
+def escape_truncated_values(data, max_chars):
+    """Escape and truncate values in a dict to a maximum number of characters.
+
+    Values longer than :code:`max_chars` show their beginning and end. Values
+    are never rendered beyond :code:`MAX_VALUE_CHARS` characters, even if
+    :code:`max_chars` is :code:`None`.
+    """
+    if max_chars is None or int(max_chars) <= 0:
+        max_chars = MAX_VALUE_CHARS
+    max_chars = min(int(max_chars), MAX_VALUE_CHARS)
+    half = int(max_chars / 2)
+    for key in data:
+        string, truncated = bounded_repr(data[key], max_chars, as_str=True)
+        if truncated:
+            tail, _ = bounded_repr(data[key], half, reverse=True, as_str=True)
+            data[key] = (
+                str(escape(string[:half]))
+                + "&hellip;"
+                + str(escape(tail))
+                + " <em>[Truncated]</em>"
+            )
+        else:
+            data[key] = str(escape(string))
     return data
 
 
+class KeyedLock:
+    """Locks created on demand for each key, such as a job id.
+
+    A lock is kept only while it is held or waited for, so that locking any
+    number of keys uses memory only for the keys in use.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key):
+        """Hold the lock of a key for the duration of the context."""
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+
 class LazyView:
     # See https://flask.palletsprojects.com/en/2.1.x/patterns/lazyloading/
     def __init__(self, dashboard, import_name):
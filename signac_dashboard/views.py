@@ -1,8 +1,12 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import os
+import re
+from datetime import datetime
 
 from flask import (
+    Response,
     abort,
     flash,
     g,
@@ -13,6 +17,16 @@ from flask import (
     session,
     url_for,
 )
+from werkzeug.exceptions import ServiceUnavailable
+
+from .archive import stream_zip
+from .export import FORMATS
+from .listing import glob_files
+from .util import is_job_id
+
+# Limits of the file patterns given by users for downloads.
+_MAX_DOWNLOAD_PATTERNS = 32
+_MAX_DOWNLOAD_FILES_PER_JOB = 10000
 
 
 def home(dashboard):
@@ -70,6 +84,32 @@ def show_job(dashboard, jobid):
         return dashboard._render_job_view(default_view="grid")
 
 
+def job_cards(dashboard, jobid):
+    try:
+        job = dashboard.project.open_job(id=jobid)
+    except LookupError:
+        abort(404, "The job id requested could not be found.")
+    return render_template("job_cards.html", job=job)
+
+
+def events(dashboard):
+    if not dashboard.config["EVENTS"]:
+        abort(404, "Live updates are disabled.")
+    jobs = [job_id for job_id in request.args.get("jobs", "").split(",") if job_id]
+    subscription = dashboard._subscribe(jobs[: dashboard.config["MAX_PER_PAGE"]])
+    if subscription is None:
+        dashboard.metrics["requests_rejected_total"].inc(route=request.url_rule.rule)
+        raise ServiceUnavailable(
+            "Too many live update subscribers, please retry later.",
+            retry_after=dashboard.config["RETRY_AFTER"],
+        )
+    return Response(
+        dashboard._event_stream(subscription),
+        mimetype="text/event-stream",
+        headers={"X-Accel-Buffering": "no"},
+    )
+
+
 def get_file(dashboard, filename, jobid=None):
     if jobid is not None:
         try:
@@ -98,6 +138,97 @@ def get_file(dashboard, filename, jobid=None):
         abort(404, "The file requested does not exist.")
 
 
+def _selected_job_ids(dashboard):
+    """Return an iterator of the ids of the jobs selected by a request.
+
+    Jobs are selected by a search query :code:`q`, or by a list of job ids
+    :code:`jobids` separated by commas or whitespace, which may be
+    abbreviated. Without either, all jobs are selected. Queries are parsed
+    immediately and the ids of their jobs are generated lazily.
+    """
+    query = request.args.get("q") or None
+    if query is not None:
+        return dashboard._search_job_ids(query)
+    jobids = re.split(r"[\s,]+", request.args.get("jobids", "").strip())
+    jobids = [jobid for jobid in jobids if jobid]
+    if not jobids:
+        return dashboard._search_job_ids()
+    return _resolve_job_ids(dashboard, jobids)
+
+
+def _resolve_job_ids(dashboard, jobids):
+    seen = set()
+    for jobid in jobids:
+        if not is_job_id(jobid):
+            try:
+                jobid = dashboard.project.open_job(id=jobid).id
+            except LookupError:
+                continue
+        if jobid not in seen:
+            seen.add(jobid)
+            yield jobid
+
+
+def _job_files(dashboard, jobids, patterns):
+    workspace = dashboard.project.workspace
+    for jobid in jobids:
+        directory = os.path.join(workspace, jobid)
+        for filename in glob_files(
+            directory, patterns, max_files=_MAX_DOWNLOAD_FILES_PER_JOB
+        ):
+            yield os.path.join(directory, filename), f"{jobid}/{filename}"
+
+
+def download_files(dashboard):
+    patterns = [
+        pattern.strip()
+        for value in request.args.getlist("files")
+        for pattern in value.split(",")
+        if pattern.strip()
+    ]
+    if not patterns:
+        abort(404, "No files were selected for download.")
+    if len(patterns) > _MAX_DOWNLOAD_PATTERNS:
+        abort(400, f"At most {_MAX_DOWNLOAD_PATTERNS} file patterns can be given.")
+    try:
+        jobids = _selected_job_ids(dashboard)
+    except Exception as error:
+        return dashboard._render_error(error)
+    return Response(
+        stream_zip(_job_files(dashboard, jobids, patterns)),
+        mimetype="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="signac-files.zip"',
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def export(dashboard):
+    export_format = request.args.get("format", "csv")
+    document_keys = [
+        key.strip()
+        for value in request.args.getlist("doc")
+        for key in value.split(",")
+        if key.strip()
+    ]
+    try:
+        jobids = _selected_job_ids(dashboard)
+        chunks = dashboard._export(jobids, export_format, document_keys)
+    except Exception as error:
+        return dashboard._render_error(error)
+    return Response(
+        chunks,
+        mimetype=FORMATS[export_format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="signac-export.{export_format}"'
+            ),
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 def change_modules(dashboard):
     enabled_module_indices = session.get(
         "enabled_module_indices", dashboard._setup_enabled_module_indices()
@@ -124,5 +255,40 @@ def settings(dashboard):
     return render_template("settings.html")
 
 
+def profiles(dashboard):
+    g.active_page = "profiles"
+    profiler = dashboard.profiler
+    if profiler is None:
+        flash(
+            "Profiling is disabled. Enable it with the configuration option "
+            "'PROFILE' or launch the dashboard with 'run --profile'.",
+            "info",
+        )
+        return render_template("profiles.html", records=[])
+    records = [
+        (
+            record,
+            datetime.fromtimestamp(record.timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+            profiler.top_functions(record),
+        )
+        for record in profiler.records()
+    ]
+    return render_template(
+        "profiles.html", records=records, profile_dir=profiler.profile_dir
+    )
+
+
+def get_profile(dashboard, filename):
+    if dashboard.profiler is None:
+        abort(404, "Profiling is disabled.")
+    return send_from_directory(
+        directory=dashboard.profiler.profile_dir,
+        path=filename,
+        mimetype="application/octet-stream",
+        max_age=0,
+        as_attachment=True,
+    )
+
+
 def page_not_found(dashboard, error):
     return dashboard._render_error(str(error))
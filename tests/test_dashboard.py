@@ -1,17 +1,78 @@
 # Copyright (c) 2022 The Regents of the University of Michigan
 # All rights reserved.
 # This software is licensed under the BSD 3-Clause License.
+import csv
+import io
 import json
+import os
 import re
 import shutil
+import signal
+import socket
 import tempfile
+import threading
+import time
 import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
 from urllib.parse import quote as urlquote
+from urllib.request import urlopen
 
+from flask import Response, g
 from signac import init_project
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirModifiedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
 
 import signac_dashboard.modules
-from signac_dashboard import Dashboard
+from signac_dashboard import (
+    Dashboard,
+    admission,
+    archive,
+    arrays,
+    cache,
+    events,
+    export,
+    index,
+    listing,
+    loadtest,
+    module_benchmark,
+    synthetic,
+)
+from signac_dashboard.index import detect_schema, load_statepoints
+from signac_dashboard.module import Module
+from signac_dashboard.modules import ArrayPreview, LogTail, TimeSeries, log_tail
+from signac_dashboard.server import _PooledWSGIServer
+from signac_dashboard.util import bounded_repr, escape_truncated_values
+
+
+class TemporaryDirectoryTestCase(unittest.TestCase):
+    """Test case with a temporary directory removed after each test."""
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self._tmp_dir)
+
+
+class ProjectTestCase(TemporaryDirectoryTestCase):
+    """Test case with a project in a temporary directory.
+
+    The jobs of the state points in :code:`statepoints` are initialized in
+    order and stored in :code:`jobs`, and the first of them in :code:`job`.
+    """
+
+    statepoints = [{"a": 0}]
+
+    def setUp(self):
+        super().setUp()
+        self.project = init_project(self._tmp_dir)
+        self.jobs = [self.project.open_job(sp).init() for sp in self.statepoints]
+        self.job = self.jobs[0] if self.jobs else None
 
 
 class DashboardTestCase(unittest.TestCase):
@@ -55,6 +116,11 @@ class DashboardTestCase(unittest.TestCase):
         response = str(rv.get_data())
         assert "signac-dashboard" in response
 
+    def test_max_per_page(self):
+        self.dashboard.config["MAX_PER_PAGE"] = 2
+        response = self.get_response("/jobs/?per_page=5")
+        assert "Displaying at most 2 jobs per page." in response
+
     def test_get_jobs(self):
         rv = self.test_client.get("/jobs/", follow_redirects=True)
         response = str(rv.get_data())
@@ -114,6 +180,61 @@ class DashboardTestCase(unittest.TestCase):
         response = str(rv.get_data())
         assert f"{len(self.project)} jobs" in response
 
+    def test_metrics(self):
+        token = self.dashboard.config["METRICS_TOKEN"]
+        if token is not None:
+            assert self.test_client.get("/metrics").status_code == 401
+            assert self.test_client.get("/metrics?token=wrong").status_code == 401
+        headers = {"Authorization": f"Bearer {token}"} if token is not None else {}
+
+        self.test_client.get("/jobs/?view=grid")
+        self.dashboard.update_cache()
+        self.dashboard._update_job_cache()
+        self.dashboard.event_handler.dispatch(DirModifiedEvent(self.project.workspace))
+        self.test_client.get("/jobs/?view=grid")
+        rv = self.test_client.get("/metrics", headers=headers)
+        assert rv.status_code == 200
+        assert rv.content_type.startswith("text/plain; version=0.0.4")
+        metrics = rv.get_data(as_text=True)
+        assert "# TYPE signac_dashboard_request_duration_seconds histogram" in metrics
+        assert (
+            'signac_dashboard_request_duration_seconds_count{method="GET",route="/jobs/"} 2'
+            in metrics
+        )
+        assert (
+            'signac_dashboard_requests_total{method="GET",route="/jobs/",status="200"} 2'
+            in metrics
+        )
+        for name in ["_get_all_jobs", "_job_details", "_job_search"]:
+            assert f'signac_dashboard_cache_hits_total{{cache="{name}"}}' in metrics
+            assert f'signac_dashboard_cache_misses_total{{cache="{name}"}}' in metrics
+        assert 'signac_dashboard_cache_max_size{cache="_get_all_jobs"} 128' in metrics
+        # Hits and misses of replaced cache generations are kept.
+        stats = self.dashboard._cache_stats()
+        self.dashboard.update_cache()
+        self.dashboard._update_job_cache()
+        assert self.dashboard._cache_stats() == stats
+        assert stats["_get_all_jobs"][1] > 0
+        assert (
+            'signac_dashboard_cache_invalidations_total{cause="update_cache"} 1'
+            in metrics
+        )
+        assert (
+            'signac_dashboard_cache_invalidations_total{cause="job_document"} 1'
+            in metrics
+        )
+        assert (
+            'signac_dashboard_cache_invalidations_total{cause="watcher"} 1' in metrics
+        )
+        assert (
+            'signac_dashboard_watcher_events_total{event_type="modified"} 1' in metrics
+        )
+        if self.modules:
+            assert (
+                'signac_dashboard_module_render_duration_seconds_count{module="File List"}'
+                in metrics
+            )
+
     def test_view_single_job_list_disabled(self):
         """Make sure View panel is shown but list view is disabled when on a single job page."""
         response = self.get_response("/jobs/7f9fb369851609ce9cb91404549393f3")
@@ -151,7 +272,7 @@ class AllModulesTestCase(DashboardTestCase):
                 job = self.project.open_job({"a": a, "b": b})
                 with job:
                     job.document["sum"] = a + b
-        self.config = {"ACCESS_TOKEN": None}
+        self.config = {"ACCESS_TOKEN": None, "EVENTS": True}
         modules = []
         for m in signac_dashboard.modules.__all__:
             module = getattr(signac_dashboard.modules, m)
@@ -166,6 +287,18 @@ class AllModulesTestCase(DashboardTestCase):
         self.test_client = self.dashboard.app.test_client()
         self.addCleanup(shutil.rmtree, self._tmp_dir)
 
+    def test_job_cards(self):
+        job = next(iter(self.project))
+        response = self.get_response(f"/jobs/{job.id}?view=grid")
+        match = re.search(f'data-job-id="{job.id}" data-card-key="(\\d+-0)"', response)
+        assert match is not None
+        assert "data-events-url" in response
+        response = self.get_response(f"/jobs/{job.id}/cards")
+        assert f'data-card-key="{match.group(1)}"' in response
+        assert "<body" not in response
+        response = self.get_response("/jobs/0123456789abcdef0123456789abcdef/cards")
+        assert "The job id requested could not be found." in response
+
     def test_login_with_None_token(self):
         rv = self.test_client.get("/login", follow_redirects=True)
         response = str(rv.get_data())
@@ -207,6 +340,1615 @@ class AllModulesTestCase(DashboardTestCase):
         assert '<a href="/jobs/386b19932c82f3f9749dd6611e846293"' in response
         assert "disabled>min</div>" in response  # no previous job for b
 
+    def test_large_document_values(self):
+        job = self.project.open_job({"a": 0, "b": 0})
+        job.document["big"] = list(range(100000))
+        job.document["small"] = "<small>"
+        response = self.get_response(f"/jobs/{job.id}")
+        assert "[Truncated]" in response
+        assert "99999" in response
+        assert "50000" not in response
+        assert "This value is too large to edit." in response
+        assert "&lt;small&gt;" in response
+
+    def test_document_editor_update(self):
+        job = self.project.open_job({"a": 0, "b": 0})
+        query = urlquote(json.dumps({"doc.sum": 42}))
+        response = self.get_response(f"/search?q={query}")
+        assert "No jobs found" in response
+
+        # A parsing error in any field leaves the document unchanged
+        rv = self.test_client.post(
+            "/module/document_editor/update",
+            data={"jobid": job.id, "doc:sum": "42", "doc:bad": "[1,"},
+        )
+        assert rv.status_code == 422
+        assert job.document["sum"] == 0
+        assert "bad" not in job.document
+
+        rv = self.test_client.post(
+            "/module/document_editor/update",
+            data={"jobid": job.id, "doc:sum": "42", "doc:new": "{'x': [1, 2]}"},
+        )
+        assert rv.status_code == 200
+        assert job.document["sum"] == 42
+        assert job.document["new"] == {"x": [1, 2]}
+        # The search cache is updated without calling update_cache
+        response = self.get_response(f"/search?q={query}")
+        assert "1 to 1 of 1 jobs" in response
+
+    def _wait_for_bulk_update(self, rv):
+        assert rv.status_code == 202
+        for _ in range(100):
+            status = self.test_client.get(rv.headers["Location"]).get_json()
+            if status["finished"]:
+                return status
+            time.sleep(0.05)
+        raise AssertionError("Bulk update did not finish.")
+
+    def test_notes_bulk_update(self):
+        response = self.get_response("/module/notes/bulk?q=a.$gt+0")
+        assert "Bulk Edit Notes" in response
+
+        data = {"q": '{"a": {"$gt": 0}}', "operation": "tag", "note_text": "hot"}
+        status = self._wait_for_bulk_update(
+            self.test_client.post("/module/notes/bulk", data=data)
+        )
+        assert status["total"] == status["done"] == 4
+        status = self._wait_for_bulk_update(
+            self.test_client.post(
+                "/module/notes/bulk",
+                data=dict(data, jobids="missing, 7f9fb369851609ce9cb91404549393f3"),
+            )
+        )
+        assert status["total"] == status["done"] == 6
+        assert list(status["failed"]) == ["missing"]
+        for job in self.project:
+            tagged = job.sp.a > 0 or job.id == "7f9fb369851609ce9cb91404549393f3"
+            expected = "hot" if tagged else None
+            assert job.document.get("notes") == expected
+
+        data = {"q": '{"a": 2}', "operation": "append", "note_text": "cold"}
+        self._wait_for_bulk_update(
+            self.test_client.post("/module/notes/bulk", data=data)
+        )
+        for job in self.project.find_jobs({"a": 2}):
+            assert job.document["notes"] == "hot\ncold"
+
+        rv = self.test_client.post("/module/notes/bulk", data={"operation": "set"})
+        assert rv.status_code == 422
+
+    def test_notes_bulk_update_limits(self):
+        from signac_dashboard.modules import notes
+
+        def fail():
+            raise RuntimeError("cache update failed")
+
+        jobids = [job.id for job in self.project]
+        bulk_update = notes._BulkUpdate(self.project, "notes", jobids, "set", "x")
+        # The update is finished even if the callback fails.
+        bulk_update.run(workers=2, batch_size=2, on_finished=fail)
+        assert bulk_update.status()["finished"]
+
+        module = next(
+            module
+            for module in self.dashboard.modules
+            if isinstance(module, signac_dashboard.modules.Notes)
+        )
+        running = [
+            notes._BulkUpdate(self.project, "notes", jobids, "tag", "y")
+            for _ in range(notes._MAX_RUNNING_BULK_UPDATES)
+        ]
+        for bulk_update in running:
+            module._bulk_updates[bulk_update.id] = bulk_update
+        rv = self.test_client.post(
+            "/module/notes/bulk",
+            data={"jobids": jobids[0], "operation": "tag", "note_text": "y"},
+        )
+        assert rv.status_code == 503
+        for bulk_update in running:
+            bulk_update.finished = True
+        for _ in range(notes._MAX_BULK_UPDATES + 5):
+            bulk_update = module._start_bulk_update(
+                self.dashboard, jobids[:1], "tag", "y"
+            )
+            for _ in range(100):
+                if bulk_update.finished:
+                    break
+                time.sleep(0.05)
+        # The status of finished updates is not kept forever.
+        assert len(module._bulk_updates) <= notes._MAX_BULK_UPDATES + 1
+
+    def test_notes_bulk_update_concurrent(self):
+        from signac_dashboard.modules import notes
+
+        jobids = [job.id for job in self.project] * 10
+        updates = [
+            notes._BulkUpdate(
+                self.project,
+                "overlap",
+                jobids,
+                "append",
+                text,
+                locks=self.dashboard._document_locks,
+            )
+            for text in "xy"
+        ]
+        threads = [
+            threading.Thread(target=update.run, args=(8, 16)) for update in updates
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+        # The appended lines of both overlapping updates are kept.
+        for job in self.project:
+            lines = job.document["overlap"].splitlines()
+            assert sorted(lines) == ["x"] * 10 + ["y"] * 10
+        assert not self.dashboard._document_locks._locks
+
+    def test_schema_without_dashboard(self):
+        module = signac_dashboard.modules.Schema(context="ProjectContext")
+        with self.dashboard.app.test_request_context():
+            cards = module.get_cards(self.project)
+        assert "<strong>a:</strong>" in cards[0]["content"]
+
+    def test_flow_status_labels(self):
+        class LabelProject:
+            calls = 0
+
+            def labels(self, job):
+                LabelProject.calls += 1
+                if job.sp.a == 2:
+                    time.sleep(0.5)
+                yield f"a={job.sp.a}"
+
+        module = signac_dashboard.modules.FlowStatus(timeout=0.1)
+        module.register(self.dashboard)
+        module.project = LabelProject()
+        jobs = sorted(self.project, key=lambda job: job.sp.a)
+        with self.dashboard.app.test_request_context():
+            g.jobs = [{"job": job} for job in jobs]
+            cards = module.get_cards(jobs[0])
+            assert "a=0" in cards[0]["content"]
+            # All jobs on the page were submitted at once
+            cards = module.get_cards(jobs[-1])
+            assert "Computing labels" in cards[0]["content"]
+        time.sleep(0.6)
+        with self.dashboard.app.test_request_context():
+            cards = module.get_cards(jobs[-1])
+            assert "a=2" in cards[0]["content"]
+        assert LabelProject.calls == len(jobs)
+
+        # Changing the job document invalidates its cached labels
+        jobs[0].document["new"] = True
+        os.utime(jobs[0].fn("signac_job_document.json"), (0, 0))
+        with self.dashboard.app.test_request_context():
+            module.get_cards(jobs[0])
+        assert LabelProject.calls == len(jobs) + 1
+
+    def test_flow_status_deadline(self):
+        class SlowProject:
+            def labels(self, job):
+                time.sleep(1)
+                yield "done"
+
+        module = signac_dashboard.modules.FlowStatus(workers=1, timeout=0.2)
+        module.register(self.dashboard)
+        module.project = SlowProject()
+        jobs = list(self.project)
+        with self.dashboard.app.test_request_context():
+            g.jobs = [{"job": job} for job in jobs]
+            start = time.monotonic()
+            for job in jobs:
+                cards = module.get_cards(job)
+                assert "Computing labels" in cards[0]["content"]
+            # All cards of a page share one timeout.
+            assert time.monotonic() - start < 0.5
+        module._pool.shutdown(wait=False, cancel_futures=True)
+
+    def test_text_display_cache(self):
+        calls = []
+
+        def message(job):
+            calls.append(job.id)
+            return f"Message {len(calls)}"
+
+        job = self.project.open_job({"a": 0, "b": 0})
+        module = signac_dashboard.modules.TextDisplay(
+            message=message, cache=True, depends_on=["output.txt"]
+        )
+        with self.dashboard.app.test_request_context():
+            assert "Message 1" in module.get_cards(job)[0]["content"]
+            assert "Message 1" in module.get_cards(job)[0]["content"]
+            with open(job.fn("output.txt"), "w") as file:
+                file.write("new output")
+            assert "Message 2" in module.get_cards(job)[0]["content"]
+        assert len(calls) == 2
+
+        module = signac_dashboard.modules.TextDisplay(
+            message=message, cache=True, ttl=0
+        )
+        with self.dashboard.app.test_request_context():
+            module.get_cards(job)
+            module.get_cards(job)
+        assert len(calls) == 4
+
+    def test_server_timing(self):
+        rv = self.test_client.get("/jobs/?view=grid")
+        metrics = {
+            metric.split(";")[0] for metric in rv.headers["Server-Timing"].split(", ")
+        }
+        for phase in ["search", "sort", "pagination", "titles", "render", "total"]:
+            assert phase in metrics
+        assert "module.File_List" in metrics
+        assert 'desc="File List"' in rv.headers["Server-Timing"]
+
+        self.dashboard.config["SERVER_TIMING"] = False
+        rv = self.test_client.get("/jobs/?view=grid")
+        assert "Server-Timing" not in rv.headers
+
+    def test_file_list_pagination(self):
+        job = self.project.open_job({"a": 0, "b": 0})
+        for i in range(150):
+            with open(job.fn(f"frame_{i:03d}.txt"), "w") as file:
+                file.write("data")
+        response = self.get_response(f"/jobs/{job.id}")
+        assert "frame_099.txt" in response
+        assert "frame_100.txt" not in response
+        assert "Page 1 of 2" in response
+        response = self.get_response(f"/module/file_list/page/{job.id}?page=2")
+        assert "frame_100.txt" in response
+        assert "frame_099.txt" not in response
+
+
+class IndexTestCase(ProjectTestCase):
+    statepoints = [
+        {"a": a, "b": {"c": b, "d": [1, 2]}, "const": "x"}
+        for a in range(5)
+        for b in range(3)
+    ]
+
+    def test_load_statepoints(self):
+        project = init_project(self._tmp_dir)
+        progress = []
+        num_loaded = load_statepoints(
+            project, workers=4, chunksize=2, progress=lambda *p: progress.append(p)
+        )
+        assert num_loaded == len(project)
+        assert progress[-1] == (len(project), len(project))
+        assert len(project._sp_cache) == len(project)
+        # A second load finds everything in the cache
+        assert load_statepoints(project) == 0
+
+    def test_detect_schema(self):
+        for exclude_const in (False, True):
+            expected = self.project.detect_schema(exclude_const=exclude_const)
+            schema = detect_schema(
+                self.project, exclude_const=exclude_const, workers=2, chunksize=4
+            )
+            assert list(schema) == list(expected)
+            for key in expected:
+                assert dict(schema[key]) == dict(expected[key])
+
+    def test_detect_schema_subset(self):
+        subset = list(self.project.find_jobs({"a": 0}))
+        expected = self.project.detect_schema(exclude_const=True, subset=subset)
+        schema = detect_schema(self.project, exclude_const=True, subset=subset)
+        assert list(schema) == list(expected)
+
+    def test_detect_schema_processes(self):
+        expected = self.project.detect_schema()
+        schema = detect_schema(self.project, workers=2, executor="process", chunksize=4)
+        assert list(schema) == list(expected)
+        with self.assertRaises(ValueError):
+            detect_schema(self.project, executor="fiber")
+
+    def test_detect_schema_mixed_types(self):
+        self.project.open_job({"a": True, "b": {"c": 1.0}, "const": "x"}).init()
+        self.project.open_job({"a": 0, "b": {}, "const": "x"}).init()
+        schema = detect_schema(self.project)
+        assert list(schema) == list(self.project.detect_schema())
+        assert dict(schema["b"]) == {}
+        # Equal values of different types are kept apart.
+        assert schema["a"][bool] == {True}
+        assert 1 in schema["a"][int]
+        assert schema["b.c"][float] == {1.0}
+
+    def test_public_api_fallback(self):
+        class PublicProject:
+            """A project exposing only the public API of signac."""
+
+            def __init__(self, project):
+                self.workspace = project.workspace
+                self.open_job = project.open_job
+                self.update_cache = project.update_cache
+
+        project = PublicProject(self.project)
+        assert load_statepoints(project) == len(self.project)
+        job = next(iter(self.project))
+        assert index.get_statepoint(project, job.id) == job.statepoint()
+        with self.assertRaises(KeyError):
+            index.get_statepoint(project, "0" * 32)
+        assert sorted(index.job_ids(project)) == sorted(job.id for job in self.project)
+        assert dict(index.flatten_statepoint({"a": {"b": [1, [2]], "c": {}}})) == {
+            "a.b": (1, (2,)),
+            "a.c": {},
+        }
+        schema = detect_schema(project)
+        assert list(schema) == list(self.project.detect_schema())
+
+
+class ListingTestCase(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(listing.clear_cache)
+        os.mkdir(os.path.join(self._tmp_dir, "subdir"))
+        with open(os.path.join(self._tmp_dir, "a.txt"), "w") as file:
+            file.write("abc")
+
+    def _age_directory(self, seconds):
+        mtime = time.time() - seconds
+        os.utime(self._tmp_dir, (mtime, mtime))
+
+    def test_scan_directory(self):
+        self._age_directory(100)
+        entries = listing.scan_directory(self._tmp_dir)
+        assert [entry.name for entry in entries] == ["a.txt", "subdir"]
+        assert entries[0].size == 3 and not entries[0].is_dir
+        assert entries[1].is_dir
+        # Unchanged directories are served from the cache
+        assert listing.scan_directory(self._tmp_dir) is entries
+
+    def test_scan_directory_invalidation(self):
+        self._age_directory(100)
+        entries = listing.scan_directory(self._tmp_dir)
+        open(os.path.join(self._tmp_dir, "b.txt"), "w").close()
+        self._age_directory(50)
+        new_entries = listing.scan_directory(self._tmp_dir)
+        assert new_entries is not entries
+        assert "b.txt" in [entry.name for entry in new_entries]
+
+    def test_scan_missing_directory(self):
+        assert listing.scan_directory(os.path.join(self._tmp_dir, "missing")) == ()
+
+    def test_glob_files(self):
+        for filename in ["b.png", ".hidden.png", "subdir/c.png", "subdir/d.jpg"]:
+            open(os.path.join(self._tmp_dir, filename), "w").close()
+        os.makedirs(os.path.join(self._tmp_dir, "subdir", "deep"))
+        open(os.path.join(self._tmp_dir, "subdir", "deep", "e.png"), "w").close()
+
+        assert listing.glob_files(self._tmp_dir, ["*.png"]) == ("b.png",)
+        assert listing.glob_files(self._tmp_dir, ["*.png", "b.png", "a.txt"]) == (
+            "a.txt",
+            "b.png",
+        )
+        assert listing.glob_files(self._tmp_dir, ["subdir/*.*"]) == (
+            "subdir/c.png",
+            "subdir/d.jpg",
+        )
+        assert listing.glob_files(self._tmp_dir, ["**/*.png"]) == (
+            "b.png",
+            "subdir/c.png",
+            "subdir/deep/e.png",
+        )
+        assert listing.glob_files(
+            self._tmp_dir, ["**/*.png"], sort_key=os.path.basename
+        ) == ("b.png", "subdir/c.png", "subdir/deep/e.png")
+        assert listing.glob_files(
+            self._tmp_dir, ["**/*.png"], sort_key=lambda path: -len(path)
+        ) == ("subdir/deep/e.png", "subdir/c.png", "b.png")
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "requires os.symlink")
+    def test_glob_files_symlink_cycle(self):
+        subdir = os.path.join(self._tmp_dir, "subdir")
+        open(os.path.join(subdir, "c.txt"), "w").close()
+        os.symlink(".", os.path.join(self._tmp_dir, "self"))
+        os.symlink("..", os.path.join(subdir, "parent"))
+        files = listing.glob_files(self._tmp_dir, ["**/*.txt"])
+        # Each directory is expanded once, through the first path found.
+        assert files == ("a.txt", "subdir/c.txt")
+        assert listing.glob_files(self._tmp_dir, ["**/sub*/**/*.txt"]) == (
+            "subdir/c.txt",
+            "subdir/parent/a.txt",
+        )
+
+    def test_glob_files_limits(self):
+        path = self._tmp_dir
+        for _ in range(listing.MAX_GLOB_DEPTH + 2):
+            path = os.path.join(path, "d")
+        os.makedirs(path)
+        open(os.path.join(path, "deep.txt"), "w").close()
+        assert listing.glob_files(self._tmp_dir, ["**/*.txt"]) == ("a.txt",)
+        for i in range(5):
+            open(os.path.join(self._tmp_dir, f"{i}.txt"), "w").close()
+        assert len(listing.glob_files(self._tmp_dir, ["*.txt"], max_files=3)) == 3
+
+    def test_glob_files_invalidation(self):
+        self._age_directory(100)
+        files = listing.glob_files(self._tmp_dir, ["*.txt"])
+        assert listing.glob_files(self._tmp_dir, ["*.txt"]) is files
+        open(os.path.join(self._tmp_dir, "b.txt"), "w").close()
+        self._age_directory(50)
+        assert listing.glob_files(self._tmp_dir, ["*.txt"]) == ("a.txt", "b.txt")
+
+
+class UtilTestCase(unittest.TestCase):
+    def test_bounded_repr(self):
+        value = {"a": [1, 2.5, "x"], "b": {"c": None, "d": True}}
+        assert bounded_repr(value, 1000) == (repr(value), False)
+        assert bounded_repr(value, 1000, as_str=True) == (str(value), False)
+        assert bounded_repr("x", 10, as_str=True) == ("x", False)
+        for max_chars in range(1, len(repr(value))):
+            assert bounded_repr(value, max_chars) == (repr(value)[:max_chars], True)
+            assert bounded_repr(value, max_chars, reverse=True) == (
+                repr(value)[-max_chars:],
+                True,
+            )
+
+    def test_bounded_repr_large_value(self):
+        value = list(range(10**6))
+        assert bounded_repr(value, 10) == ("[0, 1, 2, ", True)
+        assert bounded_repr(value, 10, reverse=True) == ("8, 999999]", True)
+
+    def test_escape_truncated_values(self):
+        data = {"long": "<" * 100, "short": "<b>"}
+        data = escape_truncated_values(data, 10)
+        assert data["long"] == (
+            "&lt;&lt;&lt;&lt;&lt;&hellip;&lt;&lt;&lt;&lt;&lt; <em>[Truncated]</em>"
+        )
+        assert data["short"] == "&lt;b&gt;"
+
+
+class ProfilerTestCase(ProjectTestCase):
+    statepoints = [{"a": a} for a in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        self.profile_dir = os.path.join(self._tmp_dir, "profiles")
+
+    def create_dashboard(self, **config):
+        config = {"ACCESS_TOKEN": None, "PROFILE_DIR": self.profile_dir, **config}
+        dashboard = Dashboard(config=config, project=self.project, modules=[])
+        return dashboard, dashboard.app.test_client()
+
+    def test_profiles(self):
+        dashboard, test_client = self.create_dashboard(
+            PROFILE=True, PROFILE_SAMPLE_RATE=1
+        )
+        assert test_client.get("/jobs/?view=list").status_code == 200
+        assert test_client.get("/jobs/?view=list&page=2").status_code == 200
+        route_dir = os.path.join(self.profile_dir, "GET_jobs")
+        assert len(os.listdir(route_dir)) == 2
+        records = dashboard.profiler.records()
+        assert [record.route for record in records] == ["/jobs/", "/jobs/"]
+        assert records[0].seconds >= records[1].seconds
+        assert records[0].status == "200 OK"
+
+        response = test_client.get("/profiles").get_data(as_text=True)
+        assert "/jobs/?view=list" in response
+        assert "_render_job_view" in response
+        rv = test_client.get(f"/profiles/{records[0].filename}")
+        assert rv.status_code == 200
+        assert rv.headers["Content-Disposition"].startswith("attachment")
+
+    def test_profile_sample_rate(self):
+        dashboard, test_client = self.create_dashboard(
+            PROFILE=True, PROFILE_SAMPLE_RATE=0
+        )
+        test_client.get("/jobs/")
+        assert dashboard.profiler.records() == []
+        assert os.listdir(self.profile_dir) == []
+
+    def test_profile_max_records(self):
+        dashboard, test_client = self.create_dashboard(
+            PROFILE=True, PROFILE_SAMPLE_RATE=1, PROFILE_MAX_RECORDS=2
+        )
+        for _ in range(4):
+            test_client.get("/jobs/")
+        records = dashboard.profiler.records()
+        assert len(records) == 2
+        # Only the files of the kept records remain.
+        assert sorted(os.listdir(os.path.join(self.profile_dir, "GET_jobs"))) == sorted(
+            os.path.basename(record.filename) for record in records
+        )
+
+    def test_profile_streamed_response(self):
+        dashboard, test_client = self.create_dashboard(
+            PROFILE=True, PROFILE_SAMPLE_RATE=1
+        )
+        sent = []
+
+        @dashboard.app.route("/stream")
+        def stream():
+            def generate():
+                for i in range(3):
+                    sent.append(i)
+                    yield f"{i}\n"
+
+            return Response(generate())
+
+        response = test_client.get("/stream", buffered=False)
+        # The profile ends after the first chunk, without buffering the rest.
+        (record,) = dashboard.profiler.records()
+        assert record.route == "/stream"
+        assert sent == [0]
+        assert b"".join(response.response) == b"0\n1\n2\n"
+        response.close()
+
+    def test_profiling_disabled(self):
+        dashboard, test_client = self.create_dashboard()
+        assert dashboard.profiler is None
+        response = test_client.get("/profiles").get_data(as_text=True)
+        assert "Profiling is disabled" in response
+        response = test_client.get("/profiles/missing.prof").get_data(as_text=True)
+        assert "404 Not Found: Profiling is disabled." in response
+
+
+class SyntheticTestCase(TemporaryDirectoryTestCase):
+    def test_generate_project(self):
+        project = synthetic.generate_project(self._tmp_dir, 25, images=2, chunksize=10)
+        assert len(project) == 25
+        job = project.open_job(synthetic.synthetic_statepoint(7))
+        assert job in project
+        assert (
+            job.sp.model.params.N
+            == synthetic.synthetic_statepoint(7)["model"]["params"]["N"]
+        )
+        assert job.document["status"] == synthetic.synthetic_document(7)["status"]
+        with open(job.fn("image_1.png"), "rb") as file:
+            assert file.read(8) == b"\x89PNG\r\n\x1a\n"
+        assert len(project.find_jobs({"model.kind": "lj"})) == 7
+
+        # Generating again extends the project.
+        project = synthetic.generate_project(self._tmp_dir, 30, images=0)
+        assert len(project) == 30
+
+    def test_builtin_modules(self):
+        modules = synthetic.builtin_modules()
+        names = {type(module).__name__ for module in modules}
+        assert names == set(signac_dashboard.modules.__all__)
+
+
+class LoadTestTestCase(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = synthetic.generate_project(self._tmp_dir, 30)
+        self.dashboard = Dashboard(
+            config={"ACCESS_TOKEN": "test"},
+            project=self.project,
+            modules=[signac_dashboard.modules.StatepointList()],
+        )
+
+    def test_build_requests(self):
+        requests = loadtest.build_requests(self.project, count=200)
+        assert len(requests) == 200
+        assert {kind for kind, _ in requests} == set(loadtest.DEFAULT_MIX)
+        assert loadtest.build_requests(self.project, count=200) == requests
+        requests = loadtest.build_requests(self.project, mix={"job": 1}, count=5)
+        assert all(url.startswith("/jobs/") for _, url in requests)
+
+    def test_run_load_test(self):
+        documents = {job.id: dict(job.document) for job in self.project}
+        result = loadtest.run_load_test(
+            self.dashboard, users=4, duration=0.5, change_interval=0.1
+        )
+        summary = result.summary()
+        assert summary["total"]["requests"] > 0
+        assert summary["total"]["errors"] == 0
+        assert summary["total"]["requests"] == sum(
+            summary[kind]["requests"] for kind in loadtest.DEFAULT_MIX
+        )
+        assert summary["total"]["p50"] <= summary["total"]["p99"]
+        assert result.changes > 0
+        # Scratch jobs are removed and the jobs of the project are unchanged.
+        assert {job.id: dict(job.document) for job in self.project} == documents
+        assert "p99 ms" in result.format()
+
+    def test_rejected_requests(self):
+        dashboard = loadtest._create_dashboard(self._tmp_dir, users=8)
+        assert dashboard.config["THREADS"] == 8
+        assert dashboard._admission_limiters == {}
+        result = loadtest.LoadTestResult(
+            {"list": [0.1, 0.2]}, {}, 1, rejected={"list": 3, "search": 1}
+        )
+        summary = result.summary()
+        assert summary["list"]["requests"] == 2
+        assert summary["list"]["rejected"] == 3
+        assert summary["search"]["requests"] == 0
+        assert summary["total"]["rejected"] == 4
+        # Rejected requests are not part of the latencies.
+        assert summary["total"]["p50"] == 100
+        assert "rejected" in result.format()
+
+
+class ModuleBenchmarkTestCase(TemporaryDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = synthetic.generate_project(self._tmp_dir, 10)
+
+    def test_benchmark_job_module(self):
+        module = signac_dashboard.modules.StatepointList()
+        result = module_benchmark.benchmark_module(
+            module, self.project, sample=4, repeat=2
+        )
+        summary = result.summary()
+        assert summary["calls"] == 8
+        assert summary["cards"] == 1
+        assert summary["html_chars"] > 0
+        assert summary["median_ms"] <= summary["max_ms"]
+        assert len(result.allocations) == len(result.peak_memory) == 4
+        assert "Statepoint Parameters" in module_benchmark.format_results([result])
+
+    def test_benchmark_project_module(self):
+        module = signac_dashboard.modules.Schema(context="ProjectContext")
+        result = module_benchmark.benchmark_module(
+            module, self.project, repeat=2, trace_memory=False
+        )
+        summary = result.summary()
+        assert summary["calls"] == 2
+        assert summary["context"] == "ProjectContext"
+        assert result.allocations == []
+
+    def test_cli_limits(self):
+        args = [
+            "signac_dashboard.modules.StatepointList",
+            "--project",
+            self.project.path,
+            "--sample",
+            "2",
+            "--repeat",
+            "1",
+        ]
+        with self.assertRaises(SystemExit) as exit:
+            module_benchmark.main(args)
+        assert exit.exception.code == 0
+        with self.assertRaises(SystemExit) as exit:
+            module_benchmark.main(args + ["--max-html-chars", "1"])
+        assert exit.exception.code == 1
+
+
+class CacheTestCase(unittest.TestCase):
+    class Counter:
+        def __init__(self):
+            self._cache_generation = cache.CacheGeneration()
+            self.calls = 0
+
+        @cache.cached_method(maxsize=2)
+        def square(self, x, offset=0):
+            self.calls += 1
+            return x * x + offset
+
+    def test_cached_method(self):
+        counter = self.Counter()
+        assert counter.square(2) == 4
+        assert counter.square(2) == 4
+        assert counter.square(2, offset=1) == 5
+        assert counter.calls == 2
+        assert counter.square.cache_info() == (1, 2, 2, 2)
+        counter.square(3)
+        # The least recently used result was evicted.
+        assert counter.square.cache_info().currsize == 2
+        counter.square(2)
+        assert counter.calls == 4
+        counter.square.cache_clear()
+        assert counter.square.cache_info() == (0, 0, 2, 0)
+
+    def test_building(self):
+        counter = self.Counter()
+        counter.square(2)
+        generation = cache.CacheGeneration(1)
+        with cache.building(counter, generation):
+            counter.square(3)
+            assert counter.square.cache_info().currsize == 1
+        assert counter.square.cache_info().currsize == 1
+        counter._cache_generation = generation
+        counter.square(3)
+        assert counter.calls == 2
+
+    def test_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowCounter(self.Counter):
+            @cache.cached_method()
+            def slow(self, x):
+                self.calls += 1
+                started.set()
+                release.wait(timeout=10)
+                if x < 0:
+                    raise ValueError(x)
+                return x
+
+        for x in (1, -1):
+            counter = SlowCounter()
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [pool.submit(counter.slow, x)]
+                assert started.wait(timeout=10)
+                futures += [pool.submit(counter.slow, x) for _ in range(3)]
+                # Wait until the other calls are waiting for the first one.
+                for _ in range(1000):
+                    if counter.slow.cache_info().hits == 3:
+                        break
+                    time.sleep(0.01)
+                release.set()
+            if x < 0:
+                for future in futures:
+                    with self.assertRaises(ValueError):
+                        future.result()
+                # Failed results are not cached.
+                assert counter.slow.cache_info().currsize == 0
+            else:
+                assert [future.result() for future in futures] == [x] * 4
+            assert counter.calls == 1
+            started.clear()
+            release.clear()
+
+    def test_copy(self):
+        counter = self.Counter()
+        counter.square(2)
+        counter.square(3)
+        generation = counter._cache_generation.copy()
+        assert generation.number == 1
+        counter._cache_generation = generation
+        counter.square(2)
+        assert counter.calls == 2
+        assert counter._cache_generation.copy(exclude=("square",)).info(
+            "square", 2
+        ) == (0, 0, 2, 0)
+
+
+class CacheWarmingTestCase(ProjectTestCase):
+    statepoints = [{"a": a, "b": b} for a in range(3) for b in range(2)]
+
+    def test_warm_at_startup(self):
+        dashboard = Dashboard(
+            config={
+                "ACCESS_TOKEN": None,
+                "CACHE_WARMING": True,
+                "CACHE_WARMING_SEARCHES": ['{"a": 0}', '{"a": 1}'],
+                "PER_PAGE": 4,
+            },
+            project=self.project,
+        )
+        assert dashboard._cache_warmer.wait(timeout=10)
+        assert dashboard._get_all_jobs.cache_info().currsize == 1
+        assert dashboard._job_search.cache_info().currsize == 2
+        assert dashboard._job_details.cache_info().currsize == 4
+        assert dashboard._detect_schema.cache_info().currsize == 2
+
+    def test_serve_previous_generation(self):
+        reload = threading.Event()
+
+        class BlockingDashboard(Dashboard):
+            def _reload_project(self):
+                reload.wait(timeout=10)
+                super()._reload_project()
+
+        reload.set()
+        dashboard = BlockingDashboard(
+            config={"ACCESS_TOKEN": None, "CACHE_WARMING": True},
+            project=self.project,
+        )
+        assert dashboard._cache_warmer.wait(timeout=10)
+        reload.clear()
+        test_client = dashboard.app.test_client()
+
+        self.project.open_job({"a": 3, "b": 0}).init()
+        dashboard.update_cache()
+        response = str(test_client.get("/jobs/").get_data())
+        assert "6 jobs" in response
+        assert dashboard._cache_generation.number == 0
+
+        reload.set()
+        assert dashboard._cache_warmer.wait(timeout=10)
+        assert dashboard._cache_generation.number == 1
+        # The new generation was warmed before it replaced the previous one.
+        assert dashboard._get_all_jobs.cache_info() == (0, 1, 128, 1)
+        response = str(test_client.get("/jobs/").get_data())
+        assert "7 jobs" in response
+
+
+class CacheGenerationTestCase(ProjectTestCase):
+    statepoints = [{"a": a} for a in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        self.dashboard = Dashboard(config={"ACCESS_TOKEN": None}, project=self.project)
+
+    def test_pin_generation(self):
+        dashboard = self.dashboard
+        with dashboard.app.test_request_context():
+            cache.pin_generation(dashboard)
+            assert len(dashboard._get_all_jobs()) == 3
+            self.project.open_job({"a": 3}).init()
+            # Another thread replaces the generation during the request.
+            thread = threading.Thread(target=dashboard.update_cache)
+            thread.start()
+            thread.join()
+            assert len(dashboard._get_all_jobs()) == 3
+        with dashboard.app.test_request_context():
+            cache.pin_generation(dashboard)
+            assert len(dashboard._get_all_jobs()) == 4
+
+    def test_update_job_cache(self):
+        dashboard = self.dashboard
+        with dashboard.app.test_request_context():
+            jobs = dashboard._get_all_jobs()
+            for job in jobs:
+                dashboard._job_details(job)
+            dashboard._job_search('{"a": 0}')
+            dashboard._job_search('{"doc.x": 0}')
+            dashboard._update_job_cache(jobs[0])
+            assert dashboard._cache_generation.number == 1
+            assert dashboard._get_all_jobs.cache_info().currsize == 1
+            # Only the details of the changed job and searches of documents
+            # are dropped.
+            assert dashboard._job_details.cache_info().currsize == len(jobs) - 1
+            assert dashboard._job_search.cache_info().currsize == 1
+            dashboard._update_job_cache(jobs[1].id)
+            assert dashboard._job_details.cache_info().currsize == len(jobs) - 2
+            dashboard._update_job_cache()
+            assert dashboard._job_details.cache_info().currsize == 0
+
+    def test_coalesce_module_cards(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowModule(Module):
+            _supported_contexts = {"JobContext"}
+            calls = 0
+
+            def get_cards(self, job):
+                SlowModule.calls += 1
+                started.set()
+                release.wait(timeout=10)
+                return [{"name": self.name, "content": job.id}]
+
+        module = SlowModule(name="Slow", context="JobContext", template="")
+        dashboard = self.dashboard
+        job = dashboard._get_all_jobs()[0]
+
+        def render():
+            with dashboard.app.test_request_context("/jobs/"):
+                return dashboard._get_module_cards(module, job)
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(render)]
+            assert started.wait(timeout=10)
+            futures += [pool.submit(render) for _ in range(2)]
+            for _ in range(1000):
+                if dashboard._card_flights.shared == 2:
+                    break
+                time.sleep(0.01)
+            release.set()
+        assert [future.result() for future in futures] == [
+            [{"name": "Slow", "content": job.id}]
+        ] * 3
+        assert SlowModule.calls == 1
+        assert (
+            "signac_dashboard_module_renders_coalesced_total 2"
+            in dashboard.metrics.expose()
+        )
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+class ServerTestCase(ProjectTestCase):
+    statepoints = [{"a": a} for a in range(3)]
+
+    def get(self, port, path, timeout=10):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with urlopen(f"http://localhost:{port}{path}", timeout=5) as response:
+                    return response.read().decode()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def test_serve(self):
+        with socket.socket() as sock:
+            sock.bind(("localhost", 0))
+            port = sock.getsockname()[1]
+        dashboard = Dashboard(
+            config={
+                "ACCESS_TOKEN": None,
+                "PORT": port,
+                "WORKERS": 2,
+                "THREADS": 2,
+            },
+            project=self.project,
+        )
+        pid = os.fork()
+        if pid == 0:
+            try:
+                dashboard.main(["serve"])
+            finally:
+                os._exit(0)
+        try:
+            assert "3 jobs" in self.get(port, "/jobs/")
+            self.project.open_job({"a": 3}).init()
+            # Both workers are notified by the watcher of the parent process.
+            deadline = time.monotonic() + 10
+            consecutive = 0
+            while consecutive < 6 and time.monotonic() < deadline:
+                if "4 jobs" in self.get(port, "/jobs/"):
+                    consecutive += 1
+                else:
+                    consecutive = 0
+                    time.sleep(0.1)
+            assert consecutive == 6
+        finally:
+            os.kill(pid, signal.SIGTERM)
+            _, status = os.waitpid(pid, 0)
+        assert os.WIFEXITED(status)
+        assert os.WEXITSTATUS(status) == 0
+
+
+class AdmissionTestCase(ProjectTestCase):
+    statepoints = []
+
+    def test_limiter(self):
+        limiter = admission.AdmissionLimiter(1, queue_depth=1, timeout=0.01)
+        assert limiter.acquire()
+        # The queued request times out.
+        assert not limiter.acquire()
+        limiter.release()
+        assert limiter.acquire()
+        assert (limiter.active, limiter.waiting) == (1, 0)
+
+    def test_reject_requests(self):
+        dashboard = Dashboard(
+            config={
+                "ACCESS_TOKEN": None,
+                "CONCURRENCY_LIMITS": {"/slow": 1},
+                "QUEUE_DEPTH": 1,
+                "QUEUE_TIMEOUT": 10,
+                "RETRY_AFTER": 3,
+            },
+            project=self.project,
+        )
+        started = threading.Event()
+        release = threading.Event()
+
+        @dashboard.app.route("/slow")
+        def slow():
+            started.set()
+            release.wait(timeout=10)
+            return "done"
+
+        limiter = dashboard._admission_limiters["/slow"]
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(dashboard.app.test_client().get, "/slow")
+            assert started.wait(timeout=10)
+            queued = pool.submit(dashboard.app.test_client().get, "/slow")
+            for _ in range(1000):
+                if limiter.waiting == 1:
+                    break
+                time.sleep(0.01)
+            # The queue is full.
+            response = dashboard.app.test_client().get("/slow")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "3"
+            release.set()
+        assert first.result().status_code == 200
+        response = queued.result()
+        assert response.status_code == 200
+        assert "queue;dur=" in response.headers["Server-Timing"]
+        assert limiter.active == 0
+        assert (
+            'signac_dashboard_requests_rejected_total{route="/slow"} 1'
+            in dashboard.metrics.expose()
+        )
+
+    def test_default_limits(self):
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None, "THREADS": 8},
+            project=self.project,
+        )
+        for route in ("/jobs/", "/search"):
+            limiter = dashboard._admission_limiters[route]
+            # Active and queued requests leave a request thread free.
+            assert limiter.limit + limiter.queue_depth < 8
+            assert limiter.queue_depth > 0
+
+    def test_shed_saturated_pool(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def app(environ, start_response):
+            started.set()
+            release.wait(timeout=10)
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [b"done"]
+
+        server = _PooledWSGIServer("localhost", 0, app, threads=1, backlog=0)
+        self.addCleanup(server.server_close)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://localhost:{server.port}/"
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(urlopen, url, timeout=10)
+            assert started.wait(timeout=10)
+            start = time.monotonic()
+            with self.assertRaises(HTTPError) as context:
+                urlopen(url, timeout=10)
+            # The request is rejected without waiting for the busy thread.
+            assert time.monotonic() - start < 5
+            assert context.exception.code == 503
+            assert context.exception.headers["Retry-After"] == "5"
+            release.set()
+            assert first.result().read() == b"done"
+        server.shutdown()
+        thread.join(timeout=10)
+
+
+class EventsTestCase(ProjectTestCase):
+    def test_workspace_events(self):
+        workspace = os.path.realpath(self.project.workspace)
+        job_dir = os.path.join(workspace, self.job.id)
+        assert events.workspace_events(DirCreatedEvent(job_dir), workspace) == [
+            {"type": "job_added", "job": self.job.id}
+        ]
+        assert events.workspace_events(DirDeletedEvent(job_dir), workspace) == [
+            {"type": "job_removed", "job": self.job.id}
+        ]
+        document = os.path.join(job_dir, "signac_job_document.json")
+        temporary = os.path.join(job_dir, "._tmp_signac_job_document.json")
+        assert events.workspace_events(
+            FileMovedEvent(temporary, document), workspace
+        ) == [{"type": "document_changed", "job": self.job.id}]
+        assert events.workspace_events(
+            FileModifiedEvent(os.path.join(job_dir, "log.txt")), workspace
+        ) == [{"type": "files_changed", "job": self.job.id}]
+        assert events.workspace_events(DirModifiedEvent(job_dir), workspace) == []
+        assert events.workspace_events(DirModifiedEvent(workspace), workspace) == []
+
+    def test_subscription(self):
+        broker = events.EventBroker()
+        subscription = broker.subscribe(["a"])
+        other = broker.subscribe()
+        broker.publish({"type": "files_changed", "job": "a"})
+        broker.publish({"type": "files_changed", "job": "a"})
+        broker.publish({"type": "files_changed", "job": "b"})
+        broker.publish({"type": "job_added", "job": "c"})
+        assert subscription.get(timeout=0) == [
+            {"type": "files_changed", "job": "a"},
+            {"type": "job_added", "job": "c"},
+        ]
+        assert other.get(timeout=0) == [{"type": "job_added", "job": "c"}]
+        assert subscription.get(timeout=0) == []
+        subscription.max_pending = 1
+        broker.publish({"type": "job_added", "job": "d"})
+        broker.publish({"type": "job_added", "job": "e"})
+        assert subscription.get(timeout=0) == [{"type": "resync"}]
+        broker.unsubscribe(other)
+        assert len(broker) == 1
+
+    def test_events_disabled(self):
+        dashboard = Dashboard(config={"ACCESS_TOKEN": None}, project=self.project)
+        client = dashboard.app.test_client()
+        response = client.get(f"/jobs/{self.job.id}").get_data(as_text=True)
+        assert "data-events-url" not in response
+        response = client.get("/events").get_data(as_text=True)
+        assert "Live updates are disabled." in response
+
+    def test_max_subscriptions(self):
+        broker = events.EventBroker(max_subscriptions=1)
+        subscription = broker.subscribe()
+        assert broker.subscribe() is None
+        waiting = threading.Thread(target=subscription.get)
+        waiting.start()
+        # Closing the broker wakes up waiting subscribers, e.g. on shutdown.
+        broker.close()
+        waiting.join(timeout=10)
+        assert not waiting.is_alive()
+        assert subscription.closed
+        broker.unsubscribe(subscription)
+        assert broker.subscribe() is None
+
+    def test_event_stream(self):
+        dashboard = Dashboard(
+            config={
+                "ACCESS_TOKEN": None,
+                "EVENTS": True,
+                "EVENTS_KEEPALIVE": 0.1,
+                "EVENTS_MAX_SUBSCRIBERS": 1,
+                "RETRY_AFTER": 3,
+            },
+            project=self.project,
+        )
+        dashboard.observer.start()
+        self.addCleanup(dashboard.observer.join)
+        self.addCleanup(dashboard.observer.stop)
+        response = dashboard.app.test_client().get(
+            f"/events?jobs={self.job.id},invalid", buffered=False
+        )
+        assert response.mimetype == "text/event-stream"
+        stream = response.response
+        assert next(stream) == b"retry: 5000\n\n"
+        assert list(dashboard._job_watches) == [self.job.id]
+        # Further subscribers are rejected instead of holding a thread.
+        rejected = dashboard.app.test_client().get("/events")
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "3"
+        self.job.document["b"] = 1
+        deadline = time.monotonic() + 10
+        for chunk in stream:
+            if b"event: document_changed" in chunk or time.monotonic() > deadline:
+                break
+        assert json.loads(chunk.decode().split("data: ")[1]) == {
+            "type": "document_changed",
+            "job": self.job.id,
+        }
+        response.close()
+        assert dashboard._job_watches == {}
+        assert len(dashboard.events) == 0
+
+
+class LogTailTestCase(ProjectTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = self.job.fn("log.txt")
+        with open(self.path, "w") as file:
+            file.writelines(f"line {i}\n" for i in range(10000))
+
+    def test_tail(self):
+        data, size, truncated, inode = log_tail.tail(self.path, 3, 1000)
+        assert data == b"line 9997\nline 9998\nline 9999\n"
+        assert size == os.path.getsize(self.path)
+        assert truncated
+        assert inode == os.stat(self.path).st_ino
+        # At most max_bytes are read.
+        data, _, _, _ = log_tail.tail(self.path, 1000, 100)
+        assert 0 < len(data) <= 100
+        assert data.startswith(b"line ")
+        with open(self.path, "w") as file:
+            file.write("first\nsecond")
+        assert log_tail.tail(self.path, 5, 1000)[:3] == (b"first\nsecond", 12, False)
+
+    def test_read_appended(self):
+        size = os.path.getsize(self.path)
+        inode = os.stat(self.path).st_ino
+        assert log_tail.read_appended(self.path, size, 1000) == (b"", size)
+        with open(self.path, "a") as file:
+            file.write("new\npartial")
+        assert log_tail.read_appended(self.path, size, 1000, inode) == (
+            b"new\n",
+            size + 4,
+        )
+        assert log_tail.read_appended(self.path, size, 2) == (b"ne", size + 2)
+        assert log_tail.read_appended(self.path, size + 100, 1000) is None
+        # A replaced file is detected even if it did not shrink.
+        replacement = self.path + ".new"
+        with open(replacement, "w") as file:
+            file.writelines(f"other {i}\n" for i in range(20000))
+        os.replace(replacement, self.path)
+        assert log_tail.read_appended(self.path, size, 1000, inode) is None
+
+    def poll(self, client, *tails):
+        return client.get(
+            "/module/log_tail/poll",
+            query_string={"tail": [json.dumps(tail) for tail in tails], "wait": 0},
+        )
+
+    def test_module(self):
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None},
+            project=self.project,
+            modules=[LogTail(lines=2), LogTail(name="Output", filenames=["*.out"])],
+        )
+        client = dashboard.app.test_client()
+        response = str(client.get(f"/jobs/{self.job.id}").get_data())
+        assert "Log Tail: log.txt" in response
+        assert "line 9999" in response
+        assert "line 9997" not in response
+        offset = int(re.search(r'data-offset="(\d+)"', response).group(1))
+        inode = int(re.search(r'data-inode="(\d+)"', response).group(1))
+        assert 'data-url="/module/log_tail/poll"' in response
+        with open(self.job.fn("run.out"), "w") as file:
+            file.write("output\n")
+        with open(self.path, "a") as file:
+            file.write("appended\n")
+        # The files of all cards are followed with one poll.
+        tails = self.poll(
+            client,
+            [0, self.job.id, "log.txt", offset, inode],
+            [1, self.job.id, "run.out", 7, os.stat(self.job.fn("run.out")).st_ino],
+            [1, self.job.id, "log.txt", 0, None],
+        ).json["tails"]
+        assert tails[0] == {
+            "text": "appended\n",
+            "offset": offset + 9,
+            "inode": inode,
+            "reset": False,
+        }
+        assert tails[1]["text"] == "" and tails[1]["offset"] == 7
+        assert tails[2] == {"error": "The file requested does not exist."}
+        replacement = self.job.fn("log.new")
+        with open(replacement, "w") as file:
+            file.writelines(f"restarted {i}\n" for i in range(20000))
+        os.replace(replacement, self.path)
+        (tail,) = self.poll(client, [0, self.job.id, "log.txt", offset, inode]).json[
+            "tails"
+        ]
+        assert tail["reset"]
+        assert tail["text"] == "restarted 19998\nrestarted 19999\n"
+        assert tail["inode"] == os.stat(self.path).st_ino
+        os.remove(self.path)
+        (tail,) = self.poll(client, [0, self.job.id, "log.txt", 0, None]).json["tails"]
+        assert tail == {"error": "The file requested does not exist."}
+
+    def test_max_polls(self):
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None, "THREADS": 4, "RETRY_AFTER": 3},
+            project=self.project,
+            modules=[LogTail(wait=10)],
+        )
+        size = os.path.getsize(self.path)
+        inode = os.stat(self.path).st_ino
+        tail = json.dumps([0, self.job.id, "log.txt", size, inode])
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            held = pool.submit(
+                dashboard.app.test_client().get,
+                "/module/log_tail/poll",
+                query_string={"tail": tail},
+            )
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                # One of the 4 threads holds polls, further polls are rejected.
+                response = self.poll(dashboard.app.test_client(), json.loads(tail))
+                if response.status_code == 503:
+                    break
+                time.sleep(0.05)
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "3"
+            with open(self.path, "a") as file:
+                file.write("done\n")
+            assert held.result().json["tails"][0]["text"] == "done\n"
+
+
+@unittest.skipUnless(arrays.NUMPY and arrays.H5PY, "requires numpy and h5py")
+class ArrayPreviewTestCase(ProjectTestCase):
+    def setUp(self):
+        import numpy as np
+
+        super().setUp()
+        self.np = np
+
+    def test_strided_sample(self):
+        np = self.np
+        assert arrays.sample_steps((1000,), 100) == (16,)
+        assert arrays.sample_steps((10, 1000), 100) == (1, 128)
+        assert arrays.sample_steps((), 100) == ()
+        data = np.arange(24).reshape(2, 3, 4)
+        sample, steps = arrays.strided_sample(data, 6)
+        assert sample.size <= 6
+        assert np.array_equal(sample, data[:: steps[0], :: steps[1], :: steps[2]])
+        sample, steps = arrays.strided_sample(data, 100, index=(1,))
+        assert np.array_equal(sample, data[1])
+        assert arrays.summarize(np.array([1.0, 3.0, np.nan])) == {
+            "non_finite": 1,
+            "min": 1.0,
+            "max": 3.0,
+            "mean": 2.0,
+            "std": 1.0,
+        }
+        assert arrays.summarize(np.array(["a"])) is None
+
+    def test_file_cache(self):
+        path = self.job.fn("x.npy")
+        self.np.save(path, self.np.arange(3))
+        os.utime(path, (0, 0))
+        file_cache = arrays.FileCache()
+        calls = []
+        assert file_cache.get_or_compute(path, lambda: calls.append(1) or 1) == 1
+        assert file_cache.get_or_compute(path, lambda: calls.append(2) or 2) == 1
+        os.utime(path, (1, 1))
+        assert file_cache.get_or_compute(path, lambda: calls.append(3) or 3) == 3
+        assert calls == [1, 3]
+
+    def test_module(self):
+        np = self.np
+        np.save(self.job.fn("line.npy"), np.sin(np.arange(10**6) / 1000))
+        np.save(self.job.fn("volume.npy"), np.ones((4, 300, 300), dtype=np.float32))
+        self.job.data["series"] = np.arange(1000)
+        self.job.data["label"] = "text"
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None},
+            project=self.project,
+            modules=[
+                ArrayPreview(filenames=["*.npy", "signac_data.h5"], max_samples=1000)
+            ],
+        )
+        client = dashboard.app.test_client()
+        response = client.get(f"/jobs/{self.job.id}").get_data(as_text=True)
+        assert "Array Preview: line.npy" in response
+        assert "float64" in response
+        assert "Statistics of 977 of 1000000 elements" in response
+        assert "<polyline" in response
+        assert "Array Preview: volume.npy" in response
+        assert "4 × 300 × 300" in response
+        assert "data:image/png;base64," in response
+        assert "Showing the first slice along the leading axes." in response
+        assert "Array Preview: signac_data.h5/series" in response
+        assert "Array Preview: signac_data.h5/label" in response
+        # Summaries are cached until the files change.
+        module = dashboard.modules[0]
+        path = self.job.fn("line.npy")
+        os.utime(path, (0, 0))
+        module._summaries.clear()
+        client.get(f"/jobs/{self.job.id}")
+        # Recently modified files are not cached.
+        assert list(module._summaries._values) == [(path, ())]
+
+    def test_unreadable(self):
+        with open(self.job.fn("broken.npy"), "w") as file:
+            file.write("not an array")
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None},
+            project=self.project,
+            modules=[ArrayPreview()],
+        )
+        client = dashboard.app.test_client()
+        response = client.get(f"/jobs/{self.job.id}").get_data(as_text=True)
+        assert "The file could not be read" in response
+
+
+@unittest.skipUnless(arrays.NUMPY and arrays.H5PY, "requires numpy and h5py")
+class TimeSeriesTestCase(ProjectTestCase):
+    def setUp(self):
+        import numpy as np
+
+        super().setUp()
+        self.np = np
+
+    def test_downsample(self):
+        np = self.np
+        x = np.arange(100000, dtype=float)
+        y = np.sin(x / 1000)
+        y[12345] = 10
+        y[54321] = np.nan
+        sampler = arrays.MinMaxDownsampler(len(x), 100)
+        for start in range(0, len(x), 999):
+            sampler.add(x[start : start + 999], y[start : start + 999])
+        x_kept, y_kept = sampler.result()
+        assert len(x_kept) <= 200
+        assert np.all(np.diff(x_kept) > 0)
+        assert 12345 in x_kept
+        assert np.isfinite(y_kept).all()
+        x_selected, y_selected = arrays.lttb(x_kept, y_kept, 50)
+        assert len(x_selected) == 50
+        assert x_selected[0] == x_kept[0] and x_selected[-1] == x_kept[-1]
+        assert y_selected.max() == 10
+        # Short series are kept completely.
+        sampler = arrays.MinMaxDownsampler(3, 100)
+        sampler.add(np.arange(3), np.array([1.0, np.inf, 3.0]))
+        assert [values.tolist() for values in sampler.result()] == [
+            [0.0, 2.0],
+            [1.0, 3.0],
+        ]
+
+    def test_module(self):
+        np = self.np
+        with open(self.job.fn("thermo.csv"), "w") as file:
+            file.write("step,energy,phase\n")
+            file.writelines(f"{i},{i % 7},liquid\n" for i in range(0, 50000, 5))
+        np.save(self.job.fn("trajectory.npy"), np.random.rand(100000, 2))
+        self.job.data["pressure"] = np.linspace(0, 1, 1000)
+        dashboard = Dashboard(
+            config={"ACCESS_TOKEN": None},
+            project=self.project,
+            modules=[
+                TimeSeries(filenames=["thermo.csv"], x="step", points=100),
+                TimeSeries(
+                    filenames=["*.npy", "signac_data.h5"],
+                    method="minmax",
+                    columns=["1", "pressure"],
+                ),
+            ],
+        )
+        client = dashboard.app.test_client()
+        response = client.get(f"/jobs/{self.job.id}").get_data(as_text=True)
+        response = " ".join(response.split())
+        assert "Time Series: thermo.csv: energy" in response
+        assert "energy from 0 to 6" in response
+        assert "versus step from 0 to 49995" in response
+        assert "showing 100 of 10000 rows" in response
+        assert "Time Series: thermo.csv: phase" in response
+        assert "The column has no finite values." in response
+        assert "Time Series: trajectory.npy: 1" in response
+        assert "Time Series: trajectory.npy: 0" not in response
+        assert "Time Series: signac_data.h5: pressure" in response
+        url = f"/module/time_series/0/{self.job.id}/thermo.csv"
+        data = client.get(url, query_string={"column": "energy", "points": 10}).json
+        assert data["column"] == "energy"
+        assert data["length"] == 10000
+        assert len(data["x"]) == len(data["y"]) == 10
+        assert data["x"][0] == 0 and data["x"][-1] == 49995
+        response = client.get(url, query_string={"column": "missing"})
+        assert "The column requested could not be read." in str(response.get_data())
+        response = client.get(f"/module/time_series/1/{self.job.id}/thermo.csv")
+        assert "The file requested does not exist." in str(response.get_data())
+
+
+class DownloadTestCase(ProjectTestCase):
+    statepoints = [{"a": a} for a in range(3)]
+
+    def setUp(self):
+        super().setUp()
+        for a, job in enumerate(self.jobs):
+            with open(job.fn("dump.txt"), "w") as file:
+                file.write(f"dump {a}\n" * 1000)
+            with open(job.fn("image.png"), "wb") as file:
+                file.write(os.urandom(1000))
+        self.dashboard = Dashboard(config={"ACCESS_TOKEN": None}, project=self.project)
+        self.client = self.dashboard.app.test_client()
+
+    def get_archive(self, **query_string):
+        response = self.client.get("/download", query_string=query_string)
+        assert response.mimetype == "application/zip"
+        assert "attachment" in response.headers["Content-Disposition"]
+        return zipfile.ZipFile(io.BytesIO(response.get_data()))
+
+    def test_stream_zip(self):
+        job = self.project.open_job({"a": 0})
+        chunks = list(
+            archive.stream_zip(
+                [
+                    (job.fn("dump.txt"), "a/dump.txt"),
+                    (job.fn("missing.txt"), "a/missing.txt"),
+                    (job.fn("image.png"), "a/image.png"),
+                ]
+            )
+        )
+        assert max(map(len, chunks)) < 2**17
+        zip_file = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+        assert zip_file.testzip() is None
+        infos = {info.filename: info for info in zip_file.infolist()}
+        assert list(infos) == ["a/dump.txt", "a/image.png"]
+        assert infos["a/dump.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["a/dump.txt"].compress_size < infos["a/dump.txt"].file_size
+        assert infos["a/image.png"].compress_type == zipfile.ZIP_STORED
+        assert zip_file.read("a/dump.txt") == b"dump 0\n" * 1000
+
+    def test_download_files(self):
+        jobs = sorted(self.project, key=lambda job: job.sp.a)
+        zip_file = self.get_archive(files="dump.txt")
+        assert sorted(zip_file.namelist()) == sorted(
+            f"{job.id}/dump.txt" for job in jobs
+        )
+        zip_file = self.get_archive(q='{"a": {"$lt": 2}}', files="*.png,dump.txt")
+        assert sorted(zip_file.namelist()) == sorted(
+            f"{job.id}/{filename}"
+            for job in jobs[:2]
+            for filename in ("dump.txt", "image.png")
+        )
+        jobids = f"{jobs[2].id[:8]} 0123456789abcdef0123456789abcdef"
+        zip_file = self.get_archive(jobids=jobids, files="dump.txt")
+        assert zip_file.namelist() == [f"{jobs[2].id}/dump.txt"]
+        assert zip_file.read(f"{jobs[2].id}/dump.txt") == b"dump 2\n" * 1000
+        response = self.client.get("/download")
+        assert "No files were selected for download." in str(response.get_data())
+        response = self.client.get(
+            "/download", query_string={"files": ",".join(["*.txt"] * 33)}
+        )
+        assert "At most 32 file patterns can be given." in str(response.get_data())
+        response = self.client.get(
+            "/search", query_string={"q": '{"a": {"$lt": 2}}'}
+        ).get_data(as_text=True)
+        assert "Download from all 2 jobs" in response
+
+
+class ExportTestCase(ProjectTestCase):
+    statepoints = [{"a": a, "b": {"c": [a, a]}} for a in range(5)]
+
+    def setUp(self):
+        super().setUp()
+        for a, job in enumerate(self.jobs):
+            job.document["energy"] = a / 2
+            job.document["result"] = {"steps": a * 10}
+        self.dashboard = Dashboard(config={"ACCESS_TOKEN": None}, project=self.project)
+        self.client = self.dashboard.app.test_client()
+
+    def get_export(self, **query_string):
+        response = self.client.get("/export", query_string=query_string)
+        assert "attachment" in response.headers["Content-Disposition"]
+        return response
+
+    def test_csv(self):
+        response = self.get_export(q='{"a": {"$lt": 2}}', doc="energy,result.steps")
+        assert response.mimetype == "text/csv"
+        rows = csv.DictReader(io.StringIO(response.get_data(as_text=True)))
+        # Rows are exported in the order of the workspace.
+        assert sorted(rows, key=lambda row: row["sp.a"]) == [
+            {
+                "id": job.id,
+                "sp.a": str(job.sp.a),
+                "sp.b.c": f"[{job.sp.a}, {job.sp.a}]",
+                "doc.energy": str(job.sp.a / 2),
+                "doc.result.steps": str(job.sp.a * 10),
+            }
+            for job in self.jobs[:2]
+        ]
+
+    def test_jsonl(self):
+        jobids = f"{self.jobs[3].id[:8]},{self.jobs[4].id}"
+        response = self.get_export(format="jsonl", jobids=jobids, doc="missing")
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        rows = sorted(map(json.loads, lines), key=lambda row: row["sp.a"])
+        assert rows == [
+            {
+                "id": job.id,
+                "sp.a": job.sp.a,
+                "sp.b.c": [job.sp.a, job.sp.a],
+                "doc.missing": None,
+            }
+            for job in self.jobs[3:]
+        ]
+
+    def test_batches(self):
+        rows = export.rows(
+            self.project, [job.id for job in self.jobs] + ["missing"], ["a"]
+        )
+        assert [row[1] for row in rows] == list(range(5))
+        chunks = list(export._stream_csv(["id", "sp.a"], ([i, i] for i in range(2500))))
+        assert len(chunks) == 4
+        response = self.client.get("/export", query_string={"format": "xml"})
+        assert "Unknown export format" in str(response.get_data())
+
+    @unittest.skipUnless(export.PYARROW, "requires pyarrow")
+    def test_parquet(self):
+        import pyarrow.parquet
+
+        response = self.get_export(format="parquet", doc="energy,result")
+        table = pyarrow.parquet.read_table(io.BytesIO(response.get_data()))
+        assert str(table.schema.field("sp.a").type) == "int64"
+        assert str(table.schema.field("doc.energy").type) == "double"
+        rows = sorted(table.to_pylist(), key=lambda row: row["sp.a"])
+        assert [row["sp.a"] for row in rows] == list(range(5))
+        assert rows[0]["doc.result"] == '{"steps": 0}'
+        # Job ids are generated lazily, without building a list of all jobs.
+        ids = self.dashboard._search_job_ids()
+        assert not isinstance(ids, list)
+        assert sorted(ids) == sorted(job.id for job in self.jobs)
+
+    @unittest.skipUnless(export.PYARROW, "requires pyarrow")
+    def test_parquet_mixed_types(self):
+        import pyarrow.parquet
+
+        # The values of later batches widen the types of the columns.
+        rows = (
+            [str(i), i if i < 1500 else i + 0.5, i if i < 2000 else str(i)]
+            for i in range(2500)
+        )
+        data = b"".join(
+            export._stream_parquet(["id", "doc.x", "doc.y"], rows, [{str}, (), ()])
+        )
+        table = pyarrow.parquet.read_table(io.BytesIO(data))
+        assert str(table.schema.field("doc.x").type) == "double"
+        x = table.column("doc.x").to_pylist()
+        assert x[1499] == 1499 and x[1500] == 1500.5
+        y = table.column("doc.y").to_pylist()
+        assert str(table.schema.field("doc.y").type) == "string"
+        assert y[0] == "0" and y[2499] == "2499"
+        assert None not in x + y
+
+    def test_command(self):
+        output = os.path.join(self._tmp_dir, "export.jsonl")
+        self.dashboard.main(["export", "-q", '{"a": 1}', "-k", "energy", "-o", output])
+        with open(output) as file:
+            assert [json.loads(line) for line in file] == [
+                {
+                    "id": self.jobs[1].id,
+                    "sp.a": 1,
+                    "sp.b.c": [1, 1],
+                    "doc.energy": 0.5,
+                }
+            ]
+
 
 if __name__ == "__main__":
     unittest.main()